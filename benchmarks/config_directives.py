@@ -0,0 +1,43 @@
+""" Measure the startup cost of calling many configuration directives.
+
+Each route is added with ``config.add_route`` and gets a view added with
+``config.add_view``, then the configuration is committed.  The time spent
+calling the directives, which capture the file and line of their caller
+for conflict reports and introspection, is reported apart from the time
+spent committing.
+
+Usage: python benchmarks/config_directives.py [routes] [iterations]
+"""
+import sys
+import time
+
+from pyramid.config import Configurator
+
+def view(request):
+    return {}
+
+def add_directives(config, routes):
+    for i in range(routes):
+        name = 'route%d' % i
+        config.add_route(name, '/path/%d/{id}' % i)
+        config.add_view(view, route_name=name, renderer='json')
+
+def main(argv=sys.argv):
+    routes = int(argv[1]) if len(argv) > 1 else 2000
+    number = int(argv[2]) if len(argv) > 2 else 5
+    directives = commit = 0.0
+    for i in range(number):
+        config = Configurator()
+        start = time.time()
+        add_directives(config, routes)
+        middle = time.time()
+        config.commit()
+        end = time.time()
+        directives += middle - start
+        commit += end - middle
+    print('%d directive calls' % (routes * 2))
+    print('%-12s %8.1f ms' % ('directives', directives / number * 1e3))
+    print('%-12s %8.1f ms' % ('commit', commit / number * 1e3))
+
+if __name__ == '__main__':
+    main()
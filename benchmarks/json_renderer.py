@@ -0,0 +1,73 @@
+""" Measure the JSON renderer on a large nested payload of objects which
+need adapters.
+
+The payload holds records with ``datetime`` and ``Decimal`` values, which
+are converted by adapters registered with the renderer.  The renderer is
+compared with a variant which looks the adapter of every object up in the
+component registry, as the renderer did before it remembered the adapter
+found for each type, and with a serializer returning bytes.
+
+Usage: python benchmarks/json_renderer.py [records] [iterations]
+"""
+import datetime
+import decimal
+import json
+import sys
+import timeit
+
+from zope.interface import providedBy
+
+from pyramid.interfaces import IJSONAdapter
+from pyramid.renderers import JSON
+
+def make_payload(records):
+    now = datetime.datetime(2017, 6, 1, 12, 0, 0)
+    return {
+        'results': [
+            {
+                'id': i,
+                'created': now + datetime.timedelta(seconds=i),
+                'price': decimal.Decimal('%d.99' % i),
+                'tags': ['a', 'b', 'c'],
+                'history': [
+                    {'at': now, 'amount': decimal.Decimal('1.50')},
+                    {'at': now, 'amount': decimal.Decimal('2.50')},
+                    ],
+                }
+            for i in range(records)
+            ],
+        }
+
+class UncachedJSON(JSON):
+    def _find_adapter(self, obj):
+        return self.components.adapters.lookup(
+            (providedBy(obj),), IJSONAdapter)
+
+def bytes_serializer(value, **kw):
+    return json.dumps(value, **kw).encode('utf-8')
+
+def add_adapters(renderer):
+    renderer.add_adapter(datetime.datetime, lambda obj, req: obj.isoformat())
+    renderer.add_adapter(decimal.Decimal, lambda obj, req: str(obj))
+    return renderer
+
+def main(argv=sys.argv):
+    records = int(argv[1]) if len(argv) > 1 else 1000
+    number = int(argv[2]) if len(argv) > 2 else 50
+    payload = make_payload(records)
+    renderers = [
+        ('uncached adapter lookup', add_adapters(UncachedJSON())),
+        ('cached adapter lookup', add_adapters(JSON())),
+        ('cached, bytes output', add_adapters(
+            JSON(serializer=bytes_serializer))),
+        ]
+    print('%d records, %d adapted objects per render' % (
+        records, records * 6))
+    for name, renderer in renderers:
+        render = renderer(None)
+        render(payload, {})
+        elapsed = timeit.timeit(lambda: render(payload, {}), number=number)
+        print('%-24s %8.2f ms per render' % (name, elapsed / number * 1e3))
+
+if __name__ == '__main__':
+    main()
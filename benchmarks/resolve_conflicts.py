@@ -0,0 +1,56 @@
+""" Measure how the resolution of configuration conflicts scales with the
+number of actions.
+
+The actions are spread over several orders, as the actions of a real
+configuration are, and a tenth of them are overridden by an action with a
+shorter include path, as when an application overrides the configuration
+of a package it includes.  Every resolved action is consumed, as when a
+configuration is committed.
+
+Usage: python benchmarks/resolve_conflicts.py [actions ...]
+"""
+import sys
+import time
+
+from pyramid.config import resolveConflicts
+
+ORDERS = (-20, -10, 0, 0, 0, 10)
+
+def make_actions(count):
+    actions = []
+    for i in range(count):
+        actions.append({
+            'discriminator': ('view', i),
+            'callable': None,
+            'args': (),
+            'kw': {},
+            'includepath': ('package.include',),
+            'info': None,
+            'order': ORDERS[i % len(ORDERS)],
+            'introspectables': (),
+            })
+        if i % 10 == 0:
+            actions.append({
+                'discriminator': ('view', i),
+                'callable': None,
+                'args': (),
+                'kw': {},
+                'includepath': (),
+                'info': None,
+                'order': ORDERS[i % len(ORDERS)],
+                'introspectables': (),
+                })
+    return actions
+
+def main(argv=sys.argv):
+    counts = [int(arg) for arg in argv[1:]] or [1000, 10000, 100000]
+    for count in counts:
+        actions = make_actions(count)
+        start = time.time()
+        resolved = list(resolveConflicts(actions))
+        elapsed = time.time() - start
+        print('%7d actions %10.1f ms (%d resolved)' % (
+            len(actions), elapsed * 1e3, len(resolved)))
+
+if __name__ == '__main__':
+    main()
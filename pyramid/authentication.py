@@ -3,7 +3,9 @@ from codecs import utf_8_decode
 from codecs import utf_8_encode
 from collections import namedtuple
 import hashlib
+import hmac
 import base64
+import os
 import re
 import time as time_mod
 import warnings
@@ -26,6 +28,7 @@ from pyramid.compat import (
 from pyramid.interfaces import (
     IAuthenticationPolicy,
     IDebugLogger,
+    IPrincipalCache,
     )
 
 from pyramid.security import (
@@ -33,16 +36,33 @@ from pyramid.security import (
     Everyone,
     )
 
-from pyramid.util import strings_differ
+from pyramid.util import (
+    LRUCache,
+    strings_differ,
+    )
 
 VALID_TOKEN = re.compile(r"^[A-Za-z][A-Za-z0-9+_-]*$")
 
 
 class CallbackAuthenticationPolicy(object):
-    """ Abstract class """
+    """ Abstract class
+
+    The result of ``unauthenticated_userid`` and of the ``callback`` are
+    memoized on the request, so asking for the authenticated userid and the
+    effective principals several times while handling a single request only
+    identifies the user and calls the groupfinder once.  Subclasses which
+    change the identity of the current request from within ``remember`` or
+    ``forget`` should call :meth:`invalidate_request_cache` to discard the
+    memoized values.
+
+    If ``principal_cache`` is an :class:`pyramid.interfaces.IPrincipalCache`,
+    the principals returned by the ``callback`` are additionally shared
+    between requests, keyed by userid.
+    """
 
     debug = False
     callback = None
+    principal_cache = None
 
     def _log(self, msg, methodname, request):
         logger = request.registry.queryUtility(IDebugLogger)
@@ -57,6 +77,44 @@ class CallbackAuthenticationPolicy(object):
             princid = None
         return princid
 
+    def _get_request_cache(self, request):
+        caches = getattr(request, '_authn_policy_cache', None)
+        if caches is None:
+            caches = request._authn_policy_cache = {}
+        return caches.setdefault(id(self), {})
+
+    def invalidate_request_cache(self, request):
+        """ Discard the ``unauthenticated_userid`` and ``callback`` results
+        memoized by this policy on ``request``.
+
+        .. versionadded:: 1.10
+        """
+        caches = getattr(request, '_authn_policy_cache', None)
+        if caches is not None:
+            caches.pop(id(self), None)
+
+    def _get_userid(self, request):
+        cache = self._get_request_cache(request)
+        if 'userid' not in cache:
+            cache['userid'] = self.unauthenticated_userid(request)
+        return cache['userid']
+
+    def _get_groups(self, userid, request):
+        cache = self._get_request_cache(request)
+        memo = cache.get('groups')
+        if memo is not None and memo[0] == userid:
+            return memo[1]
+        principal_cache = self.principal_cache
+        groups = None
+        if principal_cache is not None:
+            groups = principal_cache.get(userid)
+        if groups is None:
+            groups = self.callback(userid, request)
+            if groups is not None and principal_cache is not None:
+                principal_cache.set(userid, groups)
+        cache['groups'] = (userid, groups)
+        return groups
+
     def authenticated_userid(self, request):
         """ Return the authenticated userid or ``None``.
 
@@ -68,7 +126,7 @@ class CallbackAuthenticationPolicy(object):
 
         """
         debug = self.debug
-        userid = self.unauthenticated_userid(request)
+        userid = self._get_userid(request)
         if userid is None:
             debug and self._log(
                 'call to unauthenticated_userid returned None; returning None',
@@ -89,7 +147,7 @@ class CallbackAuthenticationPolicy(object):
                 'authenticated_userid',
                 request)
             return userid
-        callback_ok = self.callback(userid, request)
+        callback_ok = self._get_groups(userid, request)
         if callback_ok is not None: # is not None!
             debug and self._log(
                 'groupfinder callback returned %r; returning %r' % (
@@ -129,7 +187,7 @@ class CallbackAuthenticationPolicy(object):
         """
         debug = self.debug
         effective_principals = [Everyone]
-        userid = self.unauthenticated_userid(request)
+        userid = self._get_userid(request)
 
         if userid is None:
             debug and self._log(
@@ -156,7 +214,7 @@ class CallbackAuthenticationPolicy(object):
                 request)
             groups = []
         else:
-            groups = self.callback(userid, request)
+            groups = self._get_groups(userid, request)
             debug and self._log(
                 'groupfinder callback returned %r as groups' % (groups,),
                 'effective_principals',
@@ -184,6 +242,41 @@ class CallbackAuthenticationPolicy(object):
         return effective_principals
 
 
+@implementer(IPrincipalCache)
+class LRUPrincipalCache(object):
+    """ An in-process :class:`pyramid.interfaces.IPrincipalCache` which
+    remembers the principals of at most ``max_size`` users for ``timeout``
+    seconds each.  When it is full, the principals of the least recently
+    seen user are discarded.
+
+    Only principals returned for existing users are cached: a groupfinder
+    returning ``None`` is called again on the next request.  Because the
+    cache is keyed only by userid, it must not be used with a groupfinder
+    whose result depends on other attributes of the request.
+
+    ``stats()`` returns a dictionary containing the number of cache
+    ``hits`` and ``misses`` as well as the ``hit_ratio``.
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, max_size=1000, timeout=300):
+        self._cache = LRUCache(max_size, timeout)
+
+    def get(self, userid):
+        return self._cache.get(userid)
+
+    def set(self, userid, principals):
+        self._cache.put(userid, principals)
+
+    def invalidate(self, userid):
+        self._cache.invalidate(userid)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
 @implementer(IAuthenticationPolicy)
 class RepozeWho1AuthenticationPolicy(CallbackAuthenticationPolicy):
     """ A :app:`Pyramid` :term:`authentication policy` which
@@ -386,6 +479,15 @@ class RemoteUserAuthenticationPolicy(CallbackAuthenticationPolicy):
         user does exist.  If ``callback`` is None, the userid will be assumed
         to exist with no group principals.
 
+    ``principal_cache``
+
+        Default: ``None``.  An :class:`pyramid.interfaces.IPrincipalCache`,
+        such as :class:`pyramid.authentication.LRUPrincipalCache`, used to
+        share the principals returned by the ``callback`` between requests.
+        Optional.
+
+        This option is available as of :app:`Pyramid` 1.10.
+
     ``debug``
 
         Default: ``False``.  If ``debug`` is ``True``, log messages to the
@@ -397,10 +499,12 @@ class RemoteUserAuthenticationPolicy(CallbackAuthenticationPolicy):
     :class:`pyramid.interfaces.IAuthenticationPolicy`.
     """
 
-    def __init__(self, environ_key='REMOTE_USER', callback=None, debug=False):
+    def __init__(self, environ_key='REMOTE_USER', callback=None, debug=False,
+                 principal_cache=None):
         self.environ_key = environ_key
         self.callback = callback
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def unauthenticated_userid(self, request):
         """ The ``REMOTE_USER`` value found within the ``environ``."""
@@ -558,6 +662,26 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
 
        Optional.
 
+    ``principal_cache``
+
+       Default: ``None``.  An :class:`pyramid.interfaces.IPrincipalCache`,
+       such as :class:`pyramid.authentication.LRUPrincipalCache`, used to
+       share the principals returned by the ``callback`` between requests.
+       Optional.
+
+       This option is available as of :app:`Pyramid` 1.10.
+
+    ``ticket_cache_size``
+
+       Default: ``None``.  If this is a positive integer, up to this many
+       verified auth tickets are remembered, keyed by the raw cookie value
+       (and the remote address when ``include_ip`` is true), so that a
+       cookie which is sent again does not have its signature recomputed.
+       A ticket is remembered until it times out or is due to be reissued;
+       expiration is still checked on every request.  Optional.
+
+       This option is available as of :app:`Pyramid` 1.10.
+
     ``debug``
 
         Default: ``False``.  If ``debug`` is ``True``, log messages to the
@@ -585,6 +709,8 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
                  hashalg='sha512',
                  parent_domain=False,
                  domain=None,
+                 principal_cache=None,
+                 ticket_cache_size=None,
                  ):
         self.cookie = AuthTktCookieHelper(
             secret,
@@ -600,9 +726,11 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
             hashalg=hashalg,
             parent_domain=parent_domain,
             domain=domain,
+            ticket_cache_size=ticket_cache_size,
             )
         self.callback = callback
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def unauthenticated_userid(self, request):
         """ The userid key within the auth_tkt cookie."""
@@ -618,10 +746,12 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
         the response.
 
         """
+        self.invalidate_request_cache(request)
         return self.cookie.remember(request, userid, **kw)
 
     def forget(self, request):
         """ A list of headers which will delete appropriate cookies."""
+        self.invalidate_request_cache(request)
         return self.cookie.forget(request)
 
 def b64encode(v):
@@ -795,7 +925,8 @@ class AuthTktCookieHelper(object):
     def __init__(self, secret, cookie_name='auth_tkt', secure=False,
                  include_ip=False, timeout=None, reissue_time=None,
                  max_age=None, http_only=False, path="/", wild_domain=True,
-                 hashalg='md5', parent_domain=False, domain=None):
+                 hashalg='md5', parent_domain=False, domain=None,
+                 ticket_cache_size=None):
 
         serializer = _SimpleSerializer()
 
@@ -819,6 +950,10 @@ class AuthTktCookieHelper(object):
         self.parent_domain = parent_domain
         self.domain = domain
         self.hashalg = hashalg
+        if ticket_cache_size:
+            self.ticket_cache = LRUCache(int(ticket_cache_size))
+        else:
+            self.ticket_cache = None
 
     def _get_cookies(self, request, value, max_age=None):
         cur_domain = request.domain
@@ -845,6 +980,17 @@ class AuthTktCookieHelper(object):
         headers = profile.get_headers(value, **kw)
         return headers
 
+    def _ticket_lifetime(self, timestamp, now):
+        # a verified ticket is only worth remembering until it expires or
+        # is replaced by a reissued one
+        boundaries = [
+            timestamp + limit
+            for limit in (self.timeout, self.reissue_time)
+            if limit is not None
+            ]
+        if boundaries:
+            return min(boundaries) - now
+
     def identify(self, request):
         """ Return a dictionary with authentication information, or ``None``
         if no valid auth_tkt is attached to ``request``"""
@@ -859,17 +1005,33 @@ class AuthTktCookieHelper(object):
         else:
             remote_addr = '0.0.0.0'
 
-        try:
-            timestamp, userid, tokens, user_data = self.parse_ticket(
-                self.secret, cookie, remote_addr, self.hashalg)
-        except self.BadTicket:
-            return None
-
         now = self.now # service tests
 
         if now is None:
             now = time_mod.time()
 
+        ticket = None
+        ticket_cache = self.ticket_cache
+        if ticket_cache is not None:
+            ticket = ticket_cache.get((cookie, remote_addr))
+
+        if ticket is not None:
+            timestamp, userid, tokens, user_data = ticket
+            tokens = list(tokens)
+        else:
+            try:
+                timestamp, userid, tokens, user_data = self.parse_ticket(
+                    self.secret, cookie, remote_addr, self.hashalg)
+            except self.BadTicket:
+                return None
+            if ticket_cache is not None:
+                lifetime = self._ticket_lifetime(timestamp, now)
+                if lifetime is None or lifetime > 0:
+                    ticket_cache.put(
+                        (cookie, remote_addr),
+                        (timestamp, userid, tuple(tokens), user_data),
+                        timeout=lifetime)
+
         if self.timeout and ( (timestamp + self.timeout) < now ):
             # the auth_tkt data has expired
             return None
@@ -1014,6 +1176,15 @@ class SessionAuthenticationPolicy(CallbackAuthenticationPolicy):
        the user does exist.  If ``callback`` is ``None``, the userid
        will be assumed to exist with no principals.  Optional.
 
+    ``principal_cache``
+
+       Default: ``None``.  An :class:`pyramid.interfaces.IPrincipalCache`,
+       such as :class:`pyramid.authentication.LRUPrincipalCache`, used to
+       share the principals returned by the ``callback`` between requests.
+       Optional.
+
+       This option is available as of :app:`Pyramid` 1.10.
+
     ``debug``
 
         Default: ``False``.  If ``debug`` is ``True``, log messages to the
@@ -1023,19 +1194,23 @@ class SessionAuthenticationPolicy(CallbackAuthenticationPolicy):
 
     """
 
-    def __init__(self, prefix='auth.', callback=None, debug=False):
+    def __init__(self, prefix='auth.', callback=None, debug=False,
+                 principal_cache=None):
         self.callback = callback
         self.prefix = prefix or ''
         self.userid_key = prefix + 'userid'
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def remember(self, request, userid, **kw):
         """ Store a userid in the session."""
         request.session[self.userid_key] = userid
+        self.invalidate_request_cache(request)
         return []
 
     def forget(self, request):
         """ Remove the stored userid from the session."""
+        self.invalidate_request_cache(request)
         if self.userid_key in request.session:
             del request.session[self.userid_key]
         return []
@@ -1065,6 +1240,28 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
        Default: ``"Realm"``.  The Basic Auth Realm string.  Usually displayed to
        the user by the browser in the login dialog.
 
+    ``check_cache_size``
+
+       Default: ``None``.  If this is a positive integer, up to this many
+       successful calls to ``check`` are remembered for
+       ``check_cache_timeout`` seconds, so that clients which send the same
+       credentials with every request only pay for an expensive password
+       verification once per timeout.  The credentials are remembered as a
+       hash keyed with a random per-process secret rather than in clear
+       text.  Only use this when the result of ``check`` depends on nothing
+       but the username and password.  Optional.
+
+       This option is available as of :app:`Pyramid` 1.10.
+
+    ``check_cache_timeout``
+
+       Default: ``300``.  The number of seconds for which a successful
+       verification is remembered when ``check_cache_size`` is set.  A
+       credential change or revocation may take this long to be noticed.
+       Optional.
+
+       This option is available as of :app:`Pyramid` 1.10.
+
     ``debug``
 
         Default: ``False``.  If ``debug`` is ``True``, log messages to the
@@ -1091,10 +1288,27 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
                 return response
             return HTTPForbidden()
     """
-    def __init__(self, check, realm='Realm', debug=False):
+    # the ``check`` callback verifies the password, so its result must never
+    # be shared between requests by userid alone
+    principal_cache = None
+
+    def __init__(self, check, realm='Realm', debug=False,
+                 check_cache_size=None, check_cache_timeout=300):
         self.check = check
         self.realm = realm
         self.debug = debug
+        if check_cache_size:
+            self.check_cache = LRUCache(
+                int(check_cache_size), int(check_cache_timeout))
+            self._check_cache_secret = os.urandom(32)
+        else:
+            self.check_cache = None
+
+    def _credentials_key(self, username, password):
+        # the username can't contain a colon, so this is unambiguous
+        credentials = bytes_(username + ':' + password, 'utf-8')
+        return hmac.new(
+            self._check_cache_secret, credentials, hashlib.sha256).digest()
 
     def unauthenticated_userid(self, request):
         """ The userid parsed from the ``Authorization`` request header."""
@@ -1115,14 +1329,22 @@ class BasicAuthAuthenticationPolicy(CallbackAuthenticationPolicy):
         return [('WWW-Authenticate', 'Basic realm="%s"' % self.realm)]
 
     def callback(self, username, request):
-        # Username arg is ignored. Unfortunately
-        # extract_http_basic_credentials winds up getting called twice when
-        # authenticated_userid is called. Avoiding that, however,
-        # winds up duplicating logic from the superclass.
+        # Username arg is ignored.  The superclass memoizes the result of
+        # this callback for the duration of the request, so the credentials
+        # are only extracted and checked once per request.
         credentials = extract_http_basic_credentials(request)
         if credentials:
             username, password = credentials
-            return self.check(username, password, request)
+            check_cache = self.check_cache
+            if check_cache is None:
+                return self.check(username, password, request)
+            key = self._credentials_key(username, password)
+            principals = check_cache.get(key)
+            if principals is None:
+                principals = self.check(username, password, request)
+                if principals is not None:
+                    check_cache.put(key, principals)
+            return principals
 
 
 class _SimpleSerializer(object):
@@ -1,9 +1,11 @@
 from pyramid.interfaces import (
     ILocaleNegotiator,
     ITranslationDirectories,
+    PHASE3_CONFIG,
     )
 
 from pyramid.exceptions import ConfigurationError
+from pyramid.i18n import _preload_localizers
 from pyramid.path import AssetResolver
 from pyramid.util import action_method
 
@@ -77,6 +79,15 @@ class I18NConfiguratorMixin(object):
            to ``add_translation_dirs`` to override an earlier call, inserting
            folders at the beginning of the translation directory list.
 
+        When the ``pyramid.preload_translations`` setting is true, the
+        message catalogs of every locale found in the translation
+        directories are loaded when this configuration is committed rather
+        than on the first request for each locale.
+
+        .. versionchanged:: 1.10
+
+           Support the ``pyramid.preload_translations`` setting.
+
         """
         introspectables = []
         override = kw.pop('override', False)
@@ -115,5 +126,20 @@ class I18NConfiguratorMixin(object):
                 for directory in reversed(directories):
                     tdirs.insert(0, directory)
 
+            settings = self.registry.settings or {}
+            if (
+                settings.get('preload_translations') and
+                not getattr(self.registry, '_preload_translations', False)
+            ):
+                # the registry remembers that the localizers will be
+                # preloaded by a single action running once every
+                # translation directory being committed is registered
+                self.registry._preload_translations = True
+                self.action(None, preload, order=PHASE3_CONFIG + 1)
+
+        def preload():
+            self.registry._preload_translations = False
+            _preload_localizers(self.registry)
+
         self.action(None, register, introspectables=introspectables)
 
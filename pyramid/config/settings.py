@@ -100,8 +100,11 @@ def Settings(d=None, _environ_=os.environ, **kw):
         d[k] = d['reload_assets'] or d['reload_resources']
 
     S('default_locale_name', 'PYRAMID_DEFAULT_LOCALE_NAME', str, 'en')
+    S('preload_translations', 'PYRAMID_PRELOAD_TRANSLATIONS', asbool)
     S('prevent_http_cache', 'PYRAMID_PREVENT_HTTP_CACHE', asbool)
     S('prevent_cachebust', 'PYRAMID_PREVENT_CACHEBUST', asbool)
     S('csrf_trusted_origins', 'PYRAMID_CSRF_TRUSTED_ORIGINS', aslist, [])
+    S('compression_level', 'PYRAMID_COMPRESSION_LEVEL', int, 6)
+    S('compression_min_size', 'PYRAMID_COMPRESSION_MIN_SIZE', int, 1024)
 
     return d
@@ -7,7 +7,10 @@ from pyramid.interfaces import (
     IRendererFactory,
     )
 
-from pyramid.renderers import RendererHelper
+from pyramid.renderers import (
+    RendererHelper,
+    _clear_renderer_helpers,
+    )
 
 from pyramid.traversal import (
     decode_path_info,
@@ -160,6 +163,7 @@ class TestingConfiguratorMixin(object):
         if renderer is None:
             renderer = DummyTemplateRenderer()
         factory.add(path, renderer)
+        _clear_renderer_helpers(self.registry)
         return renderer
 
     testing_add_template = testing_add_renderer
@@ -1,6 +1,10 @@
 from zope.interface import implementer
 
-from pyramid.interfaces import ITweens
+from pyramid.interfaces import (
+    IResponseCache,
+    ITweens,
+    PHASE1_CONFIG,
+    )
 
 from pyramid.compat import (
     string_types,
@@ -9,6 +13,8 @@ from pyramid.compat import (
 
 from pyramid.exceptions import ConfigurationError
 
+from pyramid.responsecache import ResponseCache
+
 from pyramid.tweens import (
     MAIN,
     INGRESS,
@@ -108,6 +114,32 @@ class TweensConfiguratorMixin(object):
 
     def add_default_tweens(self):
         self.add_tween(EXCVIEW)
+        # used by pyramid.responsecache.response_cache_tween_factory
+        self.set_response_cache(ResponseCache())
+
+    @action_method
+    def set_response_cache(self, cache):
+        """ Set the cache of responses used by
+        :func:`pyramid.responsecache.response_cache_tween_factory`.
+
+        The ``cache`` argument should be an object implementing
+        :class:`pyramid.interfaces.IResponseCache` or a :term:`dotted Python
+        name` to such an object.  By default, a
+        :class:`pyramid.responsecache.ResponseCache` keeping the responses
+        in memory is used.
+
+        .. versionadded:: 1.10
+        """
+        cache = self.maybe_dotted(cache)
+        def register():
+            self.registry.registerUtility(cache, IResponseCache)
+        intr = self.introspectable('response caches',
+                                   IResponseCache,
+                                   self.object_description(cache),
+                                   'response cache')
+        intr['cache'] = cache
+        self.action(IResponseCache, register, order=PHASE1_CONFIG,
+                    introspectables=(intr,))
 
     @action_method
     def _add_tween(self, tween_factory, under=None, over=None, explicit=False):
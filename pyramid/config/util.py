@@ -1,5 +1,10 @@
 from hashlib import md5
 import inspect
+import json
+import os
+import sys
+
+import venusian
 
 from pyramid.compat import (
     bytes_,
@@ -15,6 +20,7 @@ from pyramid.util import (
     TopologicalSorter,
     action_method,
     ActionInfo,
+    atomic_write,
     )
 
 action_method = action_method # support bw compat imports
@@ -238,3 +244,90 @@ def takes_one_arg(callee, attr=None, argname=None):
                 return True
 
     return False
+
+class ScanCache(object):
+    """ Remembers which modules found by a scan define no object decorated
+    for :term:`Venusian`, keyed by the path, modification time and size of
+    their source file, in the JSON file at ``path``.  Such modules are
+    ignored by the next scans as long as their file is unchanged, so that
+    they are not imported."""
+    def __init__(self, path):
+        self.path = path
+        self.modules = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or not isinstance(
+                data.get('modules'), dict):
+            return {}
+        return data['modules']
+
+    def ignore(self, fullname):
+        """ Return ``True`` if ``fullname`` names a module known to define
+        no decorated object whose source file did not change."""
+        entry = self.modules.get(fullname)
+        if entry is None or entry[3]:
+            return False
+        try:
+            st = os.stat(entry[0])
+        except (IOError, OSError):
+            return False
+        return [st.st_mtime, st.st_size] == entry[1:3]
+
+    def update(self, package_name):
+        """ Record the modules of the package named ``package_name`` which
+        were imported by a scan, and save the file if it changed."""
+        modules = dict(self.modules)
+        prefix = package_name + '.'
+        for name, module in list(sys.modules.items()):
+            if (
+                not name.startswith(prefix) or
+                module is None or
+                hasattr(module, '__path__')
+            ):
+                # packages are always imported to find their modules
+                continue
+            filename = getattr(module, '__file__', None)
+            if not filename:
+                continue
+            if filename.endswith(('.pyc', '.pyo')):
+                filename = filename[:-1]
+            try:
+                st = os.stat(filename)
+            except (IOError, OSError):
+                continue
+            modules[name] = [filename, st.st_mtime, st.st_size,
+                             has_venusian_callbacks(module)]
+        if modules != self.modules:
+            self.modules = modules
+            self._save()
+
+    def _save(self):
+        try:
+            atomic_write(
+                self.path, json.dumps({'modules': self.modules},
+                                      sort_keys=True))
+        except (IOError, OSError):
+            # the cache only saves work at startup
+            pass
+
+def has_venusian_callbacks(module):
+    """ Return ``True`` if ``module`` defines an object decorated for
+    :term:`Venusian`."""
+    mod_name = module.__name__
+    for name, ob in list(vars(module).items()):
+        try:
+            attached = getattr(ob, venusian.ATTACH_ATTR)
+            if attached.attached_to(mod_name, name, ob):
+                return True
+        except Exception:
+            # see venusian.Scanner.scan: some objects fail in arbitrary
+            # ways when asked for the callbacks attribute
+            continue
+    return False
@@ -18,6 +18,7 @@ from pyramid.interfaces import (
     IPackageOverrides,
     IRendererFactory,
     IRequest,
+    IRequestCoalescer,
     IResponse,
     IRouteRequest,
     ISecuredView,
@@ -71,6 +72,7 @@ from pyramid.util import (
     viewdefaults,
     action_method,
     as_sorted_tuple,
+    LRUCache,
     TopologicalSorter,
     )
 
@@ -209,6 +211,8 @@ class ViewsConfiguratorMixin(object):
         decorator=None,
         mapper=None,
         http_cache=None,
+        etag=None,
+        coalesce=None,
         match_param=None,
         check_csrf=None,
         require_csrf=None,
@@ -366,6 +370,62 @@ class ViewsConfiguratorMixin(object):
           before returning the response from the view.  This effectively
           disables any HTTP caching done by ``http_cache`` for that response.
 
+        etag
+
+          .. versionadded:: 1.10
+
+          ``True``, a callable or a :term:`dotted Python name` referring to a
+          callable.  Default: ``None``.
+
+          When you supply an ``etag`` value, ``GET`` and ``HEAD`` requests
+          carrying an ``If-None-Match`` or ``If-Modified-Since`` header are
+          answered with a ``304 Not Modified`` response when the
+          representation they validate is still current.
+
+          If ``etag`` is ``True``, a strong entity tag is computed from the
+          body of each successful response which does not already have an
+          ``ETag`` header, and the body is dropped from the response if the
+          client already holds it.  The view is still executed and its
+          result rendered; only the transfer of the body is saved.  Bodies
+          which are streamed (for instance the body of a
+          :class:`pyramid.response.FileResponse`) are not hashed.
+
+          If ``etag`` is a callable, it is called with the ``context`` and
+          the ``request`` before the view callable is executed and should
+          return cheaply either a string, which is used as a strong entity
+          tag, a :class:`datetime.datetime`, which is used as the
+          ``Last-Modified`` date of the response, or ``None`` if the
+          resource has no validator.  When the client's copy is current,
+          the ``304 Not Modified`` response is returned without executing
+          the view callable, with the headers requested by ``http_cache``.
+          Otherwise the validator is added to the response of the view
+          unless the view set it already.
+
+        coalesce
+
+          .. versionadded:: 1.10
+
+          ``True``, the name of a request header or a sequence of request
+          header names.  Default: ``None``.
+
+          When you supply a ``coalesce`` value, concurrent ``GET`` and
+          ``HEAD`` requests to this view which have the same route name,
+          matchdict and query string (or the same path when the view is
+          found by traversal), and the same values for the named request
+          headers, are executed only once: the requests arriving while the
+          view is executed for the first one wait for it and receive a copy
+          of its response.  Name the headers the response depends on, for
+          instance ``('Accept-Language', 'Cookie')``, as the responses of
+          requests which differ in other headers are shared.  The permission
+          of the view is checked for every request.
+
+          Responses which set a cookie or have a streamed body, and the
+          responses to requests which used their session or added response
+          callbacks, are not shared; the waiting requests then execute the
+          view themselves.
+          See :class:`pyramid.viewderivers.RequestCoalescer` for how
+          timeouts and exceptions are handled and how to get statistics.
+
         require_csrf
 
           .. versionadded:: 1.7
@@ -750,6 +810,7 @@ class ViewsConfiguratorMixin(object):
         for_ = self.maybe_dotted(for_)
         containment = self.maybe_dotted(containment)
         mapper = self.maybe_dotted(mapper)
+        etag = self.maybe_dotted(etag)
 
         def combine(*decorators):
             def decorated(view_callable):
@@ -874,6 +935,8 @@ class ViewsConfiguratorMixin(object):
             match_param=match_param,
             check_csrf=check_csrf,
             http_cache=http_cache,
+            etag=etag,
+            coalesce=coalesce,
             require_csrf=require_csrf,
             callable=view,
             mapper=mapper,
@@ -968,6 +1031,8 @@ class ViewsConfiguratorMixin(object):
                 decorator=decorator,
                 mapper=mapper,
                 http_cache=http_cache,
+                etag=etag,
+                coalesce=coalesce,
                 require_csrf=require_csrf,
                 extra_options=ovals,
             )
@@ -1259,12 +1324,17 @@ class ViewsConfiguratorMixin(object):
         d = pyramid.viewderivers
         derivers = [
             ('secured_view', d.secured_view),
+            ('etag_view', d.etag_view),
+            ('coalesced_view', d.coalesced_view),
             ('owrapped_view', d.owrapped_view),
             ('http_cached_view', d.http_cached_view),
             ('decorated_view', d.decorated_view),
             ('rendered_view', d.rendered_view),
             ('mapped_view', d.mapped_view),
         ]
+        # the coalesced_view deriver uses the coalescer of the registry
+        self.set_request_coalescer(d.RequestCoalescer())
+
         last = INGRESS
         for name, deriver in derivers:
             self.add_view_deriver(
@@ -1370,7 +1440,7 @@ class ViewsConfiguratorMixin(object):
                      phash=DEFAULT_PHASH, decorator=None, route_name=None,
                      mapper=None, http_cache=None, context=None,
                      require_csrf=None, exception_only=False,
-                     extra_options=None):
+                     extra_options=None, etag=None, coalesce=None):
         view = self.maybe_dotted(view)
         mapper = self.maybe_dotted(mapper)
         if isinstance(renderer, string_types):
@@ -1397,6 +1467,8 @@ class ViewsConfiguratorMixin(object):
             mapper=mapper,
             decorator=decorator,
             http_cache=http_cache,
+            etag=etag,
+            coalesce=coalesce,
             require_csrf=require_csrf,
             route_name=route_name
         )
@@ -1727,6 +1799,31 @@ class ViewsConfiguratorMixin(object):
         self.action(IViewMapperFactory, register, order=PHASE1_CONFIG,
                     introspectables=(intr,))
 
+    @action_method
+    def set_request_coalescer(self, coalescer):
+        """ Set the object used by views configured with the ``coalesce``
+        option to let concurrent identical requests share a response.
+
+        The ``coalescer`` argument should be an object implementing
+        :class:`pyramid.interfaces.IRequestCoalescer` or a :term:`dotted
+        Python name` to such an object.  By default, a
+        :class:`pyramid.viewderivers.RequestCoalescer` is used.
+
+        .. versionadded:: 1.10
+        """
+        coalescer = self.maybe_dotted(coalescer)
+        def register():
+            self.registry.registerUtility(coalescer, IRequestCoalescer)
+        # IRequestCoalescer is looked up as the result of view config
+        # in phase 3
+        intr = self.introspectable('request coalescers',
+                                   IRequestCoalescer,
+                                   self.object_description(coalescer),
+                                   'request coalescer')
+        intr['coalescer'] = coalescer
+        self.action(IRequestCoalescer, register, order=PHASE1_CONFIG,
+                    introspectables=(intr,))
+
     @action_method
     def add_static_view(self, name, path, **kw):
         """ Add a view used to render static assets such as images
@@ -1746,6 +1843,34 @@ class ViewsConfiguratorMixin(object):
         prefix*.  By default, this argument is ``None``, meaning that no
         particular Expires or Cache-Control headers are set in the response.
 
+        The ``file_cache_size``, ``file_cache_max_bytes`` and
+        ``file_cache_check_interval`` keyword arguments are passed to the
+        :class:`pyramid.static.static_view` and configure its in-memory cache
+        of small files.  Like ``cache_max_age``, they have no effect when the
+        ``name`` is a *url prefix*.  By default, no files are cached.
+
+        The ``content_encodings`` keyword argument is a sequence of content
+        codings, such as ``['br', 'gzip']``, in order of preference.  When
+        the client accepts one of them, a precompressed sidecar of the
+        requested asset (for example ``app.js.br`` or ``app.js.gz`` for
+        ``app.js``) is served with a matching ``Content-Encoding`` header.
+        Which sidecars exist is looked up once per asset, unless
+        ``pyramid.reload_assets`` is enabled.  Like ``cache_max_age``, it has
+        no effect when the ``name`` is a *url prefix*.  By default, no
+        sidecars are served.
+
+        The ``path_cache_size`` keyword argument enables a cache of up to
+        this many resolved asset paths for a package-relative ``path``, so
+        that the :term:`asset override` machinery is consulted once per
+        asset instead of on every request.  The cache is emptied when asset
+        overrides are added, and is not used when ``pyramid.reload_assets``
+        is enabled.  By default, paths are resolved on every request.
+
+        .. versionchanged:: 1.10
+           Added the ``file_cache_size``, ``file_cache_max_bytes``,
+           ``file_cache_check_interval``, ``content_encodings`` and
+           ``path_cache_size`` arguments.
+
         The ``permission`` keyword argument is used to specify the
         :term:`permission` required by a user to execute the static view.  By
         default, it is the string
@@ -1933,33 +2058,147 @@ class ViewDeriverInfo(object):
 
 @implementer(IStaticURLInfo)
 class StaticURLInfo(object):
+    # maximum number of memoized cache-busted asset paths
+    memo_size = 1000
+
     def __init__(self):
         self.registrations = []
         self.cache_busters = []
+        self._index = None
+        self._memo = LRUCache(self.memo_size)
 
     def generate(self, path, request, **kw):
-        for (url, spec, route_name) in self.registrations:
-            if path.startswith(spec):
-                subpath = path[len(spec):]
-                if WIN: # pragma: no cover
-                    subpath = subpath.replace('\\', '/') # windows
-                if self.cache_busters:
-                    subpath, kw = self._bust_asset_path(
-                        request, spec, subpath, kw)
-                if url is None:
-                    kw['subpath'] = subpath
-                    return request.route_url(route_name, **kw)
+        registration = self._find_registration(path)
+        if registration is None:
+            raise ValueError('No static URL definition matching %s' % path)
+
+        url, spec, route_name, pkg_name = registration
+        subpath = path[len(spec):]
+        if WIN: # pragma: no cover
+            subpath = subpath.replace('\\', '/') # windows
+        if self.cache_busters:
+            subpath, kw = self._memoized_bust_asset_path(
+                request, spec, pkg_name, subpath, kw)
+        if url is None:
+            kw['subpath'] = subpath
+            return request.route_url(route_name, **kw)
+        else:
+            app_url, qs, anchor = parse_url_overrides(request, kw)
+            parsed = url_parse(url)
+            if not parsed.scheme:
+                url = urlparse.urlunparse(parsed._replace(
+                    scheme=request.environ['wsgi.url_scheme']))
+            subpath = url_quote(subpath)
+            result = urljoin(url, subpath)
+            return result + qs + anchor
+
+    def _get_index(self):
+        """ Return the lookup tables built from ``registrations`` and
+        ``cache_busters``, rebuilding them if either list was replaced."""
+        index = self._index
+        if (
+            index is None or
+            index[0] is not self.registrations or
+            index[1] is not self.cache_busters
+        ):
+            index = self._build_index()
+        return index
+
+    def _build_index(self):
+        registrations = self.registrations
+        cache_busters = self.cache_busters
+        # spec -> (position, (url, spec, route_name, pkg_name)); the
+        # registration added first wins when several specs match a path
+        by_spec = {}
+        # specs which do not end with a separator can only be matched by
+        # scanning them
+        unindexed = []
+        for position, (url, spec, route_name) in enumerate(registrations):
+            pkg_name = resolve_asset_spec(spec)[0]
+            entry = (position, (url, spec, route_name, pkg_name))
+            if _ends_with_separator(spec):
+                by_spec.setdefault(spec, entry)
+            else:
+                unindexed.append(entry)
+        # (spec, explicit) -> cachebust; the longest matching spec wins
+        busters = {}
+        busters_indexed = True
+        for spec, cachebust, explicit in cache_busters:
+            busters[(spec, explicit)] = cachebust
+            if not _ends_with_separator(spec):
+                busters_indexed = False
+        index = (registrations, cache_busters, by_spec, unindexed,
+                 busters if busters_indexed else None)
+        self._index = index
+        self._memo.clear()
+        return index
+
+    def _find_registration(self, path):
+        index = self._get_index()
+        by_spec, unindexed = index[2], index[3]
+        best = None
+        for prefix in _separated_prefixes(path):
+            entry = by_spec.get(prefix)
+            if entry is not None and (best is None or entry[0] < best[0]):
+                best = entry
+        for entry in unindexed:
+            if (
+                path.startswith(entry[1][1]) and
+                (best is None or entry[0] < best[0])
+            ):
+                best = entry
+        if best is not None:
+            return best[1]
+
+    def _find_cache_buster(self, pathspec, rawspec):
+        """ Return the cache buster for an asset and whether it is
+        deterministic, ``(None, True)`` if there is none."""
+        busters = self._get_index()[4]
+        if busters is None:
+            for spec_, cachebust, explicit in reversed(self.cache_busters):
+                if (
+                    (explicit and rawspec.startswith(spec_)) or
+                    (not explicit and pathspec.startswith(spec_))
+                ):
+                    break
+            else:
+                return None, True
+        else:
+            for spec, explicit in ((rawspec, True), (pathspec, False)):
+                for prefix in _separated_prefixes(spec):
+                    cachebust = busters.get((prefix, explicit))
+                    if cachebust is not None:
+                        break
                 else:
-                    app_url, qs, anchor = parse_url_overrides(request, kw)
-                    parsed = url_parse(url)
-                    if not parsed.scheme:
-                        url = urlparse.urlunparse(parsed._replace(
-                            scheme=request.environ['wsgi.url_scheme']))
-                    subpath = url_quote(subpath)
-                    result = urljoin(url, subpath)
-                    return result + qs + anchor
+                    continue
+                break
+            else:
+                return None, True
+        return cachebust, bool(getattr(cachebust, 'deterministic', False))
 
-        raise ValueError('No static URL definition matching %s' % path)
+    def _memoized_bust_asset_path(self, request, spec, pkg_name, subpath, kw):
+        overrides = None
+        if pkg_name is not None:
+            overrides = request.registry.queryUtility(
+                IPackageOverrides, name=pkg_name)
+        try:
+            key = (
+                spec, subpath, frozenset(kw.items()),
+                overrides, len(getattr(overrides, 'overrides', ())),
+                )
+            hash(key)
+        except TypeError: # unhashable keyword argument values
+            return self._bust_asset_path(request, spec, subpath, kw)
+        result = self._memo.get(key)
+        if result is None:
+            subpath, kw = self._bust_asset_path(request, spec, subpath, kw)
+            cachebust, deterministic = self._find_cache_buster(
+                kw['pathspec'], kw['rawspec'])
+            if deterministic:
+                self._memo.put(key, (subpath, dict(kw)))
+            return subpath, kw
+        subpath, kw = result
+        return subpath, dict(kw)
 
     def add(self, config, name, spec, **extra):
         # This feature only allows for the serving of a directory and
@@ -1993,10 +2232,20 @@ class StaticURLInfo(object):
             # it's a view name
             url = None
             cache_max_age = extra.pop('cache_max_age', None)
+            file_cache_kw = {}
+            for k in ('file_cache_size', 'file_cache_max_bytes',
+                      'file_cache_check_interval', 'path_cache_size'):
+                if k in extra:
+                    file_cache_kw[k] = extra.pop(k)
+            content_encodings = extra.pop('content_encodings', ())
+            reload = config.registry.settings.get(
+                'pyramid.reload_assets', False)
 
             # create a view
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True)
+                               use_subpath=True,
+                               content_encodings=content_encodings,
+                               reload=reload, **file_cache_kw)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -2038,6 +2287,7 @@ class StaticURLInfo(object):
 
             # url, spec, route_name
             registrations.append((url, spec, route_name))
+            self._index = None
 
         intr = config.introspectable('static views',
                                      name,
@@ -2087,6 +2337,7 @@ class StaticURLInfo(object):
                 cache_busters.pop(old_idx)
 
             cache_busters.insert(new_idx, (spec, cachebust, explicit))
+            self._index = None
 
         intr = config.introspectable('cache busters',
                                      spec,
@@ -2123,11 +2374,22 @@ class StaticURLInfo(object):
 
         kw['pathspec'] = pathspec
         kw['rawspec'] = rawspec
-        for spec_, cachebust, explicit in reversed(self.cache_busters):
-            if (
-                (explicit and rawspec.startswith(spec_)) or
-                (not explicit and pathspec.startswith(spec_))
-            ):
-                subpath, kw = cachebust(request, subpath, kw)
-                break
+        cachebust, deterministic = self._find_cache_buster(pathspec, rawspec)
+        if cachebust is not None:
+            subpath, kw = cachebust(request, subpath, kw)
         return subpath, kw
+
+def _ends_with_separator(spec):
+    return spec.endswith(('/', ':', os.sep))
+
+def _separated_prefixes(path):
+    """ Yield the prefixes of ``path`` which end with a separator, longest
+    first, which are the only candidates for a registered spec."""
+    end = len(path)
+    while end > 0:
+        end = max(path.rfind('/', 0, end), path.rfind(':', 0, end),
+                  path.rfind(os.sep, 0, end)) + 1
+        if end <= 0:
+            break
+        yield path[:end]
+        end -= 1
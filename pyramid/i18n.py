@@ -8,7 +8,12 @@ from translationstring import (
     TranslationStringFactory, # API
     )
 
-from pyramid.compat import PY2
+from pyramid.compat import (
+    PY2,
+    binary_type,
+    integer_types,
+    text_type,
+    )
 from pyramid.decorator import reify
 
 from pyramid.interfaces import (
@@ -18,24 +23,91 @@ from pyramid.interfaces import (
     )
 
 from pyramid.threadlocal import get_current_registry
+from pyramid.util import LRUCache
 
 TranslationString = TranslationString  # PyFlakes
 TranslationStringFactory = TranslationStringFactory  # PyFlakes
 
 DEFAULT_PLURAL = lambda n: int(n != 1)
 
+_marker = object()
+
+# the values of interpolation mappings which may be part of a memo key
+_immutable_types = frozenset(
+    (text_type, binary_type, float, bool, type(None)) + integer_types)
+
+def _frozen_mapping(mapping):
+    if not mapping:
+        return ()
+    items = []
+    for key, value in mapping.items():
+        if type(value) not in _immutable_types:
+            return None
+        # 1, 1.0 and True are equal but are not interpolated alike
+        items.append((key, type(value), value))
+    return frozenset(items)
+
 class Localizer(object):
     """
     An object providing translation and pluralizations related to
     the current request's locale name.  A
     :class:`pyramid.i18n.Localizer` object is created using the
     :func:`pyramid.i18n.get_localizer` function.
+
+    The results of :meth:`.translate` and :meth:`.pluralize` are
+    remembered for the last ``cache_size`` distinct sets of arguments whose
+    interpolation mappings only hold strings, numbers, booleans or ``None``.
+    Pass ``cache_size=None`` to disable this cache.
+
+    .. versionchanged:: 1.10
+       Added the ``cache_size`` argument.
     """
-    def __init__(self, locale_name, translations):
+    def __init__(self, locale_name, translations, cache_size=1000):
         self.locale_name = locale_name
         self.translations = translations
         self.pluralizer = None
         self.translator = None
+        self._cache = None
+        if cache_size is not None:
+            self._cache = LRUCache(cache_size)
+
+    def _translate_key(self, tstring, domain, mapping):
+        if type(tstring) is TranslationString:
+            tmapping = _frozen_mapping(tstring.mapping)
+            if tmapping is None:
+                return None
+            tkey = (text_type(tstring), tstring.domain, tstring.default,
+                    tstring.context, tmapping)
+        elif type(tstring) in (text_type, str):
+            tkey = tstring
+        else:
+            return None
+        mapping = _frozen_mapping(mapping)
+        if mapping is None:
+            return None
+        return ('translate', tkey, domain, mapping)
+
+    def _pluralize_key(self, singular, plural, n, domain, mapping):
+        if (
+            type(n) not in _immutable_types or
+            not isinstance(singular, (text_type, str)) or
+            not isinstance(plural, (text_type, str))
+        ):
+            return None
+        mapping = _frozen_mapping(mapping)
+        if mapping is None:
+            return None
+        return ('pluralize', text_type(singular), text_type(plural),
+                type(n), n, domain, mapping)
+
+    def _cached(self, key, func, *arg, **kw):
+        if key is None or self._cache is None:
+            return func(*arg, **kw)
+        result = self._cache.get(key, _marker)
+        if result is _marker:
+            result = func(*arg, **kw)
+            self._cache.put(key, result)
+        return result
 
     def translate(self, tstring, domain=None, mapping=None):
         """
@@ -69,7 +141,9 @@ class Localizer(object):
         """
         if self.translator is None:
             self.translator = Translator(self.translations)
-        return self.translator(tstring, domain=domain, mapping=mapping)
+        return self._cached(
+            self._translate_key(tstring, domain, mapping),
+            self.translator, tstring, domain=domain, mapping=mapping)
 
     def pluralize(self, singular, plural, n, domain=None, mapping=None):
         """
@@ -112,8 +186,10 @@ class Localizer(object):
         """
         if self.pluralizer is None:
             self.pluralizer = Pluralizer(self.translations)
-        return self.pluralizer(singular, plural, n, domain=domain,
-                               mapping=mapping)
+        return self._cached(
+            self._pluralize_key(singular, plural, n, domain, mapping),
+            self.pluralizer, singular, plural, n, domain=domain,
+            mapping=mapping)
 
 
 def default_locale_negotiator(request):
@@ -210,6 +286,40 @@ def make_localizer(current_locale_name, translation_directories):
     return Localizer(locale_name=current_locale_name,
                           translations=translations)
 
+def _find_locale_names(translation_directories):
+    names = set()
+    for tdir in translation_directories:
+        if not os.path.isdir(tdir):
+            continue
+        for lname in os.listdir(tdir):
+            messages_dir = os.path.join(tdir, lname, 'LC_MESSAGES')
+            if os.path.isdir(os.path.realpath(messages_dir)):
+                names.add(lname)
+    return sorted(names)
+
+def _preload_localizers(registry):
+    """ Register a :class:`pyramid.i18n.Localizer` for every locale found in
+    the translation directories of ``registry``, so that requests never need
+    to read message catalogs or register localizers."""
+    tdirs = registry.queryUtility(ITranslationDirectories, default=[])
+    for locale_name in _find_locale_names(tdirs):
+        localizer = make_localizer(locale_name, tdirs)
+        registry.registerUtility(localizer, ILocalizer, name=locale_name)
+
+def _unknown_localizer(registry, current_locale_name):
+    # a locale without catalogs of its own when the localizers were
+    # preloaded: share the catalogs of its language if there are some
+    translations = None
+    if '_' in current_locale_name:
+        language = current_locale_name.split('_')[0]
+        localizer = registry.queryUtility(ILocalizer, name=language)
+        if localizer is not None:
+            translations = localizer.translations
+    if translations is None:
+        return make_localizer(current_locale_name, ())
+    return Localizer(locale_name=current_locale_name,
+                     translations=translations)
+
 def get_localizer(request):
     """
     .. deprecated:: 1.5
@@ -380,6 +490,12 @@ class LocalizerRequestMixin(object):
         localizer = registry.queryUtility(ILocalizer, name=current_locale_name)
 
         if localizer is None:
+            settings = registry.settings or {}
+            if settings.get('preload_translations'):
+                # every catalog was loaded at configuration time; do not
+                # register a localizer for each locale name requested
+                return _unknown_localizer(registry, current_locale_name)
+
             # no localizer utility registered yet
             tdirs = registry.queryUtility(ITranslationDirectories, default=[])
             localizer = make_localizer(current_locale_name, tdirs)
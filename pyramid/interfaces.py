@@ -500,6 +500,28 @@ class IAuthenticationPolicy(Interface):
 
         """
 
+class IPrincipalCache(Interface):
+    """ A cache of the principals returned by the groupfinder ``callback``
+    of an authentication policy, shared between requests and keyed by
+    userid.
+
+    .. versionadded:: 1.10
+    """
+    def get(userid):
+        """ Return the principals cached for ``userid`` or ``None`` if there
+        are none."""
+
+    def set(userid, principals):
+        """ Cache the ``principals`` returned by the groupfinder for
+        ``userid``."""
+
+    def invalidate(userid):
+        """ Discard the principals cached for ``userid``.  Applications
+        should call this when the groups of a user change."""
+
+    def clear():
+        """ Discard all cached principals."""
+
 class IAuthorizationPolicy(Interface):
     """ An object representing a Pyramid authorization policy. """
     def permits(context, principals, permission):
@@ -954,6 +976,25 @@ class ISessionFactory(Interface):
     def __call__(request):
         """ Return an ISession object """
 
+class ISessionStore(Interface):
+    """ A backend used by
+    :func:`pyramid.session.ServerSideSessionFactory` to keep the serialized
+    data of sessions on the server, keyed by session id.
+
+    .. versionadded:: 1.10
+    """
+    def load(session_id):
+        """ Return the bytes most recently saved for ``session_id`` or
+        ``None`` if there are none or they have expired."""
+
+    def save(session_id, data, timeout):
+        """ Store the bytes ``data`` for ``session_id``.  If ``timeout`` is
+        not ``None``, the data may be discarded after ``timeout``
+        seconds."""
+
+    def delete(session_id):
+        """ Discard the data stored for ``session_id``, if any."""
+
 class ISession(IDict):
     """ An interface representing a session (a web session object,
     usually accessed via ``request.session``.
@@ -1327,8 +1368,72 @@ class ICacheBuster(Interface):
         ``pathspec`` is ``myapp:static/foo.png`` whereas the ``rawspec`` may
         be ``themepkg:bar.png``, assuming a call to
         ``config.override_asset('myapp:static/foo.png', 'themepkg:bar.png')``.
+
+        If the return value depends only on ``subpath`` and ``kw``, and not on
+        the ``request`` or on external state which may change, the cache
+        buster may have a ``deterministic`` attribute with a true value.  The
+        URL generation machinery then memoizes its results, and the cache
+        buster is called only once for each combination of asset and keyword
+        arguments.
+
+        .. versionchanged:: 1.10
+           Added support for the ``deterministic`` attribute.
         """
 
+class IResponseCacheStore(Interface):
+    """ A backend used by :class:`pyramid.responsecache.ResponseCache` to
+    keep serialized responses, keyed by strings.
+
+    .. versionadded:: 1.10
+    """
+    def load(key):
+        """ Return the bytes most recently saved for ``key`` or ``None`` if
+        there are none or they have expired."""
+
+    def save(key, data, timeout):
+        """ Store the bytes ``data`` for ``key``.  If ``timeout`` is not
+        ``None``, the data may be discarded after ``timeout`` seconds."""
+
+    def delete(key):
+        """ Discard the data stored for ``key``, if any."""
+
+class IResponseCache(Interface):
+    """ A cache of responses used by
+    :func:`pyramid.responsecache.response_cache_tween_factory`.
+
+    .. versionadded:: 1.10
+    """
+    def lookup(request):
+        """ Return a new response for ``request`` built from a fresh cached
+        response or ``None``."""
+
+    def update(request, response):
+        """ Remember ``response`` as the response to ``request`` if both may
+        be cached."""
+
+    def purge(url):
+        """ Discard every cached response to ``GET`` requests for ``url``."""
+
+    def stats():
+        """ Return a dictionary describing the cache effectiveness."""
+
+class IRequestCoalescer(Interface):
+    """ An object used by views configured with the ``coalesce`` option to
+    let concurrent identical requests share the response computed for the
+    first one.
+
+    .. versionadded:: 1.10
+    """
+    def coalesce(key, func):
+        """ Return the result of calling ``func`` without arguments.  If
+        ``func`` is already being called for an equal ``key`` in another
+        thread, wait for that call to complete and return its result
+        instead."""
+
+    def stats():
+        """ Return a dictionary describing how many calls were
+        coalesced."""
+
 # configuration phases: a lower phase number means the actions associated
 # with this phase will be executed earlier than those with later phase
 # numbers.  The default phase number is 0, FTR.
@@ -56,6 +56,10 @@ class Registry(Components, dict):
 
     _settings = None
 
+    # true while the action preloading the localizers queued by
+    # add_translation_dirs when preload_translations is set is pending
+    _preload_translations = False
+
     def __init__(self, package_name=CALLER_PACKAGE, *args, **kw):
         # add a registry-instance-specific lock, which is used when the lookup
         # cache is mutated
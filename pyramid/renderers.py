@@ -16,6 +16,8 @@ from pyramid.interfaces import (
     )
 
 from pyramid.compat import (
+    bytes_,
+    integer_types,
     string_types,
     text_type,
     )
@@ -31,7 +33,10 @@ from pyramid.path import caller_package
 
 from pyramid.response import _get_response_factory
 from pyramid.threadlocal import get_current_registry
-from pyramid.util import hide_attrs
+from pyramid.util import (
+    hide_attrs,
+    LRUCache,
+    )
 
 # API
 
@@ -76,8 +81,7 @@ def render(renderer_name, value, request=None, package=None):
         registry = None
     if package is None:
         package = caller_package()
-    helper = RendererHelper(name=renderer_name, package=package,
-                            registry=registry)
+    helper = _get_renderer_helper(renderer_name, package, registry)
 
     with hide_attrs(request, 'response'):
         result = helper.render(value, None, request=request)
@@ -137,8 +141,7 @@ def render_to_response(renderer_name,
         registry = None
     if package is None:
         package = caller_package()
-    helper = RendererHelper(name=renderer_name, package=package,
-                            registry=registry)
+    helper = _get_renderer_helper(renderer_name, package, registry)
 
     with hide_attrs(request, 'response'):
         if response is not None:
@@ -160,9 +163,42 @@ def get_renderer(renderer_name, package=None):
     """
     if package is None:
         package = caller_package()
-    helper = RendererHelper(name=renderer_name, package=package)
+    helper = _get_renderer_helper(renderer_name, package)
     return helper.renderer
 
+# the maximum number of renderer helpers remembered per registry by
+# ``render``, ``render_to_response`` and ``get_renderer``
+renderer_helper_cache_size = 1000
+
+def _get_renderer_helper(name, package, registry=None):
+    # Return a renderer helper for ``name`` relative to ``package``,
+    # reusing the one created by an earlier call with the same arguments
+    # so that its renderer is not created by the renderer factory again.
+    # The factory is part of the key, so that registering another factory
+    # for the renderer type discards the helpers using the previous one.
+    if registry is None:
+        registry = get_current_registry()
+    settings = getattr(registry, 'settings', None) or {}
+    if settings.get('reload_templates'):
+        return RendererHelper(name=name, package=package, registry=registry)
+    factory = registry.queryUtility(IRendererFactory,
+                                    name=_renderer_type(name))
+    cache = getattr(registry, '_renderer_helper_cache', None)
+    if cache is None:
+        cache = LRUCache(renderer_helper_cache_size)
+        registry._renderer_helper_cache = cache
+    key = (name, package, factory)
+    helper = cache.get(key)
+    if helper is None:
+        helper = RendererHelper(name=name, package=package, registry=registry)
+        cache.put(key, helper)
+    return helper
+
+def _clear_renderer_helpers(registry):
+    cache = getattr(registry, '_renderer_helper_cache', None)
+    if cache is not None:
+        cache.clear()
+
 # concrete renderer factory implementations (also API)
 
 def string_renderer_factory(info):
@@ -178,8 +214,6 @@ def string_renderer_factory(info):
         return value
     return _render
 
-_marker = object()
-
 class JSON(object):
     """ Renderer that returns a JSON-encoded string.
 
@@ -223,9 +257,17 @@ class JSON(object):
         explained in :ref:`json_serializing_custom_objects` instead
         of replacing the serializer.
 
+        The serializer may return either text or UTF-8 encoded bytes.  Bytes
+        are used as the response body as they are, without being encoded
+        again.
+
     .. versionadded:: 1.4
        Prior to this version, there was no public API for supplying options
        to the underlying serializer without defining a custom renderer.
+
+    .. versionchanged:: 1.10
+       The adapter found for a type is remembered, and serializers may
+       return bytes.
     """
 
     def __init__(self, serializer=json.dumps, adapters=(), **kw):
@@ -234,6 +276,8 @@ class JSON(object):
         self.serializer = serializer
         self.kw = kw
         self.components = Components()
+        # type -> adapter or None
+        self._adapter_cache = {}
         for type, adapter in adapters:
             self.add_adapter(type, adapter)
 
@@ -261,6 +305,7 @@ class JSON(object):
 
         self.components.registerAdapter(adapter, (type_or_iface,),
                                         IJSONAdapter)
+        self._adapter_cache = {}
 
     def __call__(self, info):
         """ Returns a plain JSON-encoded string with content-type
@@ -279,18 +324,33 @@ class JSON(object):
         return _render
 
     def _make_default(self, request):
+        find_adapter = self._find_adapter
         def default(obj):
             if hasattr(obj, '__json__'):
                 return obj.__json__(request)
-            obj_iface = providedBy(obj)
-            adapters = self.components.adapters
-            result = adapters.lookup((obj_iface,), IJSONAdapter,
-                                     default=_marker)
-            if result is _marker:
+            result = find_adapter(obj)
+            if result is None:
                 raise TypeError('%r is not JSON serializable' % (obj,))
             return result(obj, request)
         return default
 
+    def _find_adapter(self, obj):
+        cls = type(obj)
+        # the interfaces of an object are those of its type unless some were
+        # declared directly on the object itself
+        cacheable = '__provides__' not in getattr(obj, '__dict__', ())
+        if cacheable:
+            cache = self._adapter_cache
+            try:
+                return cache[cls]
+            except KeyError:
+                pass
+        adapters = self.components.adapters
+        result = adapters.lookup((providedBy(obj),), IJSONAdapter)
+        if cacheable:
+            cache[cls] = result
+        return result
+
 json_renderer_factory = JSON() # bw compat
 
 JSONP_VALID_CALLBACK = re.compile(r"^[$a-z_][$0-9a-z_\.\[\]]+[^.]$", re.I)
@@ -381,28 +441,177 @@ class JSONP(JSON):
                         raise HTTPBadRequest('Invalid JSONP callback function name.')
 
                     ct = 'application/javascript'
-                    body = '/**/{0}({1});'.format(callback, val)
+                    if isinstance(val, bytes):
+                        body = b'/**/' + bytes_(callback) + b'(' + val + b');'
+                    else:
+                        body = '/**/{0}({1});'.format(callback, val)
                 response = request.response
                 if response.content_type == response.default_content_type:
                     response.content_type = ct
             return body
         return _render
 
+class StreamingJSON(JSON):
+    """ Renderer that returns a JSON document as an iterator of bytes chunks,
+    which :app:`Pyramid` uses as the ``app_iter`` of the response, so that
+    large results are sent while they are being serialized.
+
+    Configure a streaming JSON renderer using the
+    :meth:`~pyramid.config.Configurator.add_renderer` API at application
+    startup time:
+
+    .. code-block:: python
+
+       from pyramid.config import Configurator
+       from pyramid.renderers import StreamingJSON
+
+       config = Configurator()
+       config.add_renderer('jsonstream', StreamingJSON())
+
+    A view using this renderer may return iterators, such as generators,
+    which are serialized as JSON arrays, one item at a time.  Iterators,
+    lists and tuples may be the result of the view or values of
+    dictionaries which are themselves the result of the view or values of
+    such dictionaries:
+
+    .. code-block:: python
+
+       from pyramid.view import view_config
+
+       @view_config(route_name='export', renderer='jsonstream')
+       def export(request):
+           rows = request.dbsession.query(Order).yield_per(1000)
+           return {'orders': (row.as_dict() for row in rows)}
+
+    Each item is serialized with ``json.JSONEncoder`` configured with the
+    keyword arguments passed to the constructor, using the ``__json__``
+    method of objects and the adapters registered with
+    :meth:`~pyramid.renderers.JSON.add_adapter` for objects that it cannot
+    serialize natively.  Iterators nested deeper inside of the items are
+    serialized as arrays too, but are consumed all at once.  The output is
+    collected into chunks of about ``chunk_size`` bytes.
+
+    .. note::
+
+       The response is already being sent when an item is serialized, so an
+       exception raised while iterating over the result of the view, or
+       while serializing one of its items, cannot be turned into an error
+       response anymore.
+
+    .. versionadded:: 1.10
+    """
+
+    def __init__(self, chunk_size=65536, adapters=(), **kw):
+        JSON.__init__(self, adapters=adapters, **kw)
+        self.chunk_size = chunk_size
+
+    def __call__(self, info):
+        """ Returns an iterator over the JSON-encoded result with
+        content-type ``application/json``. The content-type may be
+        overridden by setting ``request.response.content_type``."""
+        def _render(value, system):
+            request = system.get('request')
+            if request is not None:
+                response = request.response
+                ct = response.content_type
+                if ct == response.default_content_type:
+                    response.content_type = 'application/json'
+            json_default = self._make_default(request)
+            def default(obj):
+                if _is_iterator(obj):
+                    return list(obj)
+                return json_default(obj)
+            encoder = json.JSONEncoder(default=default, **self.kw)
+            return self._iter_chunks(self._iterencode(value, encoder))
+
+        return _render
+
+    def _iter_chunks(self, pieces):
+        chunk = []
+        size = 0
+        for piece in pieces:
+            chunk.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield ''.join(chunk).encode('utf-8')
+                chunk = []
+                size = 0
+        if chunk:
+            yield ''.join(chunk).encode('utf-8')
+
+    def _iterencode(self, value, encoder):
+        if isinstance(value, dict):
+            yield '{'
+            items = value.items()
+            if encoder.sort_keys:
+                items = sorted(items)
+            first = True
+            for key, item in items:
+                key = self._encode_key(key, encoder)
+                if key is None:
+                    continue
+                if first:
+                    first = False
+                else:
+                    yield encoder.item_separator
+                yield key
+                yield encoder.key_separator
+                for piece in self._iterencode(item, encoder):
+                    yield piece
+            yield '}'
+        elif isinstance(value, (list, tuple)) or _is_iterator(value):
+            yield '['
+            first = True
+            for item in value:
+                if first:
+                    first = False
+                else:
+                    yield encoder.item_separator
+                yield encoder.encode(item)
+            yield ']'
+        else:
+            yield encoder.encode(value)
+
+    def _encode_key(self, key, encoder):
+        # follow the rules of json.dumps for keys which are not strings
+        if isinstance(key, string_types):
+            pass
+        elif key is True:
+            key = 'true'
+        elif key is False:
+            key = 'false'
+        elif key is None:
+            key = 'null'
+        elif isinstance(key, integer_types + (float,)):
+            key = encoder.encode(key)
+        elif encoder.skipkeys:
+            return None
+        else:
+            raise TypeError('key %r is not a string' % (key,))
+        return encoder.encode(key)
+
+def _is_iterator(value):
+    return (
+        hasattr(value, '__iter__') and
+        (hasattr(value, '__next__') or hasattr(value, 'next')) and
+        not isinstance(value, (string_types, bytes, dict))
+    )
+
+def _renderer_type(name):
+    if name and '.' in name:
+        return os.path.splitext(name)[1]
+    # important.. must be a string; cannot be None; see issue 249
+    return name or ''
+
 @implementer(IRendererInfo)
 class RendererHelper(object):
     def __init__(self, name=None, package=None, registry=None):
-        if name and '.' in name:
-            rtype = os.path.splitext(name)[1]
-        else:
-            # important.. must be a string; cannot be None; see issue 249
-            rtype = name or ''
-
         if registry is None:
             registry = get_current_registry()
 
         self.name = name
         self.package = package
-        self.type = rtype
+        self.type = _renderer_type(name)
         self.registry = registry
 
     @reify
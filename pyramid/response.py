@@ -1,11 +1,10 @@
 import mimetypes
-from os.path import (
-    getmtime,
-    getsize,
-    )
+import os
+import uuid
 
 import venusian
 
+from webob import Request as _Request
 from webob import Response as _Response
 from zope.interface import implementer
 from pyramid.interfaces import IResponse, IResponseFactory
@@ -25,6 +24,9 @@ init_mimetypes(mimetypes)
 
 _BLOCK_SIZE = 4096 * 64 # 256K
 
+# requests for more ranges than this are answered with the whole file
+_MAX_RANGES = 16
+
 @implementer(IResponse)
 class Response(_Response):
     pass
@@ -50,6 +52,19 @@ class FileResponse(Response):
     It's generally safe to leave this set to ``None`` if you're serving a
     binary file.  This argument will be ignored if you also leave
     ``content-type`` as ``None``.
+
+    The file is opened and its size and modification time are read from the
+    open file once.  A request for a single byte range is served by seeking
+    to the start of the range and reading only the requested bytes.  A
+    request for several ranges is answered with a ``multipart/byteranges``
+    body unless it asks for more than 16 ranges, in which case the whole file
+    is sent.  Whole files are still handed to the ``wsgi.file_wrapper`` of the
+    server, if any, so that it may use a zero-copy mechanism such as
+    ``sendfile``.
+
+    .. versionchanged:: 1.10
+       Byte ranges are read directly from the file, and multiple ranges are
+       supported.
     """
     def __init__(self, path, request=None, cache_max_age=None,
                  content_type=None, content_encoding=None):
@@ -60,9 +75,14 @@ class FileResponse(Response):
             content_type=content_type,
             content_encoding=content_encoding
         )
-        self.last_modified = getmtime(path)
-        content_length = getsize(path)
         f = open(path, 'rb')
+        try:
+            st = os.fstat(f.fileno())
+        except Exception:
+            f.close()
+            raise
+        self.last_modified = st.st_mtime
+        content_length = st.st_size
         app_iter = None
         if request is not None:
             environ = request.environ
@@ -71,11 +91,137 @@ class FileResponse(Response):
         if app_iter is None:
             app_iter = FileIter(f, _BLOCK_SIZE)
         self.app_iter = app_iter
+        self._file = f
+        self._file_iter = app_iter
         # assignment of content_length must come after assignment of app_iter
         self.content_length = content_length
         if cache_max_age is not None:
             self.cache_expires = cache_max_age
 
+    def _serves_file(self):
+        # the app_iter may have been replaced after the response was created
+        return self._app_iter is self._file_iter
+
+    def app_iter_range(self, start, stop):
+        if not self._serves_file():
+            return super(FileResponse, self).app_iter_range(start, stop)
+        return _FileRangeIter(self._file, [(start, stop)], _BLOCK_SIZE)
+
+    def conditional_response_app(self, environ, start_response):
+        header = environ.get('HTTP_RANGE')
+        if header and ',' in header:
+            ranges = self._multiple_ranges(environ, header)
+            if ranges is not None and len(ranges) > 1:
+                return self._multiple_ranges_app(
+                    ranges, environ, start_response)
+            # webob only honors the first of several ranges; let it answer
+            # for the single range left after merging, or with 416 Requested
+            # Range Not Satisfiable if there is none, or send the whole file
+            environ = dict(environ)
+            if ranges is None:
+                del environ['HTTP_RANGE']
+            elif ranges:
+                start, stop = ranges[0]
+                environ['HTTP_RANGE'] = 'bytes=%d-%d' % (start, stop - 1)
+            else:
+                environ['HTTP_RANGE'] = 'bytes=%d-' % self.content_length
+        return super(FileResponse, self).conditional_response_app(
+            environ, start_response)
+
+    def _multiple_ranges_app(self, ranges, environ, start_response):
+        length = self.content_length
+        boundary = uuid.uuid4().hex
+        content_type = self.headers.get('Content-Type')
+        parts = []
+        for start, stop in ranges:
+            head = '--%s\r\n' % boundary
+            if content_type:
+                head += 'Content-Type: %s\r\n' % content_type
+            head += 'Content-Range: bytes %d-%d/%d\r\n\r\n' % (
+                start, stop - 1, length)
+            parts.append((head.encode('latin-1'), start, stop))
+        tail = ('\r\n--%s--\r\n' % boundary).encode('latin-1')
+        body_length = len(tail) + sum(
+            len(head) + stop - start for head, start, stop in parts)
+        # parts after the first one are separated by a CRLF
+        body_length += 2 * (len(parts) - 1)
+
+        headerlist = [
+            (name, value) for name, value in self.headerlist
+            if name.lower() not in ('content-type', 'content-length')
+            ]
+        headerlist.extend([
+            ('Content-Type', 'multipart/byteranges; boundary=%s' % boundary),
+            ('Content-Length', str(body_length)),
+            ])
+        start_response('206 Partial Content', headerlist)
+        app_iter = _FileRangeIter(self._file, ranges, _BLOCK_SIZE,
+                                  [head for head, _, _ in parts], tail)
+        if environ.get('REQUEST_METHOD', 'GET') == 'HEAD':
+            app_iter.close()
+            return []
+        return app_iter
+
+    def _multiple_ranges(self, environ, header):
+        """ Return the sorted, merged ``(start, stop)`` ranges to send, an
+        empty list if none of them is satisfiable, or ``None`` if the whole
+        file should be sent instead."""
+        if not self._serves_file():
+            return None
+        if environ.get('REQUEST_METHOD', 'GET') not in ('GET', 'HEAD'):
+            return None
+        if self.status_code != 200 or self.content_length is None:
+            return None
+        req = _Request(environ)
+        if req.if_none_match or req.if_modified_since:
+            # let webob decide whether to answer with 304 Not Modified
+            return None
+        if self not in req.if_range:
+            return None
+        ranges = _parse_byte_ranges(header, self.content_length)
+        if ranges is None or len(ranges) > _MAX_RANGES:
+            return None
+        return ranges
+
+def _parse_byte_ranges(header, length):
+    """ Parse a ``Range`` header into a sorted list of non-overlapping
+    ``(start, stop)`` tuples satisfiable for a representation of ``length``
+    bytes.  Returns ``None`` if the header is not a valid ``bytes`` range
+    set."""
+    units, _, specs = header.partition('=')
+    if units.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        first, sep, last = spec.strip().partition('-')
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                stop = int(last) + 1 if last else None
+                if stop is not None and stop <= start:
+                    return None
+            else:
+                suffix = int(last)
+                if suffix <= 0:
+                    return None
+                start, stop = max(length - suffix, 0), length
+        except ValueError:
+            return None
+        if start < length:
+            if stop is None or stop > length:
+                stop = length
+            ranges.append((start, stop))
+    ranges.sort()
+    merged = []
+    for start, stop in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(stop, merged[-1][1]))
+        else:
+            merged.append((start, stop))
+    return merged
+
 class FileIter(object):
     """ A fixed-block-size iterator for use as a WSGI app_iter.
 
@@ -102,6 +248,35 @@ class FileIter(object):
     def close(self):
         self.file.close()
 
+class _FileRangeIter(FileIter):
+    """ Iterate over the ``(start, stop)`` byte ranges of a file, optionally
+    preceding each range with the matching entry of ``heads`` and following
+    the last range with ``tail``."""
+    def __init__(self, file, ranges, block_size=_BLOCK_SIZE, heads=None,
+                 tail=None):
+        super(_FileRangeIter, self).__init__(file, block_size)
+        self._chunks = self._iter_chunks(ranges, heads, tail)
+
+    def _iter_chunks(self, ranges, heads, tail):
+        for i, (start, stop) in enumerate(ranges):
+            if heads is not None:
+                yield b'\r\n' + heads[i] if i else heads[i]
+            self.file.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                val = self.file.read(min(self.block_size, remaining))
+                if not val:
+                    break
+                remaining -= len(val)
+                yield val
+        if tail is not None:
+            yield tail
+
+    def next(self):
+        return next(self._chunks)
+
+    __next__ = next # py3
+
 
 class response_adapter(object):
     """ Decorator activated via a :term:`scan` which treats the function
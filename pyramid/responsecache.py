@@ -0,0 +1,253 @@
+import binascii
+import json
+import os
+import threading
+import time
+
+from zope.interface import implementer
+
+from pyramid.compat import (
+    bytes_,
+    text_,
+    )
+
+from pyramid.interfaces import (
+    IResponseCache,
+    IResponseCacheStore,
+    )
+
+from pyramid.response import Response
+from pyramid.util import (
+    _MemoryStore,
+    _SQLiteStore,
+    )
+
+@implementer(IResponseCacheStore)
+class MemoryResponseCacheStore(_MemoryStore):
+    """ An :class:`pyramid.interfaces.IResponseCacheStore` which keeps at
+    most ``max_size`` entries in the memory of the current process.  When
+    it is full, the least recently used entry is discarded.
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, max_size=1000):
+        _MemoryStore.__init__(self, max_size)
+
+@implementer(IResponseCacheStore)
+class SQLiteResponseCacheStore(_SQLiteStore):
+    """ An :class:`pyramid.interfaces.IResponseCacheStore` which keeps
+    cached responses in the SQLite database file at ``path``, so that they
+    are shared by all the processes of an application running on one host.
+
+    Expired responses are ignored when they are loaded; call :meth:`.purge`
+    periodically to remove them from the database.
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, path, table='pyramid_response_cache'):
+        _SQLiteStore.__init__(self, path, table)
+
+@implementer(IResponseCache)
+class ResponseCache(object):
+    """ A shared cache of responses to ``GET`` requests, used by
+    :func:`pyramid.responsecache.response_cache_tween_factory`.
+
+    A response is cached when it is a ``200 OK`` response whose
+    ``Cache-Control`` header holds a positive ``s-maxage`` or ``max-age``
+    directive, as set by the ``http_cache`` view option, and neither the
+    ``private``, ``no-cache`` nor ``no-store`` directives.  It is kept in
+    the ``store`` (by default a new
+    :class:`pyramid.responsecache.MemoryResponseCacheStore`) for that many
+    seconds, keyed by the URL of the request and the values of the request
+    headers named in its ``Vary`` header.
+
+    Responses which set a cookie, vary on ``*``, have a streamed body or a
+    body larger than ``max_body_size`` bytes are not cached, nor are the
+    responses to requests which used their :term:`session`.  Requests
+    carrying an ``Authorization`` header or a ``Cache-Control: no-store``
+    header bypass the cache, and requests with ``Cache-Control: no-cache``
+    are not answered from it.
+
+    Responses whose content depends on the identity of the user should not
+    be marked as cacheable, or should vary on the headers identifying the
+    user (for instance ``Vary: Cookie``).
+
+    .. versionadded:: 1.10
+    """
+    clock = staticmethod(time.time) # for tests
+
+    def __init__(self, store=None, max_body_size=1048576):
+        if store is None:
+            store = MemoryResponseCacheStore()
+        self.store = store
+        self.max_body_size = max_body_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.purges = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _bypass(self, request):
+        return (
+            request.method not in ('GET', 'HEAD') or
+            request.authorization is not None or
+            request.cache_control.no_store
+            )
+
+    def _load_json(self, key):
+        data = self.store.load(key)
+        if data is not None:
+            return json.loads(text_(data, 'utf-8'))
+
+    def _variant_key(self, request, url, index):
+        values = [request.headers.get(name, '') for name in index['vary']]
+        return '\n'.join([url, index['generation']] + values)
+
+    def lookup(self, request):
+        """ Return a new response for ``request`` built from a fresh cached
+        response or ``None``.  The response has an ``Age`` header and
+        answers conditional requests."""
+        if self._bypass(request) or request.cache_control.no_cache:
+            return None
+        url = request.url
+        entry = None
+        index = self._load_json(url)
+        if index is not None:
+            data = self.store.load(self._variant_key(request, url, index))
+            if data is not None:
+                head, body = data.split(b'\n', 1)
+                entry = json.loads(text_(head, 'utf-8'))
+        if entry is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        response = Response(
+            status=entry['status'],
+            headerlist=[tuple(header) for header in entry['headers']],
+            app_iter=[body],
+            )
+        response.headers['Age'] = str(
+            max(0, int(self.clock() - entry['stored'])))
+        response.conditional_response = True
+        return response
+
+    def _session_used(self, request):
+        # a response rendered from the session of one user must not be
+        # served to others, whether or not it sets the session cookie
+        return 'session' in getattr(request, '__dict__', {})
+
+    def _timeout(self, response):
+        if response.status_int != 200 or 'Set-Cookie' in response.headers:
+            return None
+        cache_control = response.cache_control
+        if (
+            cache_control.private or
+            cache_control.no_store or
+            cache_control.no_cache
+        ):
+            return None
+        timeout = cache_control.s_maxage
+        if timeout is None:
+            timeout = cache_control.max_age
+        if timeout is None or timeout <= 0:
+            return None
+        return timeout
+
+    def update(self, request, response):
+        """ Remember ``response`` as the response to ``request`` if both
+        may be cached."""
+        if (
+            request.method != 'GET' or
+            self._bypass(request) or
+            self._session_used(request)
+        ):
+            return
+        timeout = self._timeout(response)
+        if timeout is None:
+            return
+        vary = sorted(set(name.lower() for name in response.vary or ()))
+        if '*' in vary:
+            return
+        if not isinstance(response.app_iter, (list, tuple)):
+            # do not buffer a streamed body to cache it
+            return
+        body = response.body
+        if len(body) > self.max_body_size:
+            return
+        url = request.url
+        index = self._load_json(url)
+        if index is None or index['vary'] != vary:
+            # the variants stored for another index are abandoned
+            index = {
+                'vary': vary,
+                'generation': text_(binascii.hexlify(os.urandom(8))),
+                }
+        self.store.save(url, bytes_(json.dumps(index)), timeout)
+        head = json.dumps({
+            'status': response.status,
+            'headers': response.headerlist,
+            'stored': self.clock(),
+            })
+        self.store.save(
+            self._variant_key(request, url, index),
+            bytes_(head, 'utf-8') + b'\n' + body,
+            timeout,
+            )
+        self._count('stores')
+
+    def purge(self, url):
+        """ Discard every cached response to ``GET`` requests for ``url``,
+        whatever the headers of the request."""
+        self.store.delete(url)
+        self._count('purges')
+
+    def stats(self):
+        """ Return a dictionary with the number of cache ``hits``,
+        ``misses``, ``stores`` and ``purges`` in this process and the
+        ``hit_ratio``."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'purges': self.purges,
+                'hit_ratio': float(self.hits) / lookups if lookups else 0.0,
+                }
+
+def response_cache_tween_factory(handler, registry):
+    """ A :term:`tween` factory which produces a tween answering ``GET`` and
+    ``HEAD`` requests with cached responses before traversal or URL
+    dispatch and view lookup take place, and caching the responses marked
+    as cacheable by the views.
+
+    The cache is the :class:`pyramid.interfaces.IResponseCache` utility of
+    the registry, which may be used to purge URLs and get statistics.  It
+    is a :class:`pyramid.responsecache.ResponseCache` unless another one is
+    set with :meth:`pyramid.config.Configurator.set_response_cache`.
+
+    The tween is not used unless it is added explicitly, for instance with
+    ``config.add_tween('pyramid.responsecache.response_cache_tween_factory')``.
+
+    .. versionadded:: 1.10
+    """
+    cache = registry.queryUtility(IResponseCache)
+    if cache is None:
+        # the registry was not set up by a configurator
+        cache = ResponseCache()
+
+    def response_cache_tween(request):
+        response = cache.lookup(request)
+        if response is None:
+            response = handler(request)
+            # response callbacks, such as the one setting the session
+            # cookie, are only called after the tweens returned; store the
+            # response once they had a chance to change it
+            request.add_response_callback(cache.update)
+        return response
+
+    return response_cache_tween
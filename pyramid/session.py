@@ -2,6 +2,7 @@ import base64
 import binascii
 import hashlib
 import hmac
+import json
 import os
 import time
 
@@ -22,8 +23,16 @@ from pyramid.csrf import (
     check_csrf_token,
 )
 
-from pyramid.interfaces import ISession
-from pyramid.util import strings_differ
+from pyramid.interfaces import (
+    ISession,
+    ISessionStore,
+    )
+from pyramid.util import (
+    LRUCache,
+    _MemoryStore,
+    _SQLiteStore,
+    strings_differ,
+    )
 
 
 def manage_accessed(wrapped):
@@ -48,6 +57,66 @@ def manage_changed(wrapped):
     changed.__doc__ = wrapped.__doc__
     return changed
 
+class _Session(dict):
+    """ The dictionary, flash and CSRF methods shared by the sessions of the
+    session factories of this module."""
+
+    # non-modifying dictionary methods
+    get = manage_accessed(dict.get)
+    __getitem__ = manage_accessed(dict.__getitem__)
+    items = manage_accessed(dict.items)
+    values = manage_accessed(dict.values)
+    keys = manage_accessed(dict.keys)
+    __contains__ = manage_accessed(dict.__contains__)
+    __len__ = manage_accessed(dict.__len__)
+    __iter__ = manage_accessed(dict.__iter__)
+
+    if PY2:
+        iteritems = manage_accessed(dict.iteritems)
+        itervalues = manage_accessed(dict.itervalues)
+        iterkeys = manage_accessed(dict.iterkeys)
+        has_key = manage_accessed(dict.has_key)
+
+    # modifying dictionary methods
+    clear = manage_changed(dict.clear)
+    update = manage_changed(dict.update)
+    setdefault = manage_changed(dict.setdefault)
+    pop = manage_changed(dict.pop)
+    popitem = manage_changed(dict.popitem)
+    __setitem__ = manage_changed(dict.__setitem__)
+    __delitem__ = manage_changed(dict.__delitem__)
+
+    # flash API methods
+    @manage_changed
+    def flash(self, msg, queue='', allow_duplicate=True):
+        storage = self.setdefault('_f_' + queue, [])
+        if allow_duplicate or (msg not in storage):
+            storage.append(msg)
+
+    @manage_changed
+    def pop_flash(self, queue=''):
+        storage = self.pop('_f_' + queue, [])
+        return storage
+
+    @manage_accessed
+    def peek_flash(self, queue=''):
+        storage = self.get('_f_' + queue, [])
+        return storage
+
+    # CSRF API methods
+    @manage_changed
+    def new_csrf_token(self):
+        token = text_(binascii.hexlify(os.urandom(20)))
+        self['_csrft_'] = token
+        return token
+
+    @manage_accessed
+    def get_csrf_token(self):
+        token = self.get('_csrft_', None)
+        if token is None:
+            token = self.new_csrf_token()
+        return token
+
 def signed_serialize(data, secret):
     """ Serialize any pickleable structure (``data``) and sign it
     using the ``secret`` (must be a string).  Return the
@@ -127,6 +196,38 @@ class PickleSerializer(object):
         """Accept a Python object and return bytes."""
         return pickle.dumps(appstruct, self.protocol)
 
+class JSONSerializer(object):
+    """ A serializer that uses JSON without whitespace to dump Python
+    data to bytes.
+
+    Unlike :class:`pyramid.session.PickleSerializer`, loading a value can
+    never execute code and the output can be read by other languages.  It
+    can only serialize values which are supported by :func:`json.dumps`, and
+    tuples are loaded back as lists.
+
+    The gain is safety, not speed: for typical session data, the output is
+    larger than the output of :class:`pyramid.session.PickleSerializer` and
+    takes longer to produce and to load.
+
+    .. versionadded:: 1.10
+
+    """
+    def loads(self, bstruct):
+        """Accept bytes and return a Python object."""
+        # json.loads raises a ValueError for malformed input
+        return json.loads(text_(bstruct, 'utf-8'))
+
+    def dumps(self, appstruct):
+        """Accept a Python object and return bytes."""
+        return bytes_(json.dumps(appstruct, separators=(',', ':')), 'utf-8')
+
+class _BytesSerializer(object):
+    def loads(self, bstruct):
+        return bstruct
+
+    def dumps(self, appstruct):
+        return appstruct
+
 def BaseCookieSessionFactory(
     serializer,
     cookie_name='session',
@@ -216,10 +317,28 @@ def BaseCookieSessionFactory(
       while rendering a view. Default: ``True``.
 
     .. versionadded: 1.5a3
+
+    .. versionchanged:: 1.10
+       A session cookie is no longer set again when neither the session
+       data has changed nor the session is due to be reissued.
     """
 
+    if type(serializer) is SignedSerializer:
+        # sign the cookies apart from serializing the session data, so that
+        # the data can be compared with the data of the cookie unsigned
+        data_serializer = serializer.serializer
+        serializer = SignedSerializer(
+            serializer.secret,
+            serializer.salt,
+            serializer.hashalg,
+            serializer=_BytesSerializer(),
+            )
+    else:
+        data_serializer = serializer
+        serializer = _BytesSerializer()
+
     @implementer(ISession)
-    class CookieSession(dict):
+    class CookieSession(_Session):
         """ Dictionary-like session object """
 
         # configuration parameters
@@ -236,6 +355,12 @@ def BaseCookieSessionFactory(
         # dirty flag
         _dirty = False
 
+        # the unsigned cookie data and the unconverted renewal time of the
+        # session as they were received, used to avoid setting an identical
+        # cookie
+        _cookiedata = None
+        _renewed = None
+
         def __init__(self, request):
             self.request = request
             now = time.time()
@@ -246,7 +371,8 @@ def BaseCookieSessionFactory(
             cookieval = request.cookies.get(self._cookie_name)
             if cookieval is not None:
                 try:
-                    value = serializer.loads(bytes_(cookieval))
+                    cookiedata = serializer.loads(bytes_(cookieval))
+                    value = data_serializer.loads(cookiedata)
                 except ValueError:
                     # the cookie failed to deserialize, dropped
                     value = None
@@ -260,6 +386,8 @@ def BaseCookieSessionFactory(
                     created = float(cval)
                     state = sval
                     new = False
+                    self._cookiedata = cookiedata
+                    self._renewed = rval
                 except (TypeError, ValueError):
                     # value failed to unpack properly or renewed was not
                     # a numeric type so we'll fail deserialization here
@@ -270,6 +398,7 @@ def BaseCookieSessionFactory(
                     # expire the session because it was not renewed
                     # before the timeout threshold
                     state = {}
+                    self._cookiedata = None
 
             self.created = created
             self.accessed = renewed
@@ -289,71 +418,24 @@ def BaseCookieSessionFactory(
         def invalidate(self):
             self.clear() # XXX probably needs to unset cookie
 
-        # non-modifying dictionary methods
-        get = manage_accessed(dict.get)
-        __getitem__ = manage_accessed(dict.__getitem__)
-        items = manage_accessed(dict.items)
-        values = manage_accessed(dict.values)
-        keys = manage_accessed(dict.keys)
-        __contains__ = manage_accessed(dict.__contains__)
-        __len__ = manage_accessed(dict.__len__)
-        __iter__ = manage_accessed(dict.__iter__)
-
-        if PY2:
-            iteritems = manage_accessed(dict.iteritems)
-            itervalues = manage_accessed(dict.itervalues)
-            iterkeys = manage_accessed(dict.iterkeys)
-            has_key = manage_accessed(dict.has_key)
-
-        # modifying dictionary methods
-        clear = manage_changed(dict.clear)
-        update = manage_changed(dict.update)
-        setdefault = manage_changed(dict.setdefault)
-        pop = manage_changed(dict.pop)
-        popitem = manage_changed(dict.popitem)
-        __setitem__ = manage_changed(dict.__setitem__)
-        __delitem__ = manage_changed(dict.__delitem__)
-
-        # flash API methods
-        @manage_changed
-        def flash(self, msg, queue='', allow_duplicate=True):
-            storage = self.setdefault('_f_' + queue, [])
-            if allow_duplicate or (msg not in storage):
-                storage.append(msg)
-
-        @manage_changed
-        def pop_flash(self, queue=''):
-            storage = self.pop('_f_' + queue, [])
-            return storage
-
-        @manage_accessed
-        def peek_flash(self, queue=''):
-            storage = self.get('_f_' + queue, [])
-            return storage
-
-        # CSRF API methods
-        @manage_changed
-        def new_csrf_token(self):
-            token = text_(binascii.hexlify(os.urandom(20)))
-            self['_csrft_'] = token
-            return token
-
-        @manage_accessed
-        def get_csrf_token(self):
-            token = self.get('_csrft_', None)
-            if token is None:
-                token = self.new_csrf_token()
-            return token
-
         # non-API methods
         def _set_cookie(self, response):
             if not self._cookie_on_exception:
                 exception = getattr(self.request, 'exception', None)
                 if exception is not None: # dont set a cookie during exceptions
                     return False
-            cookieval = native_(serializer.dumps(
-                (self.accessed, self.created, dict(self))
-                ))
+            state = dict(self)
+            if self._cookiedata is not None and not self._renewal_due():
+                # the session does not need to be renewed yet, so the
+                # cookie only has to be set if its data has changed
+                cookiedata = data_serializer.dumps(
+                    (self._renewed, self.created, state)
+                    )
+                if cookiedata == self._cookiedata:
+                    return False
+            cookieval = native_(serializer.dumps(data_serializer.dumps(
+                (self.accessed, self.created, state)
+                )))
             if len(cookieval) > 4064:
                 raise ValueError(
                     'Cookie value is too long to store (%s bytes)' %
@@ -370,6 +452,11 @@ def BaseCookieSessionFactory(
                 )
             return True
 
+        def _renewal_due(self):
+            if self._reissue_time is None:
+                return False
+            return self.accessed - self.renewed > self._reissue_time
+
     return CookieSession
 
 
@@ -587,8 +674,14 @@ def SignedCookieSessionFactory(
       method should accept a Python object and return bytes.  A ``ValueError``
       should be raised for malformed inputs.  If a serializer is not passed,
       the :class:`pyramid.session.PickleSerializer` serializer will be used.
+      The :class:`pyramid.session.JSONSerializer` serializer may be used
+      instead when the session only contains JSON compatible values.
 
     .. versionadded: 1.5a3
+
+    .. versionchanged:: 1.10
+       A session cookie is no longer set again when neither the session
+       data has changed nor the session is due to be reissued.
     """
     if serializer is None:
         serializer = PickleSerializer()
@@ -613,6 +706,328 @@ def SignedCookieSessionFactory(
         set_on_exception=set_on_exception,
     )
 
+@implementer(ISessionStore)
+class MemorySessionStore(_MemoryStore):
+    """ An :class:`pyramid.interfaces.ISessionStore` which keeps the data
+    of at most ``max_size`` sessions in the memory of the current process.
+    When it is full, the least recently used session is discarded.
+
+    The data is lost when the process exits and is not shared between
+    processes, so this store is mostly useful for development and for
+    applications served by a single process.
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, max_size=10000):
+        _MemoryStore.__init__(self, max_size)
+
+@implementer(ISessionStore)
+class SQLiteSessionStore(_SQLiteStore):
+    """ An :class:`pyramid.interfaces.ISessionStore` which keeps session
+    data in the SQLite database file at ``path``.  The database may be
+    shared by all the processes of an application running on one host.
+
+    Expired sessions are ignored when they are loaded; call
+    :meth:`.purge` periodically to remove them from the database.
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, path, table='pyramid_sessions'):
+        _SQLiteStore.__init__(self, path, table)
+
+class _SessionIdSerializer(object):
+    def loads(self, bstruct):
+        return native_(bstruct)
+
+    def dumps(self, appstruct):
+        return bytes_(appstruct)
+
+def ServerSideSessionFactory(
+    secret,
+    store=None,
+    cookie_name='session',
+    max_age=None,
+    path='/',
+    domain=None,
+    secure=False,
+    httponly=False,
+    set_on_exception=True,
+    timeout=1200,
+    reissue_time=120,
+    hashalg='sha512',
+    salt='pyramid.session.',
+    serializer=None,
+    cache_size=None,
+    write_behind=False,
+    ):
+    """
+    .. versionadded:: 1.10
+
+    Configure a :term:`session factory` which will provide server-side
+    sessions.  The return value of this function is a :term:`session
+    factory`, which may be provided as the ``session_factory`` argument of a
+    :class:`pyramid.config.Configurator` constructor, or used as the
+    ``session_factory`` argument of the
+    :meth:`pyramid.config.Configurator.set_session_factory` method.
+
+    Only a signed, randomly generated session id is sent in the session
+    cookie.  The session data is kept in a ``store`` on the server and is
+    only saved when the session was changed during a request or is due to be
+    renewed, so sessions are not limited in size.  An empty session is not
+    stored at all.
+
+    Parameters:
+
+    ``secret``
+      A string which is used to sign the session id in the cookie.  It should
+      be unique within the set of secret values provided to Pyramid for its
+      various subsystems (see :ref:`admonishment_against_secret_sharing`).
+
+    ``store``
+      An :class:`pyramid.interfaces.ISessionStore` keeping the session data.
+      Default: a new :class:`pyramid.session.MemorySessionStore`.
+
+    ``hashalg``
+      The HMAC digest algorithm to use for signing. The algorithm must be
+      supported by the :mod:`hashlib` library. Default: ``'sha512'``.
+
+    ``salt``
+      A namespace to avoid collisions between different uses of a shared
+      secret. Default: ``'pyramid.session.'``.
+
+    ``cookie_name``
+      The name of the cookie used for sessioning. Default: ``'session'``.
+
+    ``max_age``
+      The maximum age of the cookie used for sessioning (in seconds).
+      Default: ``None`` (browser scope).
+
+    ``path``
+      The path used for the session cookie. Default: ``'/'``.
+
+    ``domain``
+      The domain used for the session cookie.  Default: ``None`` (no domain).
+
+    ``secure``
+      The 'secure' flag of the session cookie. Default: ``False``.
+
+    ``httponly``
+      Hide the cookie from Javascript by setting the 'HttpOnly' flag of the
+      session cookie. Default: ``False``.
+
+    ``timeout``
+      A number of seconds of inactivity before a session times out. If
+      ``None`` then the session never expires. Default: ``1200``.
+
+    ``reissue_time``
+      The number of seconds that must pass before the session is saved again
+      to extend its lifetime as the result of a request which accesses it.
+      If this value is ``0``, the session is saved on every request accessing
+      it. If ``None`` then the session's lifetime will never be extended.
+      Default: ``120``.
+
+    ``set_on_exception``
+      If ``True``, save the session and set its cookie even if an exception
+      occurs while rendering a view. Default: ``True``.
+
+    ``serializer``
+      An object with two methods: ``loads`` and ``dumps``, used to convert
+      the session data to and from the bytes kept in the ``store``.
+      Default: :class:`pyramid.session.PickleSerializer`.
+
+    ``cache_size``
+      If this is a positive integer, the serialized data of up to this many
+      recently used sessions is kept in memory in front of the ``store``,
+      so that loading them does not need to access the ``store``.  Only use
+      this when every request for a given session is handled by the same
+      process, otherwise a process may load data which was changed by
+      another one.  Default: ``None``.
+
+    ``write_behind``
+      If ``True``, changed sessions are saved to the ``store`` by a
+      :term:`finished callback` after the response has been generated,
+      rather than before the response is returned.  Default: ``False``.
+    """
+    if store is None:
+        store = MemorySessionStore()
+    if serializer is None:
+        serializer = PickleSerializer()
+    id_serializer = SignedSerializer(
+        secret,
+        salt,
+        hashalg,
+        serializer=_SessionIdSerializer(),
+        )
+    cache = LRUCache(int(cache_size), timeout) if cache_size else None
+
+    def load(session_id):
+        data = None
+        if cache is not None:
+            data = cache.get(session_id)
+        if data is None:
+            data = store.load(session_id)
+            if data is not None and cache is not None:
+                cache.put(session_id, data)
+        return data
+
+    def save(session_id, data):
+        store.save(session_id, data, timeout)
+        if cache is not None:
+            cache.put(session_id, data)
+
+    def delete(session_id):
+        store.delete(session_id)
+        if cache is not None:
+            cache.invalidate(session_id)
+
+    def new_session_id():
+        return native_(binascii.hexlify(os.urandom(32)))
+
+    @implementer(ISession)
+    class ServerSideSession(_Session):
+        """ Dictionary-like session object """
+
+        # configuration parameters
+        _cookie_name = cookie_name
+        _cookie_max_age = max_age if max_age is None else int(max_age)
+        _cookie_path = path
+        _cookie_domain = domain
+        _cookie_secure = secure
+        _cookie_httponly = httponly
+        _cookie_on_exception = set_on_exception
+        _timeout = timeout if timeout is None else int(timeout)
+        _reissue_time = reissue_time if reissue_time is None else int(reissue_time)
+
+        # dirty flag
+        _dirty = False
+
+        # the session id received in the cookie of the request, if any
+        _cookie_session_id = None
+
+        def __init__(self, request):
+            self.request = request
+            now = time.time()
+            created = renewed = now
+            new = True
+            state = {}
+            session_id = None
+            cookieval = request.cookies.get(self._cookie_name)
+            if cookieval is not None:
+                try:
+                    session_id = id_serializer.loads(bytes_(cookieval))
+                except ValueError:
+                    # the cookie failed to verify, dropped
+                    session_id = None
+
+            if session_id is not None:
+                self._cookie_session_id = session_id
+                data = load(session_id)
+                if data is not None:
+                    try:
+                        rval, cval, sval = serializer.loads(data)
+                        renewed = float(rval)
+                        created = float(cval)
+                        state = sval
+                        new = False
+                    except (TypeError, ValueError):
+                        state = {}
+
+            if self._timeout is not None and not new:
+                if now - renewed > self._timeout:
+                    # expire the session because it was not renewed
+                    # before the timeout threshold
+                    state = {}
+                    new = True
+
+            if new:
+                # never reuse an id which is not associated with live data
+                session_id = new_session_id()
+
+            self.session_id = session_id
+            self.created = created
+            self.accessed = renewed
+            self.renewed = renewed
+            self.new = new
+            dict.__init__(self, state)
+
+        # ISession methods
+        def changed(self):
+            if not self._dirty:
+                self._dirty = True
+                def set_cookie_callback(request, response):
+                    if not write_behind:
+                        self._save(request)
+                    self._set_cookie(response)
+                    if not write_behind:
+                        self.request = None # explicitly break cycle for gc
+                self.request.add_response_callback(set_cookie_callback)
+                if write_behind:
+                    def save_callback(request):
+                        self._save(request)
+                        self.request = None # explicitly break cycle for gc
+                    self.request.add_finished_callback(save_callback)
+
+        def invalidate(self):
+            if not self.new:
+                delete(self.session_id)
+            self.clear()
+            # a new id prevents session fixation
+            self.session_id = new_session_id()
+            self.new = True
+
+        # non-API methods
+        def _skip_on_exception(self, request):
+            if not self._cookie_on_exception:
+                exception = getattr(request, 'exception', None)
+                if exception is not None:
+                    return True
+            return False
+
+        def _save(self, request):
+            if self._skip_on_exception(request):
+                return False
+            state = dict(self)
+            if not state:
+                if not self.new:
+                    delete(self.session_id)
+                return False
+            save(self.session_id, serializer.dumps(
+                (self.accessed, self.created, state)))
+            return True
+
+        def _set_cookie(self, response):
+            if self._skip_on_exception(self.request):
+                return False
+            if not dict(self):
+                if self._cookie_session_id is None:
+                    return False
+                # the session is empty, so there is nothing left to track
+                response.delete_cookie(
+                    self._cookie_name,
+                    path=self._cookie_path,
+                    domain=self._cookie_domain,
+                    )
+                return True
+            if (
+                self.session_id == self._cookie_session_id and
+                self._cookie_max_age is None
+            ):
+                # the browser already has a cookie for this session which
+                # does not need to be extended
+                return False
+            response.set_cookie(
+                self._cookie_name,
+                value=native_(id_serializer.dumps(self.session_id)),
+                max_age=self._cookie_max_age,
+                path=self._cookie_path,
+                domain=self._cookie_domain,
+                secure=self._cookie_secure,
+                httponly=self._cookie_httponly,
+                )
+            return True
+
+    return ServerSideSession
+
 check_csrf_origin = check_csrf_origin  # api
 deprecated('check_csrf_origin',
            'pyramid.session.check_csrf_origin is deprecated as of Pyramid '
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
+from collections import namedtuple
+import hashlib
 import json
 import os
+import time
 
 from os.path import (
     getmtime,
@@ -25,8 +28,11 @@ from pyramid.asset import (
 from pyramid.compat import (
     lru_cache,
     text_,
+    WIN,
 )
 
+from pyramid.interfaces import IPackageOverrides
+
 from pyramid.httpexceptions import (
     HTTPNotFound,
     HTTPMovedPermanently,
@@ -37,12 +43,32 @@ from pyramid.path import caller_package
 from pyramid.response import (
     _guess_type,
     FileResponse,
+    Response,
 )
 
+from pyramid.threadlocal import get_current_registry
+
 from pyramid.traversal import traversal_path_info
 
+from pyramid.util import (
+    LRUCache,
+    add_vary,
+    atomic_write,
+    )
+
 slash = text_('/')
 
+_CachedFile = namedtuple('_CachedFile', [
+    'filepath', 'is_dir', 'body', 'content_type', 'content_encoding', 'mtime',
+    'size', 'etag', 'checked',
+    ])
+
+# file extensions of the precompressed sidecars served by a static view
+_encoding_extensions = {
+    'br': '.br',
+    'gzip': '.gz',
+    }
+
 class static_view(object):
     """ An instance of this class is a callable which can act as a
     :app:`Pyramid` :term:`view callable`; this view will serve
@@ -78,6 +104,34 @@ class static_view(object):
     the static application will consider request.environ[``PATH_INFO``] as
     ``PATH_INFO`` input. By default, this is ``False``.
 
+    ``file_cache_size`` enables an in-memory cache of small files when it is
+    a positive integer: up to this many files which are not larger than
+    ``file_cache_max_bytes`` (default 64KB) are kept in memory along with
+    their headers, and served without accessing the filesystem.  At most
+    every ``file_cache_check_interval`` seconds (default one second), the
+    modification time and size of a cached file are compared with the file
+    on disk, and the file is read again if it has changed.  By default, no
+    files are cached.
+
+    ``content_encodings`` is a sequence of content codings, ``'br'`` and
+    ``'gzip'`` being supported, in order of preference.  When it is not
+    empty, a precompressed sidecar of a file, such as ``style.css.br`` or
+    ``style.css.gz`` for ``style.css``, is served instead of the file itself
+    when it exists and the client accepts its encoding.  Such responses carry
+    a ``Content-Encoding`` header, and every response for a file with a
+    sidecar carries ``Vary: Accept-Encoding``.  The sidecars found for a file
+    are remembered unless ``reload`` is ``True``.  By default, no sidecars
+    are served.
+
+    ``path_cache_size`` enables, for a package-relative ``root_dir``, a cache
+    of up to this many resolved paths when it is a positive integer.  The
+    filesystem path of a requested asset, or the fact that it does not exist,
+    is then looked up through :term:`asset override` aware ``pkg_resources``
+    machinery only once, instead of on every request.  This cache, the
+    sidecar lookups and the in-memory file cache are emptied whenever asset
+    overrides are added to the package.  The path cache is not used when
+    ``reload`` is ``True``.  By default, paths are resolved on every request.
+
     .. note::
 
        If the ``root_dir`` is relative to a :term:`package`, or is a
@@ -86,10 +140,25 @@ class static_view(object):
        assets within the named ``root_dir`` package-relative directory.
        However, if the ``root_dir`` is absolute, configuration will not be able
        to override the assets it contains.
+
+    .. versionchanged:: 1.10
+       Added the ``file_cache_size``, ``file_cache_max_bytes`` and
+       ``file_cache_check_interval`` arguments.
+
+    .. versionchanged:: 1.10
+       Added the ``content_encodings`` and ``reload`` arguments.
+
+    .. versionchanged:: 1.10
+       Added the ``path_cache_size`` argument.
     """
 
+    _stat = staticmethod(os.stat) # testing
+    _time = staticmethod(time.time) # testing
+
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html'):
+                 use_subpath=False, index='index.html', file_cache_size=None,
+                 file_cache_max_bytes=65536, file_cache_check_interval=1,
+                 content_encodings=(), reload=False, path_cache_size=None):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -102,6 +171,24 @@ class static_view(object):
         self.docroot = docroot
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
+        if file_cache_size:
+            self.file_cache = LRUCache(int(file_cache_size))
+        else:
+            self.file_cache = None
+        self.file_cache_max_bytes = file_cache_max_bytes
+        self.file_cache_check_interval = file_cache_check_interval
+        for encoding in content_encodings:
+            if encoding not in _encoding_extensions:
+                raise ValueError(
+                    'Unsupported content encoding: %r' % (encoding,))
+        self.content_encodings = tuple(content_encodings)
+        self.reload = reload
+        self.sidecars = {}
+        if path_cache_size and package_name and not reload:
+            self.path_cache = LRUCache(int(path_cache_size))
+        else:
+            self.path_cache = None
+        self._overrides_token = None
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -113,17 +200,134 @@ class static_view(object):
         if path is None:
             raise HTTPNotFound('Out of bounds: %s' % request.url)
 
+        if self.package_name and (
+            self.path_cache is not None or
+            self.file_cache is not None or
+            self.content_encodings
+        ):
+            self._check_overrides()
+
+        filepath = is_dir = None
+        sidecars = ()
+        if self.content_encodings:
+            sidecars = self.sidecars.get(path)
+            if sidecars is None:
+                filepath, is_dir = self._resolve(path, request)
+                sidecars = self._find_sidecars(path, filepath)
+        encoding = self._select_encoding(request, sidecars)
+        response = self._respond(request, path, filepath, is_dir, encoding)
+        if sidecars:
+            add_vary(response, 'Accept-Encoding')
+        return response
+
+    def _respond(self, request, path, filepath, is_dir, encoding):
+        key = (path, encoding)
+        if self.file_cache is not None:
+            entry = self._get_cached_file(key)
+            if entry is not None:
+                if entry.is_dir and not request.path_url.endswith('/'):
+                    self.add_slash_redirect(request)
+                return self._cached_file_response(entry)
+
+        if filepath is None:
+            filepath, is_dir = self._resolve(path, request)
+        content_type, _ = _guess_type(filepath)
+        if encoding is not None:
+            filepath += _encoding_extensions[encoding]
+
+        if self.file_cache is not None:
+            entry = self._cache_file(
+                key, filepath, is_dir, content_type, encoding)
+            if entry is not None:
+                return self._cached_file_response(entry)
+
+        try:
+            return FileResponse(
+                filepath, request, self.cache_max_age,
+                content_type, content_encoding=encoding)
+        except (IOError, OSError):
+            if self.path_cache is None:
+                raise
+            # the file was removed since its path was cached
+            self.path_cache.invalidate(path)
+            self.sidecars.pop(path, None)
+            raise HTTPNotFound(request.url)
+
+    def _check_overrides(self):
+        # empty the caches when asset overrides are added to the package or
+        # when serving a registry with different overrides; like
+        # pkg_resources, use the current registry to look them up
+        overrides = get_current_registry().queryUtility(
+            IPackageOverrides, name=self.package_name)
+        token = None
+        if overrides is not None:
+            token = (overrides, len(getattr(overrides, 'overrides', ())))
+        if token != self._overrides_token:
+            self._overrides_token = token
+            self.sidecars.clear()
+            if self.path_cache is not None:
+                self.path_cache.clear()
+            if self.file_cache is not None:
+                self.file_cache.clear()
+
+    def _find_sidecars(self, path, filepath):
+        sidecars = tuple(
+            encoding for encoding in self.content_encodings
+            if exists(filepath + _encoding_extensions[encoding])
+            )
+        if not self.reload:
+            self.sidecars[path] = sidecars
+        return sidecars
+
+    def _select_encoding(self, request, sidecars):
+        # a client which does not send Accept-Encoding gets the plain file,
+        # as do clients which prefer it over every available sidecar
+        if not sidecars or 'Accept-Encoding' not in request.headers:
+            return None
+        offers = list(sidecars) + ['identity']
+        accept_encoding = request.accept_encoding
+        if hasattr(accept_encoding, 'acceptable_offers'):
+            acceptable = [
+                offer for offer, q in accept_encoding.acceptable_offers(offers)
+                ]
+        else: # pragma: no cover (WebOb < 1.8)
+            acceptable = [
+                offer for offer in offers if offer in accept_encoding
+                ]
+        if not acceptable or acceptable[0] == 'identity':
+            return None
+        return acceptable[0]
+
+    def _resolve(self, path, request):
+        if self.path_cache is not None:
+            resolved = self.path_cache.get(path)
+            if resolved is None:
+                resolved = self._find(path)
+                self.path_cache.put(path, resolved)
+        else:
+            resolved = self._find(path)
+        filepath, is_dir = resolved
+        if is_dir and not request.path_url.endswith('/'):
+            self.add_slash_redirect(request)
+        if filepath is None:
+            raise HTTPNotFound(request.url)
+        return filepath, is_dir
+
+    def _find(self, path):
+        """ Return ``(filepath, is_dir)`` for ``path``, ``filepath`` being
+        ``None`` if the asset does not exist."""
+        is_dir = False
+
         if self.package_name: # package resource
             resource_path = '%s/%s' % (self.docroot.rstrip('/'), path)
             if resource_isdir(self.package_name, resource_path):
-                if not request.path_url.endswith('/'):
-                    self.add_slash_redirect(request)
                 resource_path = '%s/%s' % (
                     resource_path.rstrip('/'), self.index
                 )
+                is_dir = True
 
             if not resource_exists(self.package_name, resource_path):
-                raise HTTPNotFound(request.url)
+                return None, is_dir
             filepath = resource_filename(self.package_name, resource_path)
 
         else: # filesystem file
@@ -131,16 +335,70 @@ class static_view(object):
             # os.path.normpath converts / to \ on windows
             filepath = normcase(normpath(join(self.norm_docroot, path)))
             if isdir(filepath):
-                if not request.path_url.endswith('/'):
-                    self.add_slash_redirect(request)
                 filepath = join(filepath, self.index)
+                is_dir = True
             if not exists(filepath):
-                raise HTTPNotFound(request.url)
-
-        content_type, content_encoding = _guess_type(filepath)
-        return FileResponse(
-            filepath, request, self.cache_max_age,
-            content_type, content_encoding=None)
+                return None, is_dir
+
+        return filepath, is_dir
+
+    def _get_cached_file(self, key):
+        entry = self.file_cache.get(key)
+        if entry is None:
+            return None
+        now = self._time()
+        if now - entry.checked < self.file_cache_check_interval:
+            return entry
+        try:
+            st = self._stat(entry.filepath)
+        except OSError:
+            st = None
+        if st is None or (st.st_mtime, st.st_size) != (entry.mtime, entry.size):
+            # the file changed or was removed, resolve and read it again
+            self.file_cache.invalidate(key)
+            return None
+        entry = entry._replace(checked=now)
+        self.file_cache.put(key, entry)
+        return entry
+
+    def _cache_file(self, key, filepath, is_dir, content_type, encoding):
+        try:
+            st = self._stat(filepath)
+            if st.st_size > self.file_cache_max_bytes:
+                return None
+            with open(filepath, 'rb') as f:
+                body = f.read()
+        except (OSError, IOError):
+            return None
+        if len(body) != st.st_size: # changed while reading
+            return None
+        entry = _CachedFile(
+            filepath=filepath,
+            is_dir=is_dir,
+            body=body,
+            content_type=content_type,
+            content_encoding=encoding,
+            mtime=st.st_mtime,
+            size=st.st_size,
+            etag=hashlib.sha1(body).hexdigest(),
+            checked=self._time(),
+            )
+        self.file_cache.put(key, entry)
+        return entry
+
+    def _cached_file_response(self, entry):
+        response = Response(
+            conditional_response=True,
+            content_type=entry.content_type,
+            )
+        response.content_encoding = entry.content_encoding
+        response.app_iter = [entry.body]
+        response.content_length = entry.size
+        response.last_modified = entry.mtime
+        response.etag = entry.etag
+        if self.cache_max_age is not None:
+            response.cache_expires = self.cache_max_age
+        return response
 
     def add_slash_redirect(self, request):
         url = request.path_url + '/'
@@ -187,6 +445,9 @@ class QueryStringCacheBuster(object):
 
     def __call__(self, request, subpath, kw):
         token = self.tokenize(request, subpath, kw)
+        return self._add_token(token, subpath, kw)
+
+    def _add_token(self, token, subpath, kw):
         query = kw.setdefault('_query', {})
         if isinstance(query, dict):
             query[self.param] = token
@@ -207,6 +468,8 @@ class QueryStringConstantCacheBuster(QueryStringCacheBuster):
 
     .. versionadded:: 1.6
     """
+    deterministic = True
+
     def __init__(self, token, param='x'):
         super(QueryStringConstantCacheBuster, self).__init__(param=param)
         self._token = token
@@ -296,6 +559,144 @@ class ManifestCacheBuster(object):
                 self._mtime = mtime
         return self._manifest
 
+    @property
+    def deterministic(self):
+        """ Whether the generated paths may be memoized, which is only the
+        case if the manifest is never reloaded."""
+        return not self.reload
+
     def __call__(self, request, subpath, kw):
         subpath = self.manifest.get(subpath, subpath)
         return (subpath, kw)
+
+class ContentHashCacheBuster(QueryStringCacheBuster):
+    """
+    An implementation of :class:`~pyramid.interfaces.ICacheBuster` which adds
+    a hash of the contents of an asset to the query string of its URL.
+
+    ``spec`` is an absolute path or an :term:`asset specification` of the
+    directory containing the assets, usually the same one that is passed to
+    :meth:`pyramid.config.Configurator.add_static_view` and
+    :meth:`pyramid.config.Configurator.add_cache_buster`.
+
+    Every file in the directory is hashed when the cache buster is created,
+    using a pool of ``workers`` threads, and the tokens are then served from
+    memory without accessing the filesystem.  Assets created afterwards, or
+    found through an :term:`asset override` outside of the directory, are
+    not cache busted.
+
+    If ``index_path`` is given, the tokens are saved to this file along with
+    the modification time and size of each file, and only new or changed
+    files are hashed the next time the application starts.
+
+    The optional ``param`` argument determines the name of the parameter added
+    to the query string and defaults to ``'x'``.  ``hashalg`` is the name of
+    the :mod:`hashlib` algorithm used to compute the tokens, which are
+    truncated to ``token_length`` hexadecimal digits.
+
+    .. versionadded:: 1.10
+    """
+    deterministic = True
+
+    def __init__(self, spec, index_path=None, param='x', workers=4,
+                 hashalg='sha256', token_length=16):
+        super(ContentHashCacheBuster, self).__init__(param=param)
+        package_name = caller_package().__name__
+        pkg_name, path = resolve_asset_spec(spec, package_name)
+        if pkg_name is None:
+            prefix = path.rstrip(os.sep) + os.sep
+        else:
+            prefix = '%s:%s' % (pkg_name, path.strip('/'))
+            if path.strip('/'):
+                prefix += '/'
+        self.prefix = prefix
+        self.root = abspath_from_asset_spec(spec, package_name)
+        self.index_path = index_path
+        self.workers = workers
+        self.hashalg = hashalg
+        self.token_length = token_length
+        self.tokens = self.compute_tokens()
+
+    def compute_tokens(self):
+        """ Return a dictionary mapping the asset spec of every file in the
+        directory to its token, saving the index if ``index_path`` is set."""
+        index = self._load_index()
+        files = {}
+        stale = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                filepath = join(dirpath, filename)
+                relpath = os.path.relpath(filepath, self.root)
+                if WIN: # pragma: no cover
+                    relpath = relpath.replace('\\', '/')
+                st = os.stat(filepath)
+                entry = index.get(relpath)
+                if entry is not None and entry[:2] == [st.st_mtime, st.st_size]:
+                    files[relpath] = entry
+                else:
+                    files[relpath] = [st.st_mtime, st.st_size, None]
+                    stale.append((relpath, filepath))
+
+        if stale:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(max(1, min(self.workers, len(stale))))
+            try:
+                digests = pool.map(
+                    self._hash_file, [filepath for _, filepath in stale])
+            finally:
+                pool.close()
+                pool.join()
+            for (relpath, filepath), digest in zip(stale, digests):
+                files[relpath][2] = digest
+
+        if self.index_path is not None and (stale or files != index):
+            self._save_index(files)
+        return dict(
+            (self.prefix + relpath, entry[2])
+            for relpath, entry in files.items()
+            )
+
+    def _hash_file(self, filepath):
+        digest = hashlib.new(self.hashalg)
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        return digest.hexdigest()[:self.token_length]
+
+    def _load_index(self):
+        if self.index_path is None or not exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if (
+            not isinstance(data, dict) or
+            data.get('hashalg') != self.hashalg or
+            data.get('token_length') != self.token_length or
+            not isinstance(data.get('files'), dict)
+        ):
+            return {}
+        return data['files']
+
+    def _save_index(self, files):
+        data = {
+            'hashalg': self.hashalg,
+            'token_length': self.token_length,
+            'files': files,
+            }
+        try:
+            atomic_write(self.index_path, json.dumps(data, sort_keys=True))
+        except (IOError, OSError):
+            # the index only saves work at startup; serve the tokens anyway
+            pass
+
+    def tokenize(self, request, subpath, kw):
+        return self.tokens.get(kw.get('rawspec'))
+
+    def __call__(self, request, subpath, kw):
+        token = self.tokenize(request, subpath, kw)
+        if token is None:
+            return subpath, kw
+        return self._add_token(token, subpath, kw)
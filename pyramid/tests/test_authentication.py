@@ -197,6 +197,187 @@ class TestCallbackAuthenticationPolicyDebugging(unittest.TestCase):
             "'system.Everyone'; returning ['system.Everyone'] as if it "
             "was None")
 
+class TestCallbackAuthenticationPolicyMemoization(unittest.TestCase):
+    def _makeOne(self, userid=None, callback=None):
+        from pyramid.authentication import CallbackAuthenticationPolicy
+        calls = []
+        class MyAuthenticationPolicy(CallbackAuthenticationPolicy):
+            def unauthenticated_userid(self, request):
+                calls.append(request)
+                return userid
+        policy = MyAuthenticationPolicy()
+        policy.callback = callback
+        policy.calls = calls
+        return policy
+
+    def test_unauthenticated_userid_called_once_per_request(self):
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred')
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(policy.effective_principals(request),
+                         ['system.Everyone', 'system.Authenticated', 'fred'])
+        self.assertEqual(len(policy.calls), 1)
+
+    def test_unauthenticated_userid_called_per_request(self):
+        policy = self._makeOne(userid='fred')
+        policy.authenticated_userid(DummyRequest())
+        policy.authenticated_userid(DummyRequest())
+        self.assertEqual(len(policy.calls), 2)
+
+    def test_callback_called_once_per_request(self):
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group.foo']
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred', callback=callback)
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(
+            policy.effective_principals(request),
+            ['system.Everyone', 'system.Authenticated', 'fred', 'group.foo'])
+        self.assertEqual(calls, ['fred'])
+
+    def test_callback_returning_None_is_memoized(self):
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred', callback=callback)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(policy.effective_principals(request),
+                         ['system.Everyone'])
+        self.assertEqual(calls, ['fred'])
+
+    def test_effective_principals_returns_new_list(self):
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred', callback=lambda u, r: ['g'])
+        result = policy.effective_principals(request)
+        result.append('extra')
+        self.assertEqual(policy.effective_principals(request),
+                         ['system.Everyone', 'system.Authenticated', 'fred',
+                          'g'])
+
+    def test_cache_is_per_policy(self):
+        request = DummyRequest()
+        policy1 = self._makeOne(userid='fred')
+        policy2 = self._makeOne(userid='bob')
+        self.assertEqual(policy1.authenticated_userid(request), 'fred')
+        self.assertEqual(policy2.authenticated_userid(request), 'bob')
+
+    def test_invalidate_request_cache(self):
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred')
+        policy.authenticated_userid(request)
+        policy.invalidate_request_cache(request)
+        policy.authenticated_userid(request)
+        self.assertEqual(len(policy.calls), 2)
+
+    def test_invalidate_request_cache_nothing_cached(self):
+        request = DummyRequest()
+        policy = self._makeOne(userid='fred')
+        policy.invalidate_request_cache(request)
+        self.assertFalse(hasattr(request, '_authn_policy_cache'))
+
+class TestCallbackAuthenticationPolicyPrincipalCache(unittest.TestCase):
+    def _makeOne(self, userid, callback):
+        from pyramid.authentication import CallbackAuthenticationPolicy
+        from pyramid.authentication import LRUPrincipalCache
+        class MyAuthenticationPolicy(CallbackAuthenticationPolicy):
+            def unauthenticated_userid(self, request):
+                return userid
+        policy = MyAuthenticationPolicy()
+        policy.callback = callback
+        policy.principal_cache = LRUPrincipalCache()
+        return policy
+
+    def test_principals_shared_between_requests(self):
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group.foo']
+        policy = self._makeOne('fred', callback)
+        for i in range(3):
+            self.assertEqual(
+                policy.effective_principals(DummyRequest()),
+                ['system.Everyone', 'system.Authenticated', 'fred',
+                 'group.foo'])
+        self.assertEqual(calls, ['fred'])
+        stats = policy.principal_cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_None_not_cached(self):
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+        policy = self._makeOne('fred', callback)
+        self.assertEqual(policy.authenticated_userid(DummyRequest()), None)
+        self.assertEqual(policy.authenticated_userid(DummyRequest()), None)
+        self.assertEqual(calls, ['fred', 'fred'])
+
+    def test_invalidate(self):
+        groups = ['group.foo']
+        def callback(userid, request):
+            return list(groups)
+        policy = self._makeOne('fred', callback)
+        policy.effective_principals(DummyRequest())
+        groups.append('group.bar')
+        self.assertEqual(
+            policy.effective_principals(DummyRequest())[-1], 'group.foo')
+        policy.principal_cache.invalidate('fred')
+        self.assertEqual(
+            policy.effective_principals(DummyRequest())[-1], 'group.bar')
+
+class TestLRUPrincipalCache(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.authentication import LRUPrincipalCache
+        return LRUPrincipalCache(*arg, **kw)
+
+    def test_class_implements_IPrincipalCache(self):
+        from zope.interface.verify import verifyClass
+        from pyramid.interfaces import IPrincipalCache
+        from pyramid.authentication import LRUPrincipalCache
+        verifyClass(IPrincipalCache, LRUPrincipalCache)
+
+    def test_get_set(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('fred'), None)
+        cache.set('fred', ['group.foo'])
+        self.assertEqual(cache.get('fred'), ['group.foo'])
+
+    def test_max_size(self):
+        cache = self._makeOne(max_size=1)
+        cache.set('fred', ['group.foo'])
+        cache.set('bob', ['group.bar'])
+        self.assertEqual(cache.get('fred'), None)
+        self.assertEqual(cache.get('bob'), ['group.bar'])
+
+    def test_timeout(self):
+        cache = self._makeOne(timeout=0)
+        cache.set('fred', ['group.foo'])
+        self.assertEqual(cache.get('fred'), None)
+
+    def test_invalidate_and_clear(self):
+        cache = self._makeOne()
+        cache.set('fred', ['group.foo'])
+        cache.set('bob', ['group.bar'])
+        cache.invalidate('fred')
+        self.assertEqual(cache.get('fred'), None)
+        self.assertEqual(cache.get('bob'), ['group.bar'])
+        cache.clear()
+        self.assertEqual(cache.get('bob'), None)
+
+    def test_stats(self):
+        cache = self._makeOne()
+        cache.set('fred', ['group.foo'])
+        cache.get('fred')
+        cache.get('bob')
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
 class TestRepozeWho1AuthenticationPolicy(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.authentication import RepozeWho1AuthenticationPolicy
@@ -388,6 +569,12 @@ class TestRemoteUserAuthenticationPolicy(unittest.TestCase):
         from pyramid.interfaces import IAuthenticationPolicy
         verifyClass(IAuthenticationPolicy, self._getTargetClass())
 
+    def test_principal_cache(self):
+        from pyramid.authentication import LRUPrincipalCache
+        cache = LRUPrincipalCache()
+        policy = self._getTargetClass()(principal_cache=cache)
+        self.assertEqual(policy.principal_cache, cache)
+
     def test_instance_implements_IAuthenticationPolicy(self):
         from zope.interface.verify import verifyObject
         from pyramid.interfaces import IAuthenticationPolicy
@@ -466,6 +653,16 @@ class TestAuthTktAuthenticationPolicy(unittest.TestCase):
             )
         self.assertEqual(inst.callback, None)
 
+    def test_principal_cache(self):
+        from pyramid.authentication import LRUPrincipalCache
+        cache = LRUPrincipalCache()
+        inst = self._getTargetClass()('secret', principal_cache=cache)
+        self.assertEqual(inst.principal_cache, cache)
+
+    def test_ticket_cache_size(self):
+        inst = self._getTargetClass()('secret', ticket_cache_size=10)
+        self.assertEqual(inst.cookie.ticket_cache.maxsize, 10)
+
     def test_hashalg_override(self):
         # important to ensure hashalg is passed to cookie helper
         inst = self._getTargetClass()('secret', hashalg='sha512')
@@ -543,6 +740,29 @@ class TestAuthTktAuthenticationPolicy(unittest.TestCase):
         result = policy.forget(request)
         self.assertEqual(result, [])
 
+    def test_identify_memoized_per_request(self):
+        request = DummyRequest({})
+        policy = self._makeOne(None, {'userid':'fred'})
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        policy.cookie.result = None
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+
+    def test_forget_invalidates_memoized_identity(self):
+        request = DummyRequest({})
+        policy = self._makeOne(None, {'userid':'fred'})
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        policy.cookie.result = None
+        policy.forget(request)
+        self.assertEqual(policy.authenticated_userid(request), None)
+
+    def test_remember_invalidates_memoized_identity(self):
+        request = DummyRequest({})
+        policy = self._makeOne(None, None)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        policy.cookie.result = {'userid':'fred'}
+        policy.remember(request, 'fred')
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+
     def test_class_implements_IAuthenticationPolicy(self):
         from zope.interface.verify import verifyClass
         from pyramid.interfaces import IAuthenticationPolicy
@@ -780,6 +1000,89 @@ class TestAuthTktCookieHelper(unittest.TestCase):
         result = helper.identify(request)
         self.assertFalse(result)
 
+    def _countParses(self, helper):
+        calls = []
+        parse_ticket = helper.parse_ticket
+        def wrapper(*arg):
+            calls.append(arg)
+            return parse_ticket(*arg)
+        helper.parse_ticket = wrapper
+        return calls
+
+    def test_ticket_cache_disabled_by_default(self):
+        helper = self._makeOne('secret')
+        self.assertEqual(helper.ticket_cache, None)
+        calls = self._countParses(helper)
+        helper.identify(self._makeRequest('ticket'))
+        helper.identify(self._makeRequest('ticket'))
+        self.assertEqual(len(calls), 2)
+
+    def test_ticket_cache_hit(self):
+        helper = self._makeOne('secret', ticket_cache_size=10)
+        helper.auth_tkt.tokens = ['a']
+        calls = self._countParses(helper)
+        result1 = helper.identify(self._makeRequest('ticket'))
+        result2 = helper.identify(self._makeRequest('ticket'))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(result1, result2)
+        self.assertEqual(result2['tokens'], ['a'])
+        result2['tokens'].append('b')
+        result3 = helper.identify(self._makeRequest('ticket'))
+        self.assertEqual(result3['tokens'], ['a'])
+
+    def test_ticket_cache_keyed_by_cookie(self):
+        helper = self._makeOne('secret', ticket_cache_size=10)
+        calls = self._countParses(helper)
+        helper.identify(self._makeRequest('ticket1'))
+        helper.identify(self._makeRequest('ticket2'))
+        self.assertEqual(len(calls), 2)
+
+    def test_ticket_cache_keyed_by_remote_addr_with_include_ip(self):
+        helper = self._makeOne('secret', include_ip=True, ticket_cache_size=10)
+        calls = self._countParses(helper)
+        helper.identify(self._makeRequest('ticket'))
+        helper.identify(self._makeRequest('ticket', ipv6=True))
+        helper.identify(self._makeRequest('ticket'))
+        self.assertEqual(len(calls), 2)
+
+    def test_ticket_cache_bad_ticket_not_cached(self):
+        helper = self._makeOne('secret', ticket_cache_size=10)
+        helper.auth_tkt.parse_raise = True
+        calls = self._countParses(helper)
+        self.assertEqual(helper.identify(self._makeRequest('ticket')), None)
+        self.assertEqual(helper.identify(self._makeRequest('ticket')), None)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(helper.ticket_cache), 0)
+
+    def test_ticket_cache_timeout_checked_on_hit(self):
+        import time
+        helper = self._makeOne('secret', timeout=10, ticket_cache_size=10)
+        now = time.time()
+        helper.auth_tkt.timestamp = now
+        helper.now = now + 1
+        self.assertTrue(helper.identify(self._makeRequest('ticket')))
+        self.assertEqual(len(helper.ticket_cache), 1)
+        helper.now = now + 11
+        self.assertEqual(helper.identify(self._makeRequest('ticket')), None)
+
+    def test_ticket_cache_not_cached_past_reissue_boundary(self):
+        import time
+        helper = self._makeOne('secret', timeout=10, reissue_time=0,
+                               ticket_cache_size=10)
+        now = time.time()
+        helper.auth_tkt.timestamp = now
+        helper.now = now + 1
+        self.assertTrue(helper.identify(self._makeRequest('ticket')))
+        self.assertEqual(len(helper.ticket_cache), 0)
+
+    def test__ticket_lifetime(self):
+        helper = self._makeOne('secret')
+        self.assertEqual(helper._ticket_lifetime(100, 105), None)
+        helper = self._makeOne('secret', timeout=20, reissue_time=10)
+        self.assertEqual(helper._ticket_lifetime(100, 105), 5)
+        helper = self._makeOne('secret', timeout=20)
+        self.assertEqual(helper._ticket_lifetime(100, 105), 15)
+
     def test_identify_cookie_reissue(self):
         import time
         helper = self._makeOne('secret', timeout=10, reissue_time=0)
@@ -1382,6 +1685,26 @@ class TestSessionAuthenticationPolicy(unittest.TestCase):
         self.assertEqual(request.session.get('userid'), None)
         self.assertEqual(result, [])
 
+    def test_principal_cache(self):
+        from pyramid.authentication import LRUPrincipalCache
+        cache = LRUPrincipalCache()
+        policy = self._getTargetClass()(principal_cache=cache)
+        self.assertEqual(policy.principal_cache, cache)
+
+    def test_remember_invalidates_memoized_userid(self):
+        request = DummyRequest()
+        policy = self._makeOne()
+        self.assertEqual(policy.authenticated_userid(request), None)
+        policy.remember(request, 'fred')
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+
+    def test_forget_invalidates_memoized_userid(self):
+        request = DummyRequest(session={'userid':'fred'})
+        policy = self._makeOne()
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        policy.forget(request)
+        self.assertEqual(policy.authenticated_userid(request), None)
+
 class TestBasicAuthAuthenticationPolicy(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.authentication import BasicAuthAuthenticationPolicy as cls
@@ -1479,6 +1802,67 @@ class TestBasicAuthAuthenticationPolicy(unittest.TestCase):
         self.assertEqual(policy.forget(None), [
             ('WWW-Authenticate', 'Basic realm="SomeRealm"')])
 
+    def _makeCachingOne(self, check, **kw):
+        return self._getTargetClass()(check, check_cache_size=10, **kw)
+
+    def _makeAuthRequest(self, credentials):
+        import base64
+        request = testing.DummyRequest()
+        request.headers['Authorization'] = 'Basic %s' % base64.b64encode(
+            bytes_(credentials)).decode('ascii')
+        return request
+
+    def test_check_cache_disabled_by_default(self):
+        policy = self._makeOne(None)
+        self.assertEqual(policy.check_cache, None)
+
+    def test_check_cache_hit(self):
+        calls = []
+        def check(username, password, request):
+            calls.append((username, password))
+            return ['group.foo']
+        policy = self._makeCachingOne(check)
+        for i in range(3):
+            request = self._makeAuthRequest('chrisr:password')
+            self.assertEqual(
+                policy.effective_principals(request),
+                ['system.Everyone', 'system.Authenticated', 'chrisr',
+                 'group.foo'])
+        self.assertEqual(calls, [('chrisr', 'password')])
+
+    def test_check_cache_wrong_password_is_checked(self):
+        def check(username, password, request):
+            if password == 'password':
+                return []
+        policy = self._makeCachingOne(check)
+        request = self._makeAuthRequest('chrisr:password')
+        self.assertEqual(policy.authenticated_userid(request), 'chrisr')
+        request = self._makeAuthRequest('chrisr:wrong')
+        self.assertEqual(policy.authenticated_userid(request), None)
+
+    def test_check_cache_failure_not_cached(self):
+        calls = []
+        def check(username, password, request):
+            calls.append((username, password))
+        policy = self._makeCachingOne(check)
+        for i in range(2):
+            request = self._makeAuthRequest('chrisr:password')
+            self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(policy.check_cache), 0)
+
+    def test_check_cache_timeout(self):
+        policy = self._makeCachingOne(None, check_cache_timeout=30)
+        self.assertEqual(policy.check_cache.timeout, 30)
+
+    def test_check_cache_does_not_store_password(self):
+        policy = self._makeCachingOne(lambda u, p, r: [])
+        request = self._makeAuthRequest('chrisr:password')
+        policy.authenticated_userid(request)
+        (key,) = policy.check_cache._data.keys()
+        self.assertFalse(b'password' in key)
+        self.assertNotEqual(key, policy._credentials_key('chrisr', 'other'))
+
 
 class TestExtractHTTPBasicCredentials(unittest.TestCase):
     def _get_func(self):
@@ -89,6 +89,61 @@ class TestI18NConfiguratorMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(ITranslationDirectories),
                          [locale, locale2, locale3])
 
+    def test_add_translation_dirs_preload_translations(self):
+        from pyramid.interfaces import ILocalizer
+        config = self._makeOne(autocommit=True,
+                               settings={'preload_translations': 'true'})
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale')
+        localizer = config.registry.getUtility(ILocalizer, name='de_DE')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+        names = sorted(name for name, utility in
+                       config.registry.getUtilitiesFor(ILocalizer))
+        self.assertEqual(names, ['de', 'de_DE', 'en'])
+
+    def test_add_translation_dirs_preload_translations_once(self):
+        from pyramid.interfaces import ILocalizer
+        from pyramid.interfaces import ITranslationDirectories
+        import pyramid.config.i18n
+        preloads = []
+        preload_localizers = pyramid.config.i18n._preload_localizers
+        def counting_preload_localizers(registry):
+            preloads.append(registry.getUtility(ITranslationDirectories)[:])
+            preload_localizers(registry)
+        config = self._makeOne(settings={'preload_translations': 'true'})
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale')
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale2')
+        pyramid.config.i18n._preload_localizers = counting_preload_localizers
+        try:
+            config.commit()
+        finally:
+            pyramid.config.i18n._preload_localizers = preload_localizers
+        self.assertEqual(preloads, [[locale2, locale]])
+        self.assertFalse(config.registry._preload_translations)
+        self.assertEqual(config.registry.getUtility(ITranslationDirectories),
+                         [locale2, locale])
+        localizer = config.registry.getUtility(ILocalizer, name='de')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+
+    def test_add_translation_dirs_preload_translations_after_commit(self):
+        from pyramid.interfaces import ILocalizer
+        config = self._makeOne(settings={'preload_translations': 'true'})
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale2')
+        config.commit()
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale')
+        config.commit()
+        localizer = config.registry.getUtility(ILocalizer, name='de_DE')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+
+    def test_add_translation_dirs_no_preload_translations(self):
+        from pyramid.interfaces import ILocalizer
+        config = self._makeOne(autocommit=True)
+        config.add_translation_dirs('pyramid.tests.pkgs.localeapp:locale')
+        self.assertEqual(config.registry.queryUtility(ILocalizer, name='de'),
+                         None)
+
     def test_add_translation_dirs_invalid_kwargs(self):
         from pyramid.interfaces import ITranslationDirectories
         config = self._makeOne(autocommit=True)
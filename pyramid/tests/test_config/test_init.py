@@ -1684,6 +1684,22 @@ class TestActionState(unittest.TestCase):
         ]
         self.assertRaises(ConfigurationConflictError, c.execute_actions)
 
+    def test_reentrant_action_after_overridden_action(self):
+        output = []
+        c = self._makeOne()
+        def f(*a, **k):
+            output.append(('f', a))
+            c.actions.append((3, g, (8,), {}, (), None, 10))
+        def g(*a, **k):
+            output.append(('g', a))
+        c.actions = [
+            (1, g, (1,), {}, ()),
+            (1, g, (2,), {}, ('x',)),
+            (2, f, (3,), {}, (), None, 10),
+        ]
+        c.execute_actions()
+        self.assertEqual(output, [('g', (1,)), ('f', (3,)), ('g', (8,))])
+
 class Test_reentrant_action_functional(unittest.TestCase):
     def _makeConfigurator(self, *arg, **kw):
         from pyramid.config import Configurator
@@ -575,6 +575,28 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['pyramid.csrf_trusted_origins'], [
             'example.com', 'foo.example.com', 'asdf.example.com'])
 
+    def test_preload_translations(self):
+        result = self._makeOne({})
+        self.assertEqual(result['preload_translations'], False)
+        self.assertEqual(result['pyramid.preload_translations'], False)
+        result = self._makeOne({'preload_translations': 'true'})
+        self.assertEqual(result['pyramid.preload_translations'], True)
+        result = self._makeOne({}, {'PYRAMID_PRELOAD_TRANSLATIONS': '1'})
+        self.assertEqual(result['preload_translations'], True)
+
+    def test_compression_settings(self):
+        result = self._makeOne({})
+        self.assertEqual(result['compression_level'], 6)
+        self.assertEqual(result['pyramid.compression_min_size'], 1024)
+        result = self._makeOne({'pyramid.compression_level': '9',
+                                'compression_min_size': '10'})
+        self.assertEqual(result['compression_level'], 9)
+        self.assertEqual(result['pyramid.compression_min_size'], 10)
+        result = self._makeOne({}, {'PYRAMID_COMPRESSION_LEVEL': '1',
+                                    'PYRAMID_COMPRESSION_MIN_SIZE': '0'})
+        self.assertEqual(result['pyramid.compression_level'], 1)
+        self.assertEqual(result['compression_min_size'], 0)
+
     def test_originals_kept(self):
         result = self._makeOne({'a':'i am so a'})
         self.assertEqual(result['a'], 'i am so a')
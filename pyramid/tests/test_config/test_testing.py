@@ -158,6 +158,19 @@ class TestingConfiguratorMixinTests(unittest.TestCase):
         renderer2.assert_(bar=2)
         renderer2.assert_(request=request)
 
+    def test_testing_add_renderer_replaces_rendered(self):
+        config = self._makeOne(autocommit=True)
+        renderer1 = config.testing_add_renderer('templates/foo.pt')
+        from pyramid.renderers import render
+        request = DummyRequest()
+        request.registry = config.registry
+        render('templates/foo.pt', {'foo':1}, request=request)
+        renderer1.assert_(foo=1)
+        renderer2 = config.testing_add_renderer('templates/foo.pt')
+        render('templates/foo.pt', {'foo':2}, request=request)
+        renderer2.assert_(foo=2)
+        renderer1.assert_(foo=1)
+
     def test_testing_add_renderer_explicitrenderer(self):
         config = self._makeOne(autocommit=True)
         class E(Exception): pass
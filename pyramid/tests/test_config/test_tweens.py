@@ -165,6 +165,29 @@ class TestTweensConfiguratorMixin(unittest.TestCase):
             'pyramid.tests.test_config.dummy_tween_factory',
             under=('a', MAIN))
 
+    def test_default_response_cache(self):
+        from pyramid.interfaces import IResponseCache
+        from pyramid.responsecache import ResponseCache
+        config = self._makeOne()
+        cache = config.registry.getUtility(IResponseCache)
+        self.assertTrue(isinstance(cache, ResponseCache))
+
+    def test_set_response_cache(self):
+        from pyramid.interfaces import IResponseCache
+        config = self._makeOne(autocommit=True)
+        cache = object()
+        config.set_response_cache(cache)
+        result = config.registry.getUtility(IResponseCache)
+        self.assertEqual(result, cache)
+
+    def test_set_response_cache_dottedname(self):
+        from pyramid.interfaces import IResponseCache
+        config = self._makeOne(autocommit=True)
+        config.set_response_cache('pyramid.tests.test_config')
+        result = config.registry.getUtility(IResponseCache)
+        from pyramid.tests import test_config
+        self.assertEqual(result, test_config)
+
 class TestTweens(unittest.TestCase):
     def _makeOne(self):
         from pyramid.config.tweens import Tweens
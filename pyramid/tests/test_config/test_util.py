@@ -1,3 +1,5 @@
+import os
+import sys
 import unittest
 from pyramid.compat import text_
 
@@ -613,6 +615,157 @@ class TestDeprecatedPredicates(unittest.TestCase):
             from pyramid.config.predicates import XHRPredicate
             self.assertEqual(len(w), 1)
 
+class TestScanCache(unittest.TestCase):
+    package_name = 'pyramid_scancache_package'
+
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tempdir, 'scan.json')
+        package_dir = os.path.join(self.tempdir, self.package_name)
+        os.mkdir(package_dir)
+        self.sources = {
+            '__init__.py': '',
+            'views.py': (
+                'from pyramid.view import view_config\n'
+                '@view_config(name="decorated", renderer="string")\n'
+                'def decorated(request):\n'
+                '    return "decorated"\n'
+                ),
+            'plain.py': 'from pyramid.view import view_config\n',
+            }
+        for filename, source in self.sources.items():
+            self._write(filename, source)
+        sys.path.insert(0, self.tempdir)
+
+    def tearDown(self):
+        import shutil
+        sys.path.remove(self.tempdir)
+        self._forget_modules()
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, filename, source):
+        path = os.path.join(self.tempdir, self.package_name, filename)
+        with open(path, 'w') as f:
+            f.write(source)
+
+    def _forget_modules(self):
+        for name in list(sys.modules):
+            if name.split('.')[0] == self.package_name:
+                del sys.modules[name]
+
+    def _makeOne(self, path=None):
+        from pyramid.config.util import ScanCache
+        return ScanCache(path or self.cache_path)
+
+    def _scan(self, **kw):
+        from pyramid.config import Configurator
+        from pyramid.interfaces import IView
+        from pyramid.interfaces import IViewClassifier
+        from pyramid.interfaces import IRequest
+        from zope.interface import Interface
+        config = Configurator(autocommit=True)
+        config.scan(self.package_name, cache_path=self.cache_path, **kw)
+        view = config.registry.adapters.lookup(
+            (IViewClassifier, IRequest, Interface), IView, name='decorated')
+        return view, set(name for name in sys.modules
+                         if name.startswith(self.package_name + '.'))
+
+    def test_scan_skips_plain_modules(self):
+        view, imported = self._scan()
+        self.assertFalse(view is None)
+        self.assertEqual(imported, set([self.package_name + '.views',
+                                        self.package_name + '.plain']))
+        modules = self._makeOne().modules
+        self.assertEqual(modules[self.package_name + '.views'][3], True)
+        self.assertEqual(modules[self.package_name + '.plain'][3], False)
+        self._forget_modules()
+        view, imported = self._scan()
+        self.assertFalse(view is None)
+        self.assertEqual(imported, set([self.package_name + '.views']))
+
+    def test_scan_imports_changed_modules(self):
+        self._scan()
+        self._forget_modules()
+        self._write('plain.py', self.sources['plain.py'] + 'x = 1\n')
+        view, imported = self._scan()
+        self.assertTrue(self.package_name + '.plain' in imported)
+
+    def test_scan_with_ignore(self):
+        view, imported = self._scan(ignore='.views')
+        self.assertEqual(view, None)
+        self._forget_modules()
+        view, imported = self._scan(ignore=['.views'])
+        self.assertEqual(view, None)
+        self.assertEqual(imported, set())
+
+    def test_load_invalid(self):
+        for content in ('{', '[]', '{"modules": []}'):
+            with open(self.cache_path, 'w') as f:
+                f.write(content)
+            self.assertEqual(self._makeOne().modules, {})
+
+    def test_ignore(self):
+        cache = self._makeOne()
+        path = os.path.join(self.tempdir, self.package_name, 'plain.py')
+        st = os.stat(path)
+        cache.modules = {
+            'plain': [path, st.st_mtime, st.st_size, False],
+            'decorated': [path, st.st_mtime, st.st_size, True],
+            'changed': [path, st.st_mtime, st.st_size + 1, False],
+            'missing': [path + 'x', st.st_mtime, st.st_size, False],
+            }
+        self.assertTrue(cache.ignore('plain'))
+        self.assertFalse(cache.ignore('decorated'))
+        self.assertFalse(cache.ignore('changed'))
+        self.assertFalse(cache.ignore('missing'))
+        self.assertFalse(cache.ignore('unknown'))
+
+    def test_update_unsaved(self):
+        import types
+        name = self.package_name + '.'
+        modules = {
+            name + 'none': None,
+            name + 'builtin': types.ModuleType(name + 'builtin'),
+            name + 'missing': types.ModuleType(name + 'missing'),
+            }
+        modules[name + 'missing'].__file__ = os.path.join(
+            self.tempdir, 'missing.pyc')
+        sys.modules.update(modules)
+        cache = self._makeOne(
+            os.path.join(self.tempdir, 'nodir', 'scan.json'))
+        cache.update(self.package_name)
+        self.assertEqual(cache.modules, {})
+
+    def test_update_cannot_save(self):
+        import types
+        name = self.package_name + '.module'
+        module = types.ModuleType(name)
+        module.__file__ = os.path.join(
+            self.tempdir, self.package_name, 'plain.pyc')
+        sys.modules[name] = module
+        cache = self._makeOne(
+            os.path.join(self.tempdir, 'nodir', 'scan.json'))
+        cache.update(self.package_name)
+        self.assertEqual(cache.modules[name][3], False)
+        self.assertFalse(os.path.exists(cache.path))
+
+class Test_has_venusian_callbacks(unittest.TestCase):
+    def _callFUT(self, module):
+        from pyramid.config.util import has_venusian_callbacks
+        return has_venusian_callbacks(module)
+
+    def test_it(self):
+        import types
+        module = types.ModuleType('module')
+        class Broken(object):
+            def __getattr__(self, name):
+                raise RuntimeError(name)
+        module.broken = Broken()
+        self.assertFalse(self._callFUT(module))
+        from pyramid.tests.test_config.pkgs.scannable import another
+        self.assertTrue(self._callFUT(another))
+
 class DummyPredicate(object):
     def __init__(self, result):
         self.result = result
@@ -259,6 +259,23 @@ class TestViewsConfigurationMixin(unittest.TestCase):
         expires = parse_httpdate(headers['Expires'])
         assert_similar_datetime(expires, when)
 
+    def test_add_view_with_etag_dotted(self):
+        from pyramid.request import Request
+        def view(request): # pragma: no cover
+            raise AssertionError
+        config = self._makeOne(autocommit=True)
+        config.add_view(
+            view=view,
+            etag='pyramid.tests.test_config.test_views.dummy_etag_validator')
+        wrapper = self._getViewCallable(config)
+        request = Request.blank('/', headers={'If-None-Match': '"v1"'})
+        result = wrapper(None, request)
+        self.assertEqual(result.status_int, 304)
+        self.assertEqual(result.etag, 'v1')
+        intrs = config.introspector.get_category('views')
+        self.assertEqual(intrs[-1]['introspectable']['etag'],
+                         dummy_etag_validator)
+
     def test_add_view_as_instance(self):
         from pyramid.renderers import null_renderer
         class AView:
@@ -2365,6 +2382,40 @@ class TestViewsConfigurationMixin(unittest.TestCase):
         from pyramid.tests import test_config
         self.assertEqual(result, test_config)
 
+    def test_set_request_coalescer(self):
+        from pyramid.interfaces import IRequestCoalescer
+        config = self._makeOne(autocommit=True)
+        coalescer = object()
+        config.set_request_coalescer(coalescer)
+        result = config.registry.getUtility(IRequestCoalescer)
+        self.assertEqual(result, coalescer)
+
+    def test_set_request_coalescer_dottedname(self):
+        from pyramid.interfaces import IRequestCoalescer
+        config = self._makeOne(autocommit=True)
+        config.set_request_coalescer('pyramid.tests.test_config')
+        result = config.registry.getUtility(IRequestCoalescer)
+        from pyramid.tests import test_config
+        self.assertEqual(result, test_config)
+
+    def test_set_request_coalescer_used_by_views(self):
+        from pyramid.renderers import null_renderer
+        from pyramid.viewderivers import RequestCoalescer
+        config = self._makeOne()
+        coalescer = RequestCoalescer()
+        config.set_request_coalescer(coalescer)
+        config.add_view(lambda r: 'OK', renderer=null_renderer,
+                        coalesce=True)
+        config.commit()
+        view = self._getViewCallable(config)
+        request = self._makeRequest(config)
+        request.method = 'GET'
+        request.path_info = '/'
+        request.query_string = ''
+        request.headers = {}
+        self.assertEqual(view(None, request), 'OK')
+        self.assertEqual(coalescer.stats()['calls'], 1)
+
     def test_add_normal_and_exception_view_intr_derived_callable(self):
         from pyramid.renderers import null_renderer
         from pyramid.exceptions import BadCSRFToken
@@ -3215,6 +3266,159 @@ class TestStaticURLInfo(unittest.TestCase):
         finally:
             testing.tearDown()
 
+    def test_generate_first_registration_wins(self):
+        inst = self._makeOne()
+        inst.registrations = [
+            ('http://example.com/outer/', 'package:', None),
+            ('http://example.com/inner/', 'package:path/', None),
+            ('http://example.com/unindexed/', 'package:pa', None),
+            ]
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/outer/path/abc')
+        inst.registrations = inst.registrations[1:]
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/inner/abc')
+        inst.registrations = inst.registrations[1:]
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/unindexed/th/abc')
+
+    def test_generate_later_unindexed_registration_loses(self):
+        inst = self._makeOne()
+        inst.registrations = [
+            ('http://example.com/inner/', 'package:path/', None),
+            ('http://example.com/unindexed/', 'package:pa', None),
+            ]
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/inner/abc')
+
+    def _makeCacheBuster(self, deterministic=None):
+        calls = []
+        def cachebust(request, subpath, kw):
+            calls.append(subpath)
+            kw['_query'] = (('x', 'token'),)
+            return subpath, kw
+        if deterministic is not None:
+            cachebust.deterministic = deterministic
+        cachebust.calls = calls
+        return cachebust
+
+    def test_generate_memoizes_deterministic_cache_busters(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        cachebust = self._makeCacheBuster(deterministic=True)
+        inst.cache_busters = [('package:path/', cachebust, False)]
+        request = self._makeRequest()
+        for i in range(3):
+            result = inst.generate('package:path/abc', request)
+            self.assertEqual(result, 'http://example.com/abc?x=token')
+        result = inst.generate('package:path/abc', request, _anchor='a')
+        self.assertEqual(result, 'http://example.com/abc?x=token#a')
+        self.assertEqual(cachebust.calls, ['abc', 'abc'])
+
+    def test_generate_memoizes_unbusted_paths(self):
+        def fake_cb(*a, **kw): raise AssertionError
+        inst = self._makeOne()
+        inst.registrations = [(None, 'package:path/', '__viewname')]
+        inst.cache_busters = [('package:path2/', fake_cb, False)]
+        request = self._makeRequest()
+        urls = []
+        def route_url(n, **kw):
+            urls.append(kw)
+            kw['mutated'] = True
+            return 'url'
+        request.route_url = route_url
+        inst.generate('package:path/abc', request)
+        inst.generate('package:path/abc', request)
+        self.assertEqual(urls[1], {'subpath': 'abc',
+                                   'pathspec': 'package:path/abc',
+                                   'rawspec': 'package:path/abc',
+                                   'mutated': True})
+        self.assertEqual(len(inst._memo), 1)
+
+    def test_generate_does_not_memoize_other_cache_busters(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        cachebust = self._makeCacheBuster()
+        inst.cache_busters = [('package:path/', cachebust, False)]
+        request = self._makeRequest()
+        inst.generate('package:path/abc', request)
+        inst.generate('package:path/abc', request)
+        self.assertEqual(cachebust.calls, ['abc', 'abc'])
+
+    def test_generate_unhashable_kw_not_memoized(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        cachebust = self._makeCacheBuster(deterministic=True)
+        inst.cache_busters = [('package:path/', cachebust, False)]
+        request = self._makeRequest()
+        inst.generate('package:path/abc', request, _query={'a': '1'})
+        inst.generate('package:path/abc', request, _query={'a': '1'})
+        self.assertEqual(cachebust.calls, ['abc', 'abc'])
+
+    def test_generate_memo_emptied_by_new_cache_busters(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        cachebust = self._makeCacheBuster(deterministic=True)
+        inst.cache_busters = [('package:path/', cachebust, False)]
+        request = self._makeRequest()
+        inst.generate('package:path/abc', request)
+        cachebust2 = self._makeCacheBuster(deterministic=True)
+        inst.add_cache_buster(DummyConfig(), 'package:path/abc/',
+                              cachebust2)
+        inst.generate('package:path/abc/def', request)
+        self.assertEqual(cachebust.calls, ['abc'])
+        self.assertEqual(cachebust2.calls, ['abc/def'])
+        inst.generate('package:path/abc', request)
+        self.assertEqual(cachebust.calls, ['abc', 'abc'])
+
+    def test_generate_unindexed_cache_buster(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        cachebust = self._makeCacheBuster(deterministic=True)
+        inst.cache_busters = [('package:path/a', cachebust, False)]
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/abc?x=token')
+        result = inst.generate('package:path/def', request)
+        self.assertEqual(result, 'http://example.com/def')
+
+    def test_generate_explicit_cache_buster_wins(self):
+        inst = self._makeOne()
+        inst.registrations = [('http://example.com/', 'package:path/', None)]
+        implicit = self._makeCacheBuster()
+        explicit = self._makeCacheBuster()
+        inst.cache_busters = [('package:path/sub/', implicit, False),
+                              ('package:', explicit, True)]
+        request = self._makeRequest()
+        inst.generate('package:path/sub/abc', request)
+        self.assertEqual(implicit.calls, [])
+        self.assertEqual(explicit.calls, ['sub/abc'])
+
+    def test_generate_memo_keyed_on_overrides(self):
+        config = testing.setUp()
+        try:
+            request = testing.DummyRequest()
+            config.add_static_view('static', 'path')
+            def cb(val):
+                def cb_(request, subpath, kw):
+                    kw['_query'] = (('x', val),)
+                    return subpath, kw
+                cb_.deterministic = True
+                return cb_
+            config.add_cache_buster('path', cb('foo'))
+            config.add_cache_buster('other_path', cb('bar'), explicit=True)
+            result = request.static_url('path/foo.png')
+            self.assertEqual(result, 'http://example.com/static/foo.png?x=foo')
+            config.override_asset(
+                'pyramid.tests.test_config:path/',
+                'pyramid.tests.test_config:other_path/')
+            result = request.static_url('path/foo.png')
+            self.assertEqual(result, 'http://example.com/static/foo.png?x=bar')
+        finally:
+            testing.tearDown()
+
     def test_add_already_exists(self):
         config = DummyConfig()
         inst = self._makeOne()
@@ -3263,6 +3467,30 @@ class TestStaticURLInfo(unittest.TestCase):
         self.assertEqual(config.view_kw['permission'], NO_PERMISSION_REQUIRED)
         self.assertEqual(config.view_kw['view'].__class__, static_view)
 
+    def test_add_viewname_with_file_cache(self):
+        config = DummyConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path',
+                 file_cache_size=10, file_cache_max_bytes=100,
+                 file_cache_check_interval=5, path_cache_size=20)
+        view = config.view_kw['view']
+        self.assertEqual(view.file_cache.maxsize, 10)
+        self.assertEqual(view.file_cache_max_bytes, 100)
+        self.assertEqual(view.file_cache_check_interval, 5)
+        self.assertEqual(view.path_cache.maxsize, 20)
+        self.assertFalse('file_cache_size' in config.view_kw)
+
+    def test_add_viewname_with_content_encodings(self):
+        config = DummyConfig()
+        config.registry.settings['pyramid.reload_assets'] = True
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path',
+                 content_encodings=['br', 'gzip'])
+        view = config.view_kw['view']
+        self.assertEqual(view.content_encodings, ('br', 'gzip'))
+        self.assertTrue(view.reload)
+        self.assertFalse('content_encodings' in config.view_kw)
+
     def test_add_viewname_with_route_prefix(self):
         config = DummyConfig()
         config.route_prefix = '/abc'
@@ -3386,6 +3614,9 @@ class Test_view_description(unittest.TestCase):
                          'function pyramid.tests.test_config.test_views.view')
 
 
+def dummy_etag_validator(context, request):
+    return 'v1'
+
 class DummyRegistry:
     utility = None
 
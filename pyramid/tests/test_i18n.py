@@ -82,6 +82,108 @@ class TestLocalizer(unittest.TestCase):
                                      mapping={})
         self.assertEqual(result, 'plural')
 
+    def _makeCounting(self, calls, **kw):
+        localizer = self._makeOne(None, DummyTranslations(), **kw)
+        def translator(tstring, domain=None, mapping=None):
+            calls.append((tstring, domain, mapping))
+            return 'translated %d' % len(calls)
+        def pluralizer(singular, plural, n, domain=None, mapping=None):
+            calls.append((singular, plural, n, domain, mapping))
+            return 'pluralized %d' % len(calls)
+        localizer.translator = translator
+        localizer.pluralizer = pluralizer
+        return localizer
+
+    def test_translate_cached(self):
+        from pyramid.i18n import TranslationString
+        calls = []
+        localizer = self._makeCounting(calls)
+        ts = TranslationString('Add ${item}', mapping={'item': 'Item'})
+        self.assertEqual(localizer.translate(ts), 'translated 1')
+        ts = TranslationString('Add ${item}', mapping={'item': 'Item'})
+        self.assertEqual(localizer.translate(ts), 'translated 1')
+        self.assertEqual(localizer.translate(ts, mapping={'item': 1}),
+                         'translated 2')
+        self.assertEqual(localizer.translate(ts, mapping={'item': True}),
+                         'translated 3')
+        self.assertEqual(localizer.translate(ts, domain='other'),
+                         'translated 4')
+        ts = TranslationString('Add ${item}', mapping={'item': 'Other'})
+        self.assertEqual(localizer.translate(ts), 'translated 5')
+        ts = TranslationString('Add ${item}', default='Add')
+        self.assertEqual(localizer.translate(ts), 'translated 6')
+        self.assertEqual(localizer.translate('Add ${item}'), 'translated 7')
+        self.assertEqual(localizer.translate('Add ${item}'), 'translated 7')
+        self.assertEqual(len(calls), 7)
+
+    def test_translate_mutable_mapping_not_cached(self):
+        from pyramid.i18n import TranslationString
+        calls = []
+        localizer = self._makeCounting(calls)
+        item = ['a']
+        localizer.translate('Add ${item}', mapping={'item': item})
+        localizer.translate('Add ${item}', mapping={'item': item})
+        ts = TranslationString('Add ${item}', mapping={'item': item})
+        localizer.translate(ts)
+        localizer.translate(ts)
+        self.assertEqual(len(calls), 4)
+
+    def test_translate_other_types_not_cached(self):
+        from pyramid.i18n import TranslationString
+        class MyTranslationString(TranslationString):
+            pass
+        calls = []
+        localizer = self._makeCounting(calls)
+        ts = MyTranslationString('Add')
+        localizer.translate(ts)
+        localizer.translate(ts)
+        self.assertEqual(len(calls), 2)
+
+    def test_translate_cache_disabled(self):
+        calls = []
+        localizer = self._makeCounting(calls, cache_size=None)
+        localizer.translate('Add')
+        localizer.translate('Add')
+        self.assertEqual(len(calls), 2)
+
+    def test_translate_cache_bounded(self):
+        calls = []
+        localizer = self._makeCounting(calls, cache_size=1)
+        localizer.translate('a')
+        localizer.translate('b')
+        localizer.translate('a')
+        self.assertEqual(len(calls), 3)
+
+    def test_pluralize_cached(self):
+        calls = []
+        localizer = self._makeCounting(calls)
+        self.assertEqual(
+            localizer.pluralize('${n} item', '${n} items', 2,
+                                mapping={'n': 2}),
+            'pluralized 1')
+        self.assertEqual(
+            localizer.pluralize('${n} item', '${n} items', 2,
+                                mapping={'n': 2}),
+            'pluralized 1')
+        self.assertEqual(
+            localizer.pluralize('${n} item', '${n} items', 2.0,
+                                mapping={'n': 2}),
+            'pluralized 2')
+        self.assertEqual(
+            localizer.pluralize('${n} item', '${n} items', 2,
+                                domain='other', mapping={'n': 2}),
+            'pluralized 3')
+        self.assertEqual(len(calls), 3)
+
+    def test_pluralize_not_cached(self):
+        calls = []
+        localizer = self._makeCounting(calls)
+        for i in range(2):
+            localizer.pluralize('item', 'items', 1, mapping={'n': []})
+            localizer.pluralize('item', 'items', object())
+            localizer.pluralize(None, 'items', 1)
+        self.assertEqual(len(calls), 6)
+
 class Test_negotiate_locale_name(unittest.TestCase):
     def setUp(self):
         testing.setUp()
@@ -488,6 +590,81 @@ class TestLocalizerRequestMixin(unittest.TestCase):
         self.assertEqual(result.translate('Approve', 'deformsite'),
                          'Approve')
 
+    def test_localizer_preloaded(self):
+        from pyramid.interfaces import ILocalizer
+        from pyramid.interfaces import ITranslationDirectories
+        from pyramid.i18n import _preload_localizers
+        registry = self.config.registry
+        registry.registerUtility([localedir], ITranslationDirectories)
+        registry.settings['preload_translations'] = True
+        _preload_localizers(registry)
+        request = self._makeOne()
+        request._LOCALE_ = 'de'
+        self.assertTrue(request.localizer is
+                        registry.getUtility(ILocalizer, name='de'))
+
+    def test_localizer_preloaded_unknown_territory(self):
+        from pyramid.interfaces import ILocalizer
+        from pyramid.interfaces import ITranslationDirectories
+        from pyramid.i18n import _preload_localizers
+        registry = self.config.registry
+        registry.registerUtility([localedir], ITranslationDirectories)
+        registry.settings['preload_translations'] = True
+        _preload_localizers(registry)
+        request = self._makeOne()
+        request._LOCALE_ = 'de_AT'
+        result = request.localizer
+        self.assertEqual(result.locale_name, 'de_AT')
+        self.assertEqual(result.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+        self.assertEqual(registry.queryUtility(ILocalizer, name='de_AT'),
+                         None)
+
+    def test_localizer_preloaded_unknown_locale(self):
+        from pyramid.interfaces import ILocalizer
+        self.config.registry.settings['preload_translations'] = True
+        request = self._makeOne()
+        request._LOCALE_ = 'fr_FR'
+        result = request.localizer
+        self.assertEqual(result.locale_name, 'fr_FR')
+        self.assertEqual(result.translate('Approve', 'deformsite'),
+                         'Approve')
+        self.assertEqual(
+            self.config.registry.queryUtility(ILocalizer, name='fr_FR'), None)
+
+class Test_preload_localizers(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, registry):
+        from pyramid.i18n import _preload_localizers
+        return _preload_localizers(registry)
+
+    def test_it(self):
+        from pyramid.interfaces import ILocalizer
+        from pyramid.interfaces import ITranslationDirectories
+        registry = self.config.registry
+        registry.registerUtility(
+            ['/wont/exist/on/my/system', localedir], ITranslationDirectories)
+        self._callFUT(registry)
+        names = sorted(name for name, localizer in
+                       registry.getUtilitiesFor(ILocalizer))
+        self.assertEqual(names, ['de', 'de_DE', 'en'])
+        localizer = registry.getUtility(ILocalizer, name='de_DE')
+        self.assertEqual(localizer.translate('Submit', 'deformsite'),
+                         'different')
+        self.assertEqual(localizer.translate('Approve', 'deformsite'),
+                         'Genehmigen')
+
+    def test_no_translation_directories(self):
+        from pyramid.interfaces import ILocalizer
+        self._callFUT(self.config.registry)
+        self.assertEqual(
+            list(self.config.registry.getUtilitiesFor(ILocalizer)), [])
+
 class DummyRequest(object):
     def __init__(self):
         self.params = {}
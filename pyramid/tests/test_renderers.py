@@ -1,3 +1,4 @@
+import json
 import unittest
 
 from pyramid.testing import cleanUp
@@ -94,6 +95,59 @@ class TestJSON(unittest.TestCase):
         renderer = self._makeOne()(None)
         self.assertRaises(TypeError, renderer, objects, {})
 
+    def test_adapter_lookup_is_cached_per_type(self):
+        from datetime import date
+        from zope.interface import Interface
+        class IFoo(Interface):
+            pass
+        def adapter(obj, req):
+            return obj.isoformat()
+        renderer = self._makeOne()
+        renderer.add_adapter(date, adapter)
+        values = [date(2017, 1, i) for i in range(1, 4)]
+        result = renderer(None)(values, {})
+        self.assertEqual(
+            result, '["2017-01-01", "2017-01-02", "2017-01-03"]')
+        self.assertEqual(renderer._adapter_cache, {date: adapter})
+        renderer.add_adapter(IFoo, adapter)
+        self.assertEqual(renderer._adapter_cache, {})
+
+    def test_adapter_lookup_failure_is_cached(self):
+        class MyObject(object):
+            pass
+        renderer = self._makeOne()
+        self.assertRaises(TypeError, renderer(None), MyObject(), {})
+        self.assertEqual(renderer._adapter_cache, {MyObject: None})
+        self.assertRaises(TypeError, renderer(None), MyObject(), {})
+
+    def test_adapter_for_directly_provided_interface(self):
+        from zope.interface import Interface, alsoProvides
+        class IFoo(Interface):
+            pass
+        class MyObject(object):
+            pass
+        def adapter(obj, req):
+            return 'foo'
+        renderer = self._makeOne()
+        renderer.add_adapter(IFoo, adapter)
+        obj = MyObject()
+        alsoProvides(obj, IFoo)
+        self.assertEqual(renderer(None)([obj, obj], {}), '["foo", "foo"]')
+        self.assertEqual(renderer._adapter_cache, {})
+        self.assertRaises(TypeError, renderer(None), MyObject(), {})
+
+    def test_with_bytes_serializer(self):
+        from pyramid.renderers import RendererHelper
+        def serializer(obj, **kw):
+            return json.dumps(obj, **kw).encode('utf-8')
+        self.config.add_renderer('bytesjson',
+                                 self._makeOne(serializer=serializer))
+        request = testing.DummyRequest()
+        helper = RendererHelper('bytesjson', registry=self.config.registry)
+        response = helper.render_to_response({'a': 1}, None, request=request)
+        self.assertEqual(response.body, b'{"a": 1}')
+        self.assertEqual(response.content_type, 'application/json')
+
 class Test_string_renderer_factory(unittest.TestCase):
     def _callFUT(self, name):
         from pyramid.renderers import string_renderer_factory
@@ -624,6 +678,104 @@ class Test_get_renderer(unittest.TestCase):
         result = self._callFUT('abc/def.pt', package=pyramid.tests)
         self.assertEqual(result, renderer)
 
+class Test_get_renderer_helper(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, name, package=None, registry=None):
+        from pyramid.renderers import _get_renderer_helper
+        return _get_renderer_helper(name, package, registry)
+
+    def _registerFactory(self, name='.foo'):
+        created = []
+        def factory(info):
+            created.append(info)
+            return lambda value, system: value
+        self.config.add_renderer(name, factory)
+        return created
+
+    def test_reuses_helper(self):
+        import pyramid.tests
+        created = self._registerFactory()
+        helper = self._callFUT('a.foo', pyramid.tests)
+        self.assertEqual(helper.name, 'a.foo')
+        self.assertEqual(helper.package, pyramid.tests)
+        self.assertEqual(helper.registry, self.config.registry)
+        self.assertTrue(self._callFUT('a.foo', pyramid.tests) is helper)
+        helper.renderer
+        self._callFUT('a.foo', pyramid.tests).renderer
+        self.assertEqual(created, [helper])
+
+    def test_keyed_by_name_package_and_registry(self):
+        import pyramid
+        import pyramid.tests
+        from pyramid.registry import Registry
+        self._registerFactory()
+        helper = self._callFUT('a.foo', pyramid.tests)
+        self.assertFalse(self._callFUT('b.foo', pyramid.tests) is helper)
+        self.assertFalse(self._callFUT('a.foo', pyramid) is helper)
+        registry = Registry()
+        other = self._callFUT('a.foo', pyramid.tests, registry)
+        self.assertFalse(other is helper)
+        self.assertEqual(other.registry, registry)
+
+    def test_new_factory_registered(self):
+        import pyramid.tests
+        self._registerFactory()
+        helper = self._callFUT('a.foo', pyramid.tests)
+        created = self._registerFactory()
+        other = self._callFUT('a.foo', pyramid.tests)
+        self.assertFalse(other is helper)
+        other.renderer
+        self.assertEqual(created, [other])
+
+    def test_reload_templates(self):
+        import pyramid.tests
+        self.config.registry.settings['reload_templates'] = True
+        self._registerFactory()
+        helper = self._callFUT('a.foo', pyramid.tests)
+        self.assertFalse(self._callFUT('a.foo', pyramid.tests) is helper)
+
+    def test_bounded(self):
+        from pyramid import renderers
+        import pyramid.tests
+        self._registerFactory()
+        original = renderers.renderer_helper_cache_size
+        renderers.renderer_helper_cache_size = 2
+        try:
+            helper = self._callFUT('a.foo', pyramid.tests)
+            self._callFUT('b.foo', pyramid.tests)
+            self._callFUT('c.foo', pyramid.tests)
+        finally:
+            renderers.renderer_helper_cache_size = original
+        self.assertEqual(len(self.config.registry._renderer_helper_cache), 2)
+        self.assertFalse(self._callFUT('a.foo', pyramid.tests) is helper)
+
+    def test_clear(self):
+        from pyramid.renderers import _clear_renderer_helpers
+        import pyramid.tests
+        registry = self.config.registry
+        _clear_renderer_helpers(registry)
+        self._registerFactory()
+        helper = self._callFUT('a.foo', pyramid.tests)
+        _clear_renderer_helpers(registry)
+        self.assertFalse(self._callFUT('a.foo', pyramid.tests) is helper)
+
+    def test_render_reuses_renderer(self):
+        from pyramid.renderers import render
+        from pyramid.renderers import render_to_response
+        created = self._registerFactory()
+        request = testing.DummyRequest()
+        request.registry = self.config.registry
+        for i in range(3):
+            self.assertEqual(render('a.foo', 'x', request=request), 'x')
+            response = render_to_response('a.foo', 'y', request=request)
+            self.assertEqual(response.text, 'y')
+        self.assertEqual(len(created), 1)
+
 class TestJSONP(unittest.TestCase):
     def _makeOne(self, param_name='callback'):
         from pyramid.renderers import JSONP
@@ -664,6 +816,19 @@ class TestJSONP(unittest.TestCase):
         result = renderer({'a':'1'}, {})
         self.assertEqual(result, '{"a": "1"}')
 
+    def test_render_to_jsonp_bytes(self):
+        from pyramid.renderers import JSONP
+        def serializer(obj, **kw):
+            return json.dumps(obj, **kw).encode('utf-8')
+        renderer = JSONP(serializer=serializer)(None)
+        request = testing.DummyRequest()
+        request.GET['callback'] = 'callback'
+        result = renderer({'a':'1'}, {'request':request})
+        self.assertEqual(result, b'/**/callback({"a": "1"});')
+        del request.GET['callback']
+        result = renderer({'a':'1'}, {'request':request})
+        self.assertEqual(result, b'{"a": "1"}')
+
     def test_render_to_jsonp_invalid_callback(self):
         from pyramid.httpexceptions import HTTPBadRequest
         renderer_factory = self._makeOne()
@@ -673,6 +838,120 @@ class TestJSONP(unittest.TestCase):
         self.assertRaises(HTTPBadRequest, renderer, {'a':'1'}, {'request':request})
 
 
+class TestStreamingJSON(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _makeOne(self, **kw):
+        from pyramid.renderers import StreamingJSON
+        return StreamingJSON(**kw)
+
+    def _render(self, value, system=None, **kw):
+        renderer = self._makeOne(**kw)(None)
+        return list(renderer(value, system or {}))
+
+    def test_generator(self):
+        chunks = self._render((i for i in range(3)))
+        self.assertEqual(b''.join(chunks), b'[0, 1, 2]')
+
+    def test_nested_in_dicts(self):
+        value = {'a': {'b': iter([{'c': 1}, [2]])}, 'd': (3, 4), 'e': 'f'}
+        result = b''.join(self._render(value, sort_keys=True))
+        self.assertEqual(json.loads(result.decode('utf-8')),
+                         {'a': {'b': [{'c': 1}, [2]]}, 'd': [3, 4], 'e': 'f'})
+        self.assertEqual(
+            result,
+            b'{"a": {"b": [{"c": 1}, [2]]}, "d": [3, 4], "e": "f"}')
+
+    def test_deeply_nested_iterator(self):
+        value = [{'a': (i for i in range(2))}]
+        self.assertEqual(b''.join(self._render(value)), b'[{"a": [0, 1]}]')
+
+    def test_empty(self):
+        self.assertEqual(b''.join(self._render(iter([]))), b'[]')
+        self.assertEqual(b''.join(self._render({})), b'{}')
+        self.assertEqual(b''.join(self._render(None)), b'null')
+
+    def test_chunk_size(self):
+        chunks = self._render(iter(['x' * 10] * 10), chunk_size=30)
+        self.assertEqual(len(chunks), 4)
+        for chunk in chunks[:-1]:
+            self.assertTrue(len(chunk) >= 30)
+            self.assertTrue(len(chunk) < 50)
+        self.assertEqual(json.loads(b''.join(chunks).decode('utf-8')),
+                         ['x' * 10] * 10)
+
+    def test_is_lazy(self):
+        consumed = []
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield i
+        result = self._makeOne()(None)(rows(), {})
+        self.assertEqual(consumed, [])
+        self.assertEqual(b''.join(result), b'[0, 1, 2]')
+
+    def test_separators(self):
+        chunks = self._render({'a': [1, 2]}, separators=(',', ':'))
+        self.assertEqual(b''.join(chunks), b'{"a":[1,2]}')
+
+    def test_non_string_keys(self):
+        value = {True: 1, False: 2, None: 3, 4: 5, 1.5: 6}
+        result = json.loads(b''.join(self._render(value)).decode('utf-8'))
+        self.assertEqual(result, json.loads(json.dumps(value)))
+
+    def test_invalid_key(self):
+        renderer = self._makeOne()(None)
+        result = renderer({(1, 2): 1}, {})
+        self.assertRaises(TypeError, list, result)
+
+    def test_skipkeys(self):
+        chunks = self._render({(1, 2): 1, 'a': 2}, skipkeys=True)
+        self.assertEqual(b''.join(chunks), b'{"a": 2}')
+
+    def test_non_ascii(self):
+        value = {'a': text_(b'La Pe\xc3\xb1a', 'utf-8')}
+        chunks = self._render(value, ensure_ascii=False)
+        self.assertEqual(b''.join(chunks), b'{"a": "La Pe\xc3\xb1a"}')
+
+    def test_with_adapter_and___json__(self):
+        from datetime import date
+        request = testing.DummyRequest()
+        class MyObject(object):
+            def __json__(self, req):
+                return {'request': req is request}
+        renderer = self._makeOne(
+            adapters=((date, lambda obj, req: obj.isoformat()),))
+        result = renderer(None)(
+            iter([date(2017, 1, 1), MyObject()]), {'request': request})
+        self.assertEqual(b''.join(result),
+                         b'["2017-01-01", {"request": true}]')
+        self.assertEqual(request.response.content_type, 'application/json')
+
+    def test_with_request_content_type_set(self):
+        request = testing.DummyRequest()
+        request.response.content_type = 'text/mishmash'
+        self._render([], {'request': request})
+        self.assertEqual(request.response.content_type, 'text/mishmash')
+
+    def test_unserializable(self):
+        renderer = self._makeOne()(None)
+        result = renderer(iter([object()]), {})
+        self.assertRaises(TypeError, list, result)
+
+    def test_render_to_response(self):
+        from pyramid.renderers import RendererHelper
+        self.config.add_renderer('jsonstream', self._makeOne())
+        request = testing.DummyRequest()
+        helper = RendererHelper('jsonstream', registry=self.config.registry)
+        response = helper.render_to_response(
+            {'a': (i for i in range(3))}, None, request=request)
+        self.assertEqual(response.body, b'{"a": [0, 1, 2]}')
+        self.assertEqual(response.content_type, 'application/json')
+
 class Dummy:
     pass
 
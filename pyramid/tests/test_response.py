@@ -80,6 +80,263 @@ class TestFileResponse(unittest.TestCase):
         finally:
             response.mimetypes = old_mimetypes
 
+class TestFileResponseRanges(unittest.TestCase):
+    data = b'0123456789abcdefghij'
+
+    def setUp(self):
+        import tempfile
+        fd, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _makeOne(self, request=None):
+        from pyramid.response import FileResponse
+        return FileResponse(self.path, request=request)
+
+    def _get(self, method='GET', headers=None, environ=None):
+        from pyramid.request import Request
+        request = Request.blank('/', method=method, headers=headers)
+        if environ:
+            request.environ.update(environ)
+        inst = self._makeOne(request)
+        response = request.get_response(inst)
+        body = response.body
+        inst.app_iter.close()
+        return response, body
+
+    def _parts(self, response, body):
+        ct = response.headers['Content-Type']
+        boundary = ct.split('boundary=')[1].encode('latin-1')
+        self.assertTrue(body.startswith(b'--' + boundary + b'\r\n'))
+        self.assertTrue(body.endswith(b'\r\n--' + boundary + b'--\r\n'))
+        parts = body.split(b'--' + boundary)[1:-1]
+        result = []
+        for part in parts:
+            head, part_body = part.split(b'\r\n\r\n', 1)
+            if part_body.endswith(b'\r\n'):
+                part_body = part_body[:-2]
+            result.append((head.strip().split(b'\r\n'), part_body))
+        return result
+
+    def test_fstat(self):
+        inst = self._makeOne()
+        st = os.stat(self.path)
+        self.assertEqual(inst.content_length, 20)
+        self.assertEqual(inst.last_modified.timetuple()[:6],
+                         __import__('time').gmtime(st.st_mtime)[:6])
+        inst.app_iter.close()
+
+    def test_fstat_fails(self):
+        from pyramid import response
+        opened = []
+        real_open = open
+        def _open(path, mode):
+            f = real_open(path, mode)
+            opened.append(f)
+            return f
+        def _fstat(fd):
+            raise OSError
+        old_fstat = response.os.fstat
+        response.open = _open
+        response.os.fstat = _fstat
+        try:
+            self.assertRaises(OSError, self._makeOne)
+        finally:
+            del response.open
+            response.os.fstat = old_fstat
+        self.assertTrue(opened[0].closed)
+
+    def test_no_range(self):
+        response, body = self._get()
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(body, self.data)
+
+    def test_single_range(self):
+        response, body = self._get(headers={'Range': 'bytes=2-5'})
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.headers['Content-Range'], 'bytes 2-5/20')
+        self.assertEqual(body, b'2345')
+
+    def test_single_range_with_file_wrapper(self):
+        from pyramid.response import FileIter
+        class FileWrapper(FileIter):
+            pass
+        def file_wrapper(f, block_size):
+            return FileWrapper(f, block_size)
+        response, body = self._get(
+            headers={'Range': 'bytes=-3'},
+            environ={'wsgi.file_wrapper': file_wrapper})
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(body, b'hij')
+
+    def test_single_range_replaced_app_iter(self):
+        from pyramid.request import Request
+        request = Request.blank('/', headers={'Range': 'bytes=1-2'})
+        inst = self._makeOne(request)
+        inst.app_iter.close()
+        inst.app_iter = [b'replaced']
+        inst.content_length = 8
+        response = request.get_response(inst)
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, b'ep')
+
+    def test_multiple_ranges(self):
+        response, body = self._get(headers={'Range': 'bytes=0-1, 10-, -2'})
+        self.assertEqual(response.status_int, 206)
+        self.assertTrue(response.content_type, 'multipart/byteranges')
+        self.assertEqual(response.content_length, len(body))
+        self.assertEqual(response.headers['Last-Modified'],
+                         self._makeOne().headers['Last-Modified'])
+        parts = self._parts(response, body)
+        self.assertEqual(parts, [
+            ([b'Content-Type: text/plain; charset=UTF-8',
+              b'Content-Range: bytes 0-1/20'], b'01'),
+            ([b'Content-Type: text/plain; charset=UTF-8',
+              b'Content-Range: bytes 10-19/20'], b'abcdefghij'),
+            ])
+
+    def test_multiple_ranges_merged(self):
+        response, body = self._get(headers={'Range': 'bytes=4-6,0-4,30-'})
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.content_type, 'text/plain')
+        self.assertEqual(response.headers['Content-Range'], 'bytes 0-6/20')
+        self.assertEqual(body, b'0123456')
+
+    def test_multiple_ranges_merged_head(self):
+        response, body = self._get(
+            method='HEAD', headers={'Range': 'bytes=0-1,2-3'})
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.headers['Content-Range'], 'bytes 0-3/20')
+        self.assertEqual(body, b'')
+
+    def test_multiple_ranges_without_content_type(self):
+        from pyramid.request import Request
+        request = Request.blank('/', headers={'Range': 'bytes=0-0,2-2'})
+        inst = self._makeOne(request)
+        del inst.headers['Content-Type']
+        response = request.get_response(inst)
+        body = response.body
+        inst.app_iter.close()
+        parts = self._parts(response, body)
+        self.assertEqual(parts, [
+            ([b'Content-Range: bytes 0-0/20'], b'0'),
+            ([b'Content-Range: bytes 2-2/20'], b'2'),
+            ])
+
+    def test_multiple_ranges_head(self):
+        response, body = self._get(
+            method='HEAD', headers={'Range': 'bytes=0-1,3-4'})
+        self.assertEqual(response.status_int, 206)
+        self.assertTrue(response.content_length > 0)
+        self.assertEqual(body, b'')
+
+    def test_too_many_ranges(self):
+        from pyramid import response as module
+        old_max_ranges = module._MAX_RANGES
+        module._MAX_RANGES = 2
+        try:
+            response, body = self._get(headers={'Range': 'bytes=0-0,2-2,4-4'})
+        finally:
+            module._MAX_RANGES = old_max_ranges
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(body, self.data)
+
+    def test_unsatisfiable_ranges(self):
+        response, body = self._get(headers={'Range': 'bytes=30-40,50-'})
+        self.assertEqual(response.status_int, 416)
+        self.assertEqual(response.headers['Content-Range'], 'bytes */20')
+
+    def test_unsatisfiable_single_range(self):
+        response, body = self._get(headers={'Range': 'bytes=30-40'})
+        self.assertEqual(response.status_int, 416)
+        self.assertEqual(response.headers['Content-Range'], 'bytes */20')
+
+    def test_invalid_ranges(self):
+        response, body = self._get(headers={'Range': 'bytes=0-1,x'})
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(body, self.data)
+
+    def test_multiple_ranges_if_none_match(self):
+        inst = self._makeOne()
+        inst.app_iter.close()
+        response, body = self._get(headers={
+            'Range': 'bytes=0-1,3-4',
+            'If-Modified-Since': inst.headers['Last-Modified'],
+            })
+        self.assertEqual(response.status_int, 304)
+
+    def test_multiple_ranges_if_range_mismatch(self):
+        response, body = self._get(headers={
+            'Range': 'bytes=0-1,3-4',
+            'If-Range': 'Sat, 01 Jan 2000 00:00:00 GMT',
+            })
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(body, self.data)
+
+    def test_multiple_ranges_post(self):
+        response, body = self._get(
+            method='POST', headers={'Range': 'bytes=0-1,3-4'})
+        self.assertEqual(response.status_int, 200)
+
+    def test_multiple_ranges_not_200(self):
+        from pyramid.request import Request
+        request = Request.blank('/', headers={'Range': 'bytes=0-1,3-4'})
+        inst = self._makeOne(request)
+        inst.status = 404
+        response = request.get_response(inst)
+        inst.app_iter.close()
+        self.assertEqual(response.status_int, 404)
+
+    def test_multiple_ranges_replaced_app_iter(self):
+        from pyramid.request import Request
+        request = Request.blank('/', headers={'Range': 'bytes=0-1,3-4'})
+        inst = self._makeOne(request)
+        inst.app_iter.close()
+        inst.app_iter = [b'replaced']
+        inst.content_length = 8
+        response = request.get_response(inst)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.body, b'replaced')
+
+class Test_parse_byte_ranges(unittest.TestCase):
+    def _callFUT(self, header, length=100):
+        from pyramid.response import _parse_byte_ranges
+        return _parse_byte_ranges(header, length)
+
+    def test_ranges(self):
+        self.assertEqual(self._callFUT('bytes=0-0,-1,50-'),
+                         [(0, 1), (50, 100)])
+
+    def test_suffix_longer_than_length(self):
+        self.assertEqual(self._callFUT('bytes=-500'), [(0, 100)])
+
+    def test_stop_past_length(self):
+        self.assertEqual(self._callFUT('bytes=90-500'), [(90, 100)])
+
+    def test_adjacent_ranges_merged(self):
+        self.assertEqual(self._callFUT('bytes=10-19,20-29'), [(10, 30)])
+
+    def test_invalid(self):
+        for header in ('items=0-1', 'bytes=5', 'bytes=5-4', 'bytes=-0',
+                       'bytes=a-b', 'bytes=0-1,', 'bytes=--1'):
+            self.assertEqual(self._callFUT(header), None, header)
+
+class Test_FileRangeIter(unittest.TestCase):
+    def _makeOne(self, file, ranges, **kw):
+        from pyramid.response import _FileRangeIter
+        return _FileRangeIter(file, ranges, **kw)
+
+    def test_block_size(self):
+        inst = self._makeOne(io.BytesIO(b'abcdef'), [(1, 5)], block_size=3)
+        self.assertEqual(list(inst), [b'bcd', b'e'])
+
+    def test_truncated_file(self):
+        inst = self._makeOne(io.BytesIO(b'abc'), [(1, 10)])
+        self.assertEqual(list(inst), [b'bc'])
+
 class TestFileIter(unittest.TestCase):
     def _makeOne(self, file, block_size):
         from pyramid.response import FileIter
@@ -0,0 +1,359 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyramid import testing
+
+class TestMemoryResponseCacheStore(unittest.TestCase):
+    def _makeOne(self, max_size=1000):
+        from pyramid.responsecache import MemoryResponseCacheStore
+        return MemoryResponseCacheStore(max_size)
+
+    def test_it(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IResponseCacheStore
+        store = self._makeOne(max_size=1)
+        verifyObject(IResponseCacheStore, store)
+        store.save('a', b'1', None)
+        self.assertEqual(store.load('a'), b'1')
+        store.save('b', b'2', None)
+        self.assertEqual(store.load('a'), None)
+        store.delete('b')
+        self.assertEqual(store.load('b'), None)
+
+class TestSQLiteResponseCacheStore(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _makeOne(self, **kw):
+        from pyramid.responsecache import SQLiteResponseCacheStore
+        return SQLiteResponseCacheStore(
+            os.path.join(self.tempdir, 'cache.db'), **kw)
+
+    def test_it(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IResponseCacheStore
+        store = self._makeOne()
+        verifyObject(IResponseCacheStore, store)
+        self.assertEqual(store.table, 'pyramid_response_cache')
+        store.save('a', b'1', 10)
+        self.assertEqual(self._makeOne().load('a'), b'1')
+        store.clock = lambda: 1e12
+        store.purge()
+        self.assertEqual(store.load('a'), None)
+
+class TestResponseCache(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.responsecache import ResponseCache
+        cache = ResponseCache(**kw)
+        cache.clock = lambda: self.now
+        self.now = 1000.0
+        return cache
+
+    def _makeRequest(self, path='/page?a=1', method='GET', **headers):
+        from pyramid.request import Request
+        return Request.blank(path, method=method, headers=headers)
+
+    def _makeResponse(self, body=b'abc', http_cache=300, **kw):
+        from pyramid.response import Response
+        response = Response(body, **kw)
+        if http_cache is not None:
+            response.cache_expires(http_cache, public=True)
+        return response
+
+    def test_provides_interface(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IResponseCache
+        verifyObject(IResponseCache, self._makeOne())
+
+    def test_default_store(self):
+        from pyramid.responsecache import MemoryResponseCacheStore
+        cache = self._makeOne()
+        self.assertTrue(isinstance(cache.store, MemoryResponseCacheStore))
+
+    def test_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.lookup(self._makeRequest()), None)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_store_and_lookup(self):
+        cache = self._makeOne()
+        response = self._makeResponse(content_type='text/plain')
+        cache.update(self._makeRequest(), response)
+        self.now += 20
+        result = cache.lookup(self._makeRequest())
+        self.assertFalse(result is response)
+        self.assertEqual(result.status, '200 OK')
+        self.assertEqual(result.body, b'abc')
+        self.assertEqual(result.content_type, 'text/plain')
+        self.assertEqual(result.headers['Cache-Control'],
+                         'max-age=300, public')
+        self.assertEqual(result.headers['Age'], '20')
+        self.assertEqual(cache.lookup(self._makeRequest('/page?a=2')), None)
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 1, 'stores': 1, 'purges': 0,
+            'hit_ratio': 0.5})
+
+    def test_lookup_answers_conditional_requests(self):
+        cache = self._makeOne()
+        response = self._makeResponse()
+        response.etag = 'v1'
+        cache.update(self._makeRequest(), response)
+        request = self._makeRequest(**{'If-None-Match': '"v1"'})
+        result = request.get_response(cache.lookup(request))
+        self.assertEqual(result.status_int, 304)
+
+    def test_lookup_HEAD(self):
+        cache = self._makeOne()
+        cache.update(self._makeRequest(), self._makeResponse())
+        result = cache.lookup(self._makeRequest(method='HEAD'))
+        self.assertEqual(result.content_length, 3)
+
+    def test_expires(self):
+        cache = self._makeOne()
+        cache.store._cache.clock = lambda: self.now
+        cache.update(self._makeRequest(), self._makeResponse(http_cache=10))
+        self.now += 11
+        self.assertEqual(cache.lookup(self._makeRequest()), None)
+
+    def test_s_maxage_preferred(self):
+        saved = []
+        class Store(object):
+            def load(self, key):
+                return None
+            def save(self, key, data, timeout):
+                saved.append(timeout)
+        cache = self._makeOne(store=Store())
+        response = self._makeResponse()
+        response.cache_control.s_maxage = 60
+        cache.update(self._makeRequest(), response)
+        self.assertEqual(saved, [60, 60])
+
+    def test_vary(self):
+        cache = self._makeOne()
+        response = self._makeResponse(b'gzip')
+        response.vary = ('Accept-Encoding',)
+        cache.update(self._makeRequest(**{'Accept-Encoding': 'gzip'}),
+                     response)
+        response = self._makeResponse(b'identity')
+        response.vary = ('accept-encoding',)
+        cache.update(self._makeRequest(), response)
+        result = cache.lookup(self._makeRequest(**{'Accept-Encoding': 'gzip'}))
+        self.assertEqual(result.body, b'gzip')
+        self.assertEqual(cache.lookup(self._makeRequest()).body, b'identity')
+        self.assertEqual(
+            cache.lookup(self._makeRequest(**{'Accept-Encoding': 'br'})),
+            None)
+
+    def test_vary_changed_abandons_variants(self):
+        cache = self._makeOne()
+        response = self._makeResponse(b'old')
+        response.vary = ('Accept-Language',)
+        cache.update(self._makeRequest(), response)
+        cache.update(self._makeRequest(), self._makeResponse(b'new'))
+        self.assertEqual(cache.lookup(self._makeRequest()).body, b'new')
+        response = self._makeResponse(b'newer')
+        response.vary = ('Accept-Language',)
+        cache.update(self._makeRequest(), response)
+        self.assertEqual(cache.lookup(self._makeRequest()).body, b'newer')
+
+    def test_purge(self):
+        cache = self._makeOne()
+        response = self._makeResponse()
+        response.vary = ('Accept-Encoding',)
+        cache.update(self._makeRequest(**{'Accept-Encoding': 'gzip'}),
+                     response)
+        cache.update(self._makeRequest(), response)
+        cache.purge('http://localhost/page?a=1')
+        self.assertEqual(
+            cache.lookup(self._makeRequest(**{'Accept-Encoding': 'gzip'})),
+            None)
+        self.assertEqual(cache.lookup(self._makeRequest()), None)
+        self.assertEqual(cache.stats()['purges'], 1)
+        response = self._makeResponse(b'new')
+        response.vary = ('Accept-Encoding',)
+        cache.update(self._makeRequest(), response)
+        self.assertEqual(
+            cache.lookup(self._makeRequest(**{'Accept-Encoding': 'gzip'})),
+            None)
+        self.assertEqual(cache.lookup(self._makeRequest()).body, b'new')
+
+    def _assertNotStored(self, request, response):
+        cache = self._makeOne()
+        cache.update(request, response)
+        self.assertEqual(cache.stats()['stores'], 0)
+        self.assertEqual(cache.lookup(self._makeRequest()), None)
+
+    def test_store_uncacheable_requests(self):
+        for request in (
+            self._makeRequest(method='HEAD'),
+            self._makeRequest(method='POST'),
+            self._makeRequest(Authorization='Basic Zm9vOmJhcg=='),
+            self._makeRequest(**{'Cache-Control': 'no-store'}),
+        ):
+            self._assertNotStored(request, self._makeResponse())
+
+    def test_store_uncacheable_responses(self):
+        responses = [
+            self._makeResponse(http_cache=None),
+            self._makeResponse(http_cache=0),
+            self._makeResponse(status=404),
+            self._makeResponse(b'x' * 11),
+            self._makeResponse(None, app_iter=iter([b'a'])),
+            ]
+        for directive in ('private', 'no_store', 'no_cache'):
+            response = self._makeResponse()
+            setattr(response.cache_control, directive, True)
+            responses.append(response)
+        response = self._makeResponse()
+        response.set_cookie('a', 'b')
+        responses.append(response)
+        response = self._makeResponse()
+        response.vary = ('*',)
+        responses.append(response)
+        for response in responses:
+            cache = self._makeOne(max_body_size=10)
+            cache.update(self._makeRequest(), response)
+            self.assertEqual(cache.stats()['stores'], 0)
+
+    def test_store_session_used(self):
+        request = self._makeRequest()
+        request.session = {}
+        self._assertNotStored(request, self._makeResponse())
+
+    def test_lookup_bypassed(self):
+        cache = self._makeOne()
+        cache.update(self._makeRequest(), self._makeResponse())
+        for request in (
+            self._makeRequest(method='POST'),
+            self._makeRequest(Authorization='Basic Zm9vOmJhcg=='),
+            self._makeRequest(**{'Cache-Control': 'no-cache'}),
+            self._makeRequest(**{'Cache-Control': 'no-store'}),
+        ):
+            self.assertEqual(cache.lookup(request), None)
+        self.assertEqual(cache.stats()['hit_ratio'], 0.0)
+
+class Test_response_cache_tween_factory(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        import pyramid.config
+        pyramid.config.global_registries.empty()
+        testing.tearDown()
+        shutil.rmtree(self.tempdir)
+
+    def _makeApp(self, calls, cache=None):
+        from pyramid.config import Configurator
+        config = Configurator()
+        if cache is not None:
+            config.set_response_cache(cache)
+        def view(request):
+            calls.append(request)
+            return {'count': len(calls)}
+        config.add_route('page', '/page')
+        config.add_view(view, route_name='page', renderer='json',
+                        http_cache=(300, {'public': True}))
+        config.add_route('private', '/private')
+        config.add_view(view, route_name='private', renderer='json')
+        config.add_tween(
+            'pyramid.responsecache.response_cache_tween_factory')
+        return config.make_wsgi_app()
+
+    def _get(self, app, path, **kw):
+        from pyramid.request import Request
+        return Request.blank(path, **kw).get_response(app)
+
+    def test_default_cache(self):
+        from pyramid.interfaces import IResponseCache
+        from pyramid.responsecache import ResponseCache
+        calls = []
+        app = self._makeApp(calls)
+        cache = app.registry.getUtility(IResponseCache)
+        self.assertTrue(isinstance(cache, ResponseCache))
+        self.assertEqual(self._get(app, '/page').json, {'count': 1})
+        self.assertEqual(self._get(app, '/page').json, {'count': 1})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self._get(app, '/private').json, {'count': 2})
+        self.assertEqual(self._get(app, '/private').json, {'count': 3})
+        self.assertEqual(cache.stats()['hits'], 1)
+        cache.purge('http://localhost/page')
+        self.assertEqual(self._get(app, '/page').json, {'count': 4})
+
+    def test_registry_without_cache(self):
+        from pyramid.interfaces import IResponseCache
+        from pyramid.registry import Registry
+        from pyramid.request import Request
+        from pyramid.response import Response
+        from pyramid.responsecache import response_cache_tween_factory
+        registry = Registry()
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return Response(b'abc', cache_control='max-age=300')
+        tween = response_cache_tween_factory(handler, registry)
+        self.assertEqual(registry.queryUtility(IResponseCache), None)
+        for i in range(2):
+            request = Request.blank('/')
+            response = tween(request)
+            request._process_response_callbacks(response)
+        self.assertEqual(len(calls), 1)
+
+    def test_response_callbacks_called_before_store(self):
+        from pyramid.config import Configurator
+        config = Configurator()
+        def view(request):
+            request.add_response_callback(
+                lambda request, response: response.set_cookie('a', 'b'))
+            return 'body'
+        config.add_view(view, renderer='string',
+                        http_cache=(300, {'public': True}))
+        config.add_tween(
+            'pyramid.responsecache.response_cache_tween_factory')
+        app = config.make_wsgi_app()
+        self.assertTrue('Set-Cookie' in self._get(app, '/').headers)
+        self.assertTrue('Set-Cookie' in self._get(app, '/').headers)
+
+    def test_session_responses_not_shared(self):
+        from pyramid.config import Configurator
+        from pyramid.session import SignedCookieSessionFactory
+        config = Configurator(
+            session_factory=SignedCookieSessionFactory('secret'))
+        def view(request):
+            return request.session.get_csrf_token()
+        config.add_view(view, renderer='string',
+                        http_cache=(300, {'public': True}))
+        config.add_tween(
+            'pyramid.responsecache.response_cache_tween_factory')
+        app = config.make_wsgi_app()
+        first = self._get(app, '/')
+        token = first.text
+        cookie = first.headers['Set-Cookie'].split(';')[0]
+        # the same session does not set its cookie again
+        response = self._get(app, '/', headers={'Cookie': cookie})
+        self.assertEqual(response.text, token)
+        self.assertFalse('Set-Cookie' in response.headers)
+        other = self._get(app, '/')
+        self.assertNotEqual(other.text, token)
+        self.assertTrue('Set-Cookie' in other.headers)
+
+    def test_shared_store(self):
+        from pyramid.responsecache import ResponseCache
+        from pyramid.responsecache import SQLiteResponseCacheStore
+        path = os.path.join(self.tempdir, 'cache.db')
+        calls1 = []
+        app1 = self._makeApp(
+            calls1, ResponseCache(store=SQLiteResponseCacheStore(path)))
+        calls2 = []
+        app2 = self._makeApp(
+            calls2, ResponseCache(store=SQLiteResponseCacheStore(path)))
+        self.assertEqual(self._get(app1, '/page').json, {'count': 1})
+        response = self._get(app2, '/page')
+        self.assertEqual(response.json, {'count': 1})
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertEqual(calls2, [])
@@ -283,7 +283,65 @@ class SharedCookieSessionTests(object):
         self.assertEqual(result, None)
         self.assertTrue('Set-Cookie' in dict(response.headerlist))
 
-class TestBaseCookieSession(SharedCookieSessionTests, unittest.TestCase):
+class SharedReissuableCookieSessionTests(object):
+
+    def test__set_cookie_unchanged_not_reissued(self):
+        import time
+        import webob
+        from pyramid.compat import native_
+        request = testing.DummyRequest()
+        cookieval = native_(self._serialize(
+            (int(time.time()), 0.0, {'state': 1})))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=1000)
+        session['state'] = 1
+        self.assertTrue(session._dirty)
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), False)
+        self.assertFalse('Set-Cookie' in response.headers)
+
+    def test__set_cookie_changed_not_reissued(self):
+        import time
+        import webob
+        from pyramid.compat import native_
+        request = testing.DummyRequest()
+        cookieval = native_(self._serialize(
+            (int(time.time()), 0.0, {'state': 1})))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=1000)
+        session['state'] = 2
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), True)
+        self.assertEqual(response.headerlist[-1][0], 'Set-Cookie')
+
+    def test__set_cookie_unchanged_reissued(self):
+        import time
+        import webob
+        from pyramid.compat import native_
+        request = testing.DummyRequest()
+        cookieval = native_(self._serialize(
+            (int(time.time()) - 2, 0.0, {'state': 1})))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=0)
+        self.assertEqual(session['state'], 1)
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), True)
+        self.assertEqual(response.headerlist[-1][0], 'Set-Cookie')
+
+    def test__set_cookie_unchanged_reissue_never(self):
+        import webob
+        from pyramid.compat import native_
+        request = testing.DummyRequest()
+        cookieval = native_(self._serialize((0, 0.0, {'state': 1})))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=None, timeout=None)
+        session['state'] = 1
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), False)
+
+class TestBaseCookieSession(SharedCookieSessionTests,
+                            SharedReissuableCookieSessionTests,
+                            unittest.TestCase):
     def _makeOne(self, request, **kw):
         from pyramid.session import BaseCookieSessionFactory
         serializer = DummySerializer()
@@ -326,7 +384,9 @@ class TestBaseCookieSession(SharedCookieSessionTests, unittest.TestCase):
         request = testing.DummyRequest()
         self.assertRaises(ValueError, self._makeOne, request, max_age='invalid value')
 
-class TestSignedCookieSession(SharedCookieSessionTests, unittest.TestCase):
+class TestSignedCookieSession(SharedCookieSessionTests,
+                              SharedReissuableCookieSessionTests,
+                              unittest.TestCase):
     def _makeOne(self, request, **kw):
         from pyramid.session import SignedCookieSessionFactory
         kw.setdefault('secret', 'secret')
@@ -373,6 +433,22 @@ class TestSignedCookieSession(SharedCookieSessionTests, unittest.TestCase):
         request = testing.DummyRequest()
         self.assertRaises(ValueError, self._makeOne, request, reissue_time='invalid value')
 
+    def test__set_cookie_changed_not_reissued_signed(self):
+        import time
+        import webob
+        request = testing.DummyRequest()
+        renewed = time.time() - 10
+        cookieval = self._serialize((renewed, 0.0, {'state': 1}))
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, reissue_time=1000)
+        session['state'] = 2
+        response = webob.Response()
+        self.assertEqual(session._set_cookie(response), True)
+        cookieval = response.headers['Set-Cookie'].split(';')[0]
+        self.assertEqual(cookieval.split('=', 1)[1],
+                         self._serialize((session.accessed, 0.0,
+                                          {'state': 2})).decode('ascii'))
+
     def test_cookie_max_age_invalid(self):
         request = testing.DummyRequest()
         self.assertRaises(ValueError, self._makeOne, request, max_age='invalid value')
@@ -532,6 +608,414 @@ def dummy_signed_deserialize(serialized, secret):
         serialized[len(base64.b64encode(bytes_(secret))):])
     return pickle.loads(serialized_data)
 
+class TestServerSideSession(unittest.TestCase):
+    def _makeFactory(self, **kw):
+        from pyramid.session import MemorySessionStore
+        from pyramid.session import ServerSideSessionFactory
+        kw.setdefault('store', MemorySessionStore())
+        self.store = kw['store']
+        return ServerSideSessionFactory('secret', **kw)
+
+    def _makeRequest(self, response=None):
+        request = testing.DummyRequest()
+        if response is not None:
+            cookie = response.headers['Set-Cookie'].split(';')[0]
+            name, value = cookie.split('=', 1)
+            request.cookies[name] = value
+        return request
+
+    def _finish(self, request):
+        from pyramid.response import Response
+        response = Response()
+        request._process_response_callbacks(response)
+        request._process_finished_callbacks()
+        return response
+
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISession
+        session = self._makeFactory()(self._makeRequest())
+        verifyObject(ISession, session)
+
+    def test_ctor_no_cookie(self):
+        session = self._makeFactory()(self._makeRequest())
+        self.assertEqual(dict(session), {})
+        self.assertTrue(session.new)
+        self.assertEqual(len(session.session_id), 64)
+
+    def test_default_store(self):
+        from pyramid.session import ServerSideSessionFactory
+        factory = ServerSideSessionFactory('secret')
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 1)
+
+    def test_roundtrip(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        session = factory(request)
+        session['a'] = [1, 2]
+        response = self._finish(request)
+        self.assertFalse('[1, 2]' in response.headers['Set-Cookie'])
+        session2 = factory(self._makeRequest(response))
+        self.assertFalse(session2.new)
+        self.assertEqual(session2.session_id, session.session_id)
+        self.assertEqual(dict(session2), {'a': [1, 2]})
+        self.assertEqual(session2.created, session.created)
+
+    def test_cookie_only_set_once(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        factory(request)['a'] = 2
+        response2 = self._finish(request)
+        self.assertFalse('Set-Cookie' in response2.headers)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 2)
+
+    def test_cookie_set_again_with_max_age(self):
+        factory = self._makeFactory(max_age=100)
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        factory(request)['a'] = 2
+        response2 = self._finish(request)
+        self.assertTrue('Max-Age=100' in response2.headers['Set-Cookie'])
+
+    def test_unchanged_session_not_saved(self):
+        factory = self._makeFactory(reissue_time=None)
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 1)
+        self.assertFalse(session._dirty)
+
+    def _age(self, session, seconds):
+        from pyramid.compat import pickle
+        accessed, created, state = pickle.loads(
+            self.store.load(session.session_id))
+        self.store.save(session.session_id, pickle.dumps(
+            (accessed - seconds, created, state)), None)
+
+    def test_reissue_triggered(self):
+        factory = self._makeFactory(reissue_time=5)
+        request = self._makeRequest()
+        session = factory(request)
+        session['a'] = 1
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 1)
+        self.assertFalse(session._dirty)
+        self._age(session, 10)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 1)
+        self.assertTrue(session._dirty)
+
+    def test_empty_session_not_stored(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        session = factory(request)
+        session.changed()
+        response = self._finish(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+        self.assertEqual(self.store.load(session.session_id), None)
+
+    def test_bad_cookie(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        request.cookies['session'] = 'bogus'
+        session = factory(request)
+        self.assertTrue(session.new)
+        self.assertEqual(session._cookie_session_id, None)
+
+    def test_forged_session_id_not_reused(self):
+        from webob.cookies import SignedSerializer
+        from pyramid.compat import native_
+        from pyramid.session import _SessionIdSerializer
+        signer = SignedSerializer('secret', 'pyramid.session.', 'sha512',
+                                  serializer=_SessionIdSerializer())
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        request.cookies['session'] = native_(signer.dumps('abc'))
+        session = factory(request)
+        self.assertTrue(session.new)
+        self.assertNotEqual(session.session_id, 'abc')
+
+    def test_bad_data(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.store.save(session.session_id, b'bogus', None)
+        from pyramid.session import ServerSideSessionFactory
+        factory2 = ServerSideSessionFactory(
+            'secret', store=self.store, serializer=DummySerializer())
+        session = factory2(self._makeRequest(response))
+        self.assertTrue(session.new)
+        self.assertEqual(dict(session), {})
+
+    def test_timeout(self):
+        factory = self._makeFactory(timeout=5)
+        request = self._makeRequest()
+        session = factory(request)
+        session['a'] = 1
+        response = self._finish(request)
+        self._age(session, 10)
+        session = factory(self._makeRequest(response))
+        self.assertTrue(session.new)
+        self.assertEqual(dict(session), {})
+
+    def test_invalidate(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        session = factory(request)
+        old_id = session.session_id
+        session.invalidate()
+        self.assertEqual(self.store.load(old_id), None)
+        self.assertNotEqual(session.session_id, old_id)
+        self.assertEqual(dict(session), {})
+        response = self._finish(request)
+        self.assertTrue('Max-Age=0' in response.headers['Set-Cookie'])
+
+    def test_cleared_session_deleted(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        session = factory(request)
+        session.clear()
+        response = self._finish(request)
+        self.assertEqual(self.store.load(session.session_id), None)
+        self.assertTrue('Max-Age=0' in response.headers['Set-Cookie'])
+
+    def test_invalidate_then_set(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        session = factory(request)
+        old_id = session.session_id
+        session.invalidate()
+        session['b'] = 2
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.assertNotEqual(session.session_id, old_id)
+        self.assertEqual(dict(session), {'b': 2})
+
+    def test_invalidate_new_session(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        session = factory(request)
+        session['a'] = 1
+        session.invalidate()
+        response = self._finish(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+
+    def test_set_on_exception_false(self):
+        factory = self._makeFactory(set_on_exception=False)
+        request = self._makeRequest()
+        request.exception = Exception()
+        session = factory(request)
+        session['a'] = 1
+        response = self._finish(request)
+        self.assertFalse('Set-Cookie' in response.headers)
+        self.assertEqual(self.store.load(session.session_id), None)
+
+    def test_write_behind(self):
+        from pyramid.response import Response
+        factory = self._makeFactory(write_behind=True)
+        request = self._makeRequest()
+        session = factory(request)
+        session['a'] = 1
+        response = Response()
+        request._process_response_callbacks(response)
+        self.assertTrue('Set-Cookie' in response.headers)
+        self.assertEqual(self.store.load(session.session_id), None)
+        request._process_finished_callbacks()
+        self.assertNotEqual(self.store.load(session.session_id), None)
+        self.assertEqual(session.request, None)
+
+    def test_cache(self):
+        factory = self._makeFactory(cache_size=10)
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        loads = []
+        load = self.store.load
+        self.store.load = lambda session_id: loads.append(1) or load(
+            session_id)
+        for i in range(3):
+            session = factory(self._makeRequest(response))
+            self.assertEqual(session['a'], 1)
+        self.assertEqual(loads, [])
+
+    def test_cache_miss(self):
+        factory = self._makeFactory(cache_size=10)
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        session = factory(self._makeRequest(response))
+        data = self.store.load(session.session_id)
+        factory = self._makeFactory(cache_size=10, store=self.store)
+        session = factory(self._makeRequest(response))
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(self.store.load(session.session_id), data)
+
+    def test_cache_invalidated(self):
+        factory = self._makeFactory(cache_size=10)
+        request = self._makeRequest()
+        factory(request)['a'] = 1
+        response = self._finish(request)
+        request = self._makeRequest(response)
+        factory(request).invalidate()
+        self._finish(request)
+        session = factory(self._makeRequest(response))
+        self.assertTrue(session.new)
+
+    def test_flash_and_csrf(self):
+        factory = self._makeFactory()
+        request = self._makeRequest()
+        session = factory(request)
+        session.flash('msg')
+        session.flash('msg', allow_duplicate=False)
+        self.assertEqual(session.peek_flash(), ['msg'])
+        self.assertEqual(session.pop_flash(), ['msg'])
+        token = session.get_csrf_token()
+        self.assertEqual(session.get_csrf_token(), token)
+        self.assertNotEqual(session.new_csrf_token(), token)
+
+class TestMemorySessionStore(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.session import MemorySessionStore
+        return MemorySessionStore(**kw)
+
+    def test_class_implements_ISessionStore(self):
+        from zope.interface.verify import verifyClass
+        from pyramid.interfaces import ISessionStore
+        from pyramid.session import MemorySessionStore
+        verifyClass(ISessionStore, MemorySessionStore)
+
+    def test_save_load_delete(self):
+        store = self._makeOne()
+        self.assertEqual(store.load('a'), None)
+        store.save('a', b'data', None)
+        self.assertEqual(store.load('a'), b'data')
+        store.delete('a')
+        self.assertEqual(store.load('a'), None)
+
+    def test_timeout(self):
+        store = self._makeOne()
+        store.save('a', b'data', 0)
+        self.assertEqual(store.load('a'), None)
+
+    def test_max_size(self):
+        store = self._makeOne(max_size=1)
+        store.save('a', b'data', None)
+        store.save('b', b'data', None)
+        self.assertEqual(store.load('a'), None)
+
+class TestSQLiteSessionStore(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _makeOne(self, **kw):
+        import os
+        from pyramid.session import SQLiteSessionStore
+        return SQLiteSessionStore(
+            os.path.join(self.tmpdir, 'sessions.db'), **kw)
+
+    def test_class_implements_ISessionStore(self):
+        from zope.interface.verify import verifyClass
+        from pyramid.interfaces import ISessionStore
+        from pyramid.session import SQLiteSessionStore
+        verifyClass(ISessionStore, SQLiteSessionStore)
+
+    def test_save_load_delete(self):
+        store = self._makeOne()
+        self.assertEqual(store.load('a'), None)
+        store.save('a', b'data\x00', None)
+        self.assertEqual(store.load('a'), b'data\x00')
+        store.save('a', b'other', 10)
+        self.assertEqual(store.load('a'), b'other')
+        store.delete('a')
+        self.assertEqual(store.load('a'), None)
+
+    def test_shared_between_instances(self):
+        self._makeOne().save('a', b'data', None)
+        self.assertEqual(self._makeOne().load('a'), b'data')
+
+    def test_timeout_and_purge(self):
+        store = self._makeOne()
+        store.clock = lambda: 1000.0
+        store.save('a', b'data', 10)
+        store.save('b', b'data', 100)
+        store.save('c', b'data', None)
+        store.clock = lambda: 1050.0
+        self.assertEqual(store.load('a'), None)
+        store.purge()
+        with store._transaction() as conn:
+            ids = [row[0] for row in conn.execute(
+                'SELECT id FROM pyramid_sessions ORDER BY id')]
+        self.assertEqual(ids, ['b', 'c'])
+
+    def test_custom_table(self):
+        store = self._makeOne(table='my_sessions')
+        store.save('a', b'data', None)
+        self.assertEqual(store.load('a'), b'data')
+
+class TestJSONSerializer(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.session import JSONSerializer
+        return JSONSerializer()
+
+    def test_dumps(self):
+        serializer = self._makeOne()
+        result = serializer.dumps((1, 2.5, {'a': [u'\xe9']}))
+        self.assertEqual(result, b'[1,2.5,{"a":["\\u00e9"]}]')
+
+    def test_loads(self):
+        serializer = self._makeOne()
+        result = serializer.loads(b'[1,2.5,{"a":["\\u00e9"]}]')
+        self.assertEqual(result, [1, 2.5, {'a': [u'\xe9']}])
+
+    def test_loads_malformed(self):
+        serializer = self._makeOne()
+        self.assertRaises(ValueError, serializer.loads, b'{')
+
+    def test_signed_cookie_session_roundtrip(self):
+        import webob
+        from pyramid.session import SignedCookieSessionFactory
+        factory = SignedCookieSessionFactory(
+            'secret', serializer=self._makeOne())
+        request = testing.DummyRequest()
+        session = factory(request)
+        session['a'] = [1, 2]
+        response = webob.Response()
+        session._set_cookie(response)
+        request = testing.DummyRequest()
+        request.cookies['session'] = response.headers['Set-Cookie'].split(
+            ';')[0].split('=', 1)[1]
+        session = factory(request)
+        self.assertEqual(dict(session), {'a': [1, 2]})
+        self.assertFalse(session.new)
+
 class Test_manage_accessed(unittest.TestCase):
     def _makeOne(self, wrapped):
         from pyramid.session import manage_accessed
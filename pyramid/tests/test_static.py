@@ -363,6 +363,385 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         from pyramid.httpexceptions import HTTPNotFound
         self.assertRaises(HTTPNotFound, inst, context, request)
 
+class Test_static_view_file_cache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.tmpdir, 'subdir'))
+        self._write('index.html', b'<html>index</html>')
+        self._write('subdir/index.html', b'<html>subdir</html>')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.tmpdir, name), 'wb') as f:
+            f.write(data)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('file_cache_size', 10)
+        inst = static_view(self.tmpdir, **kw)
+        inst._time = lambda: self.now
+        self.now = 1000
+        return inst
+
+    def _makeRequest(self, path_info='/index.html', **kw):
+        from pyramid.request import Request
+        return Request.blank(path_info, **kw)
+
+    def _call(self, inst, path_info='/index.html', **kw):
+        return inst(DummyContext(), self._makeRequest(path_info, **kw))
+
+    def test_cache_disabled_by_default(self):
+        from pyramid.static import static_view
+        inst = static_view(self.tmpdir)
+        self.assertEqual(inst.file_cache, None)
+        response = self._call(inst)
+        self.assertEqual(response.body, b'<html>index</html>')
+
+    def test_hit_serves_from_memory(self):
+        inst = self._makeOne()
+        response = self._call(inst)
+        self.assertEqual(response.body, b'<html>index</html>')
+        self.assertEqual(response.content_type, 'text/html')
+        self.assertEqual(response.content_length, 18)
+        self.assertTrue(response.etag)
+        self.assertTrue(response.last_modified)
+        self.assertEqual(response.cache_control.max_age, 3600)
+        os.remove(os.path.join(self.tmpdir, 'index.html'))
+        response = self._call(inst)
+        self.assertEqual(response.body, b'<html>index</html>')
+        self.assertEqual(inst.file_cache.hits, 1)
+
+    def test_no_cache_max_age(self):
+        inst = self._makeOne(cache_max_age=None)
+        response = self._call(inst)
+        self.assertEqual(response.cache_control.max_age, None)
+
+    def test_changed_file_is_reloaded_after_check_interval(self):
+        inst = self._makeOne(file_cache_check_interval=5)
+        self._call(inst)
+        self._write('index.html', b'<html>changed!</html>')
+        self.now = 1004
+        self.assertEqual(self._call(inst).body, b'<html>index</html>')
+        self.now = 1005
+        self.assertEqual(self._call(inst).body, b'<html>changed!</html>')
+
+    def test_unchanged_file_is_revalidated(self):
+        inst = self._makeOne(file_cache_check_interval=5)
+        self._call(inst)
+        self.now = 1010
+        self.assertEqual(self._call(inst).body, b'<html>index</html>')
+        self.assertEqual(
+            inst.file_cache.get(('index.html', None)).checked, 1010)
+
+    def test_removed_file_is_not_found_after_check_interval(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        self._call(inst)
+        os.remove(os.path.join(self.tmpdir, 'index.html'))
+        self.now = 1001
+        self.assertRaises(HTTPNotFound, self._call, inst)
+        self.assertEqual(len(inst.file_cache), 0)
+
+    def test_large_file_not_cached(self):
+        inst = self._makeOne(file_cache_max_bytes=10)
+        response = self._call(inst)
+        self.assertEqual(response.__class__.__name__, 'FileResponse')
+        response.app_iter.close()
+        self.assertEqual(len(inst.file_cache), 0)
+
+    def test_unreadable_file_not_cached(self):
+        inst = self._makeOne()
+        def _stat(path):
+            raise OSError
+        inst._stat = _stat
+        response = self._call(inst)
+        response.app_iter.close()
+        self.assertEqual(len(inst.file_cache), 0)
+
+    def test_file_changed_while_reading_not_cached(self):
+        inst = self._makeOne()
+        real_stat = os.stat
+        class DummyStat(object):
+            def __init__(self, st):
+                self.st_mtime = st.st_mtime
+                self.st_size = st.st_size + 1
+        inst._stat = lambda path: DummyStat(real_stat(path))
+        response = self._call(inst)
+        response.app_iter.close()
+        self.assertEqual(len(inst.file_cache), 0)
+
+    def test_directory_hit_redirects_without_slash(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne()
+        response = self._call(inst, '/subdir/')
+        self.assertEqual(response.body, b'<html>subdir</html>')
+        self.assertRaises(HTTPMovedPermanently, self._call, inst, '/subdir')
+        response = self._call(inst, '/subdir/')
+        self.assertEqual(response.body, b'<html>subdir</html>')
+
+    def test_directory_miss_redirects_without_slash(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne()
+        request = self._makeRequest('/subdir?a=1')
+        try:
+            inst(DummyContext(), request)
+        except HTTPMovedPermanently as e:
+            self.assertEqual(e.location, 'http://localhost/subdir/?a=1')
+        else: # pragma: no cover
+            raise AssertionError('Expected redirect')
+        self.assertEqual(len(inst.file_cache), 0)
+
+    def test_conditional_request(self):
+        inst = self._makeOne()
+        etag = self._call(inst).etag
+        request = self._makeRequest(
+            '/index.html', headers={'If-None-Match': '"%s"' % etag})
+        response = request.get_response(
+            lambda environ, start_response: inst(DummyContext(), request)(
+                environ, start_response))
+        self.assertEqual(response.status_int, 304)
+
+    def test_range_request(self):
+        inst = self._makeOne()
+        self._call(inst)
+        request = self._makeRequest('/index.html', range='bytes=1-4')
+        response = request.get_response(
+            lambda environ, start_response: inst(DummyContext(), request)(
+                environ, start_response))
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, b'html')
+
+class Test_static_view_content_encodings(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        self._write('style.css', b'body {}')
+        self._write('style.css.br', b'brotli')
+        self._write('style.css.gz', b'gzipped')
+        self._write('plain.css', b'p {}')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.tmpdir, name), 'wb') as f:
+            f.write(data)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('content_encodings', ('br', 'gzip'))
+        return static_view(self.tmpdir, **kw)
+
+    def _call(self, inst, path_info='/style.css', accept_encoding=None):
+        from pyramid.request import Request
+        request = Request.blank(path_info)
+        if accept_encoding is not None:
+            request.headers['Accept-Encoding'] = accept_encoding
+        response = inst(DummyContext(), request)
+        body = b''.join(response.app_iter)
+        if hasattr(response.app_iter, 'close'):
+            response.app_iter.close()
+        return response, body
+
+    def test_ctor_unsupported_encoding(self):
+        self.assertRaises(ValueError, self._makeOne,
+                          content_encodings=('compress',))
+
+    def test_disabled_by_default(self):
+        from pyramid.static import static_view
+        inst = static_view(self.tmpdir)
+        response, body = self._call(inst, accept_encoding='br, gzip')
+        self.assertEqual(body, b'body {}')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+        self.assertEqual(inst.sidecars, {})
+
+    def test_no_accept_encoding(self):
+        inst = self._makeOne()
+        response, body = self._call(inst)
+        self.assertEqual(body, b'body {}')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_preferred_encoding(self):
+        inst = self._makeOne()
+        response, body = self._call(inst, accept_encoding='gzip, br')
+        self.assertEqual(body, b'brotli')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.content_encoding, 'br')
+        self.assertEqual(response.content_length, 6)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_server_preference_order(self):
+        inst = self._makeOne(content_encodings=('gzip', 'br'))
+        response, body = self._call(inst, accept_encoding='br, gzip')
+        self.assertEqual(body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+
+    def test_client_quality(self):
+        inst = self._makeOne()
+        response, body = self._call(inst, accept_encoding='br;q=0.5, gzip')
+        self.assertEqual(body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+
+    def test_identity_preferred(self):
+        inst = self._makeOne()
+        response, body = self._call(
+            inst, accept_encoding='identity, gzip;q=0.5')
+        self.assertEqual(body, b'body {}')
+        self.assertEqual(response.content_encoding, None)
+
+    def test_nothing_acceptable(self):
+        inst = self._makeOne()
+        response, body = self._call(
+            inst, accept_encoding='identity;q=0, br;q=0, gzip;q=0')
+        self.assertEqual(body, b'body {}')
+
+    def test_unsupported_accept_encoding(self):
+        inst = self._makeOne()
+        response, body = self._call(inst, accept_encoding='deflate')
+        self.assertEqual(body, b'body {}')
+
+    def test_no_sidecars(self):
+        inst = self._makeOne()
+        response, body = self._call(inst, '/plain.css', 'br, gzip')
+        self.assertEqual(body, b'p {}')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+        self.assertEqual(inst.sidecars, {'plain.css': ()})
+
+    def test_sidecar_lookups_are_cached(self):
+        inst = self._makeOne()
+        self._call(inst, '/plain.css', 'gzip')
+        self._write('plain.css.gz', b'p-gzipped')
+        response, body = self._call(inst, '/plain.css', 'gzip')
+        self.assertEqual(body, b'p {}')
+
+    def test_sidecar_lookups_with_reload(self):
+        inst = self._makeOne(reload=True)
+        self._call(inst, '/plain.css', 'gzip')
+        self._write('plain.css.gz', b'p-gzipped')
+        response, body = self._call(inst, '/plain.css', 'gzip')
+        self.assertEqual(body, b'p-gzipped')
+        self.assertEqual(inst.sidecars, {})
+
+    def test_not_found(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        self.assertRaises(HTTPNotFound, self._call, inst, '/missing.css')
+        self.assertEqual(inst.sidecars, {})
+
+    def test_with_file_cache(self):
+        inst = self._makeOne(file_cache_size=10)
+        for i in range(2):
+            response, body = self._call(inst, accept_encoding='gzip')
+            self.assertEqual(body, b'gzipped')
+            self.assertEqual(response.content_encoding, 'gzip')
+            self.assertEqual(response.vary, ('Accept-Encoding',))
+            response, body = self._call(inst)
+            self.assertEqual(body, b'body {}')
+            self.assertEqual(response.content_encoding, None)
+        self.assertEqual(inst.file_cache.hits, 2)
+
+class Test_static_view_path_cache(unittest.TestCase):
+    def setUp(self):
+        from pyramid import testing
+        self.config = testing.setUp(autocommit=True)
+
+    def tearDown(self):
+        from pyramid import testing
+        testing.tearDown()
+
+    def _makeOne(self, root_dir='pyramid.tests:fixtures/static', **kw):
+        from pyramid.static import static_view
+        kw.setdefault('path_cache_size', 10)
+        inst = static_view(root_dir, **kw)
+        self.found = []
+        real_find = inst._find
+        def _find(path):
+            self.found.append(path)
+            return real_find(path)
+        inst._find = _find
+        return inst
+
+    def _call(self, inst, path_info='/index.html'):
+        from pyramid.request import Request
+        request = Request.blank(path_info)
+        response = inst(DummyContext(), request)
+        body = b''.join(response.app_iter)
+        if hasattr(response.app_iter, 'close'):
+            response.app_iter.close()
+        return body
+
+    def test_disabled_by_default(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static')
+        self.assertEqual(inst.path_cache, None)
+
+    def test_disabled_for_filesystem_root(self):
+        inst = self._makeOne(os.path.join(here, 'fixtures', 'static'))
+        self.assertEqual(inst.path_cache, None)
+
+    def test_disabled_with_reload(self):
+        inst = self._makeOne(reload=True)
+        self.assertEqual(inst.path_cache, None)
+
+    def test_hit(self):
+        inst = self._makeOne()
+        self.assertTrue(b'<html>static</html>' in self._call(inst))
+        self.assertTrue(b'<html>static</html>' in self._call(inst))
+        self.assertEqual(self.found, ['index.html'])
+
+    def test_not_found_is_cached(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        self.assertRaises(HTTPNotFound, self._call, inst, '/missing.html')
+        self.assertRaises(HTTPNotFound, self._call, inst, '/missing.html')
+        self.assertEqual(self.found, ['missing.html'])
+
+    def test_directory_redirect(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne()
+        self.assertRaises(HTTPMovedPermanently, self._call, inst, '/subdir')
+        self.assertRaises(HTTPMovedPermanently, self._call, inst, '/subdir')
+        self.assertTrue(b'subdir' in self._call(inst, '/subdir/'))
+        self.assertEqual(self.found, ['subdir'])
+
+    def test_cached_file_removed(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        self._call(inst)
+        inst.path_cache.put('index.html', ('/no/such/file.html', False))
+        self.assertRaises(HTTPNotFound, self._call, inst)
+        self.assertTrue(b'<html>static</html>' in self._call(inst))
+        self.assertEqual(self.found, ['index.html', 'index.html'])
+
+    def test_removed_file_without_path_cache(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static', file_cache_size=1)
+        inst._find = lambda path: ('/no/such/file.html', False)
+        self.assertRaises((IOError, OSError), self._call, inst)
+
+    def test_overrides_change_empties_caches(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        root = 'pyramid.tests.test_config.pkgs.asset:subpackage/templates'
+        inst = self._makeOne(root, file_cache_size=10,
+                             content_encodings=('gzip',))
+        self._call(inst, '/bar.pt')
+        self.assertRaises(HTTPNotFound, self._call, inst, '/foo.pt')
+        self.config.override_asset(
+            'pyramid.tests.test_config.pkgs.asset:subpackage/templates/foo.pt',
+            'pyramid.tests.test_config.pkgs.asset:subpackage/templates/bar.pt')
+        self._call(inst, '/foo.pt')
+        self._call(inst, '/bar.pt')
+        self.assertEqual(self.found, ['bar.pt', 'foo.pt', 'foo.pt', 'bar.pt'])
+        self.assertEqual(len(inst.file_cache), 2)
+
 class TestQueryStringConstantCacheBuster(unittest.TestCase):
 
     def _makeOne(self, param=None):
@@ -377,6 +756,9 @@ class TestQueryStringConstantCacheBuster(unittest.TestCase):
         fut = self._makeOne().tokenize
         self.assertEqual(fut(None, 'whatever', None), 'foo')
 
+    def test_deterministic(self):
+        self.assertTrue(self._makeOne().deterministic)
+
     def test_it(self):
         fut = self._makeOne()
         self.assertEqual(
@@ -415,6 +797,12 @@ class TestManifestCacheBuster(unittest.TestCase):
             fut('foo', 'css/main.css', {}),
             ('css/main-test.css', {}))
 
+    def test_deterministic(self):
+        manifest_path = os.path.join(here, 'fixtures', 'manifest.json')
+        self.assertTrue(self._makeOne(manifest_path).deterministic)
+        inst = self._makeOne(manifest_path, reload=True)
+        self.assertFalse(inst.deterministic)
+
     def test_it_with_relspec(self):
         fut = self._makeOne('fixtures/manifest.json')
         self.assertEqual(fut('foo', 'bar', {}), ('bar', {}))
@@ -466,6 +854,167 @@ class TestManifestCacheBuster(unittest.TestCase):
         inst = self._makeOne('foo', reload=True)
         self.assertEqual(inst.manifest, {})
 
+class TestContentHashCacheBuster(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmpdir, 'static')
+        os.makedirs(os.path.join(self.root, 'css'))
+        self._write('css/main.css', b'body {}')
+        self._write('app.js', b'alert(1)')
+        self.index_path = os.path.join(self.tmpdir, 'index.json')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.root, name), 'wb') as f:
+            f.write(data)
+
+    def _makeOne(self, spec=None, **kw):
+        from pyramid.static import ContentHashCacheBuster
+        if spec is None:
+            spec = self.root
+        return ContentHashCacheBuster(spec, **kw)
+
+    def _token(self, data, hashalg='sha256', length=16):
+        import hashlib
+        return hashlib.new(hashalg, data).hexdigest()[:length]
+
+    def _spec(self, name):
+        return os.path.join(self.root, '') + name
+
+    def test_tokens(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.tokens, {
+            self._spec('css/main.css'): self._token(b'body {}'),
+            self._spec('app.js'): self._token(b'alert(1)'),
+            })
+        self.assertTrue(inst.deterministic)
+
+    def test_call(self):
+        inst = self._makeOne(param='v', hashalg='md5', token_length=8)
+        kw = {'rawspec': self._spec('css/main.css')}
+        self.assertEqual(
+            inst(None, 'css/main.css', kw),
+            ('css/main.css', {'rawspec': self._spec('css/main.css'),
+                              '_query': {'v': self._token(b'body {}', 'md5',
+                                                          8)}}))
+
+    def test_call_tokenizes_once(self):
+        inst = self._makeOne()
+        tokenized = []
+        tokenize = inst.tokenize
+        def counting_tokenize(request, subpath, kw):
+            tokenized.append(subpath)
+            return tokenize(request, subpath, kw)
+        inst.tokenize = counting_tokenize
+        inst(None, 'app.js', {'rawspec': self._spec('app.js')})
+        self.assertEqual(tokenized, ['app.js'])
+
+    def test_index_saved_without_temporary_file(self):
+        self._makeOne(index_path=self.index_path)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['index.json', 'static'])
+
+    def test_call_unknown_asset(self):
+        inst = self._makeOne()
+        kw = {'rawspec': self._spec('missing.css')}
+        self.assertEqual(inst(None, 'missing.css', kw), ('missing.css', kw))
+        self.assertEqual(inst(None, 'missing.css', {}), ('missing.css', {}))
+
+    def test_package_spec(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        self.assertEqual(inst.prefix, 'pyramid.tests:fixtures/static/')
+        self.assertTrue(
+            'pyramid.tests:fixtures/static/subdir/index.html' in inst.tokens)
+
+    def test_package_root_spec(self):
+        inst = self._makeOne('pyramid.tests.pkgs.static_abspath:')
+        self.assertEqual(inst.prefix, 'pyramid.tests.pkgs.static_abspath:')
+        self.assertTrue(
+            'pyramid.tests.pkgs.static_abspath:__init__.py' in inst.tokens)
+
+    def test_relative_spec(self):
+        inst = self._makeOne('fixtures/static')
+        self.assertEqual(inst.prefix, 'pyramid.tests:fixtures/static/')
+
+    def test_with_static_url(self):
+        from pyramid import testing
+        config = testing.setUp(autocommit=True)
+        try:
+            config.add_static_view('static', self.root)
+            config.add_cache_buster(self.root, self._makeOne())
+            request = testing.DummyRequest()
+            self.assertEqual(
+                request.static_url(self._spec('css/main.css')),
+                'http://example.com/static/css/main.css?x=%s' % (
+                    self._token(b'body {}'),))
+        finally:
+            testing.tearDown()
+
+    def test_index_saved_and_reused(self):
+        import json
+        inst = self._makeOne(index_path=self.index_path)
+        with open(self.index_path) as f:
+            data = json.load(f)
+        self.assertEqual(data['hashalg'], 'sha256')
+        self.assertEqual(data['token_length'], 16)
+        self.assertEqual(data['files']['app.js'][2], self._token(b'alert(1)'))
+        hashed = []
+        inst = self._makeOne(index_path=self.index_path)
+        real_hash_file = inst._hash_file
+        def _hash_file(filepath):
+            hashed.append(filepath)
+            return real_hash_file(filepath)
+        inst._hash_file = _hash_file
+        mtime = os.path.getmtime(self.index_path)
+        self.assertEqual(inst.compute_tokens(), inst.tokens)
+        self.assertEqual(hashed, [])
+        self.assertEqual(os.path.getmtime(self.index_path), mtime)
+
+    def test_index_changed_file_rehashed(self):
+        self._makeOne(index_path=self.index_path)
+        self._write('app.js', b'alert(2);')
+        os.remove(os.path.join(self.root, 'css', 'main.css'))
+        inst = self._makeOne(index_path=self.index_path)
+        self.assertEqual(inst.tokens, {
+            self._spec('app.js'): self._token(b'alert(2);')})
+        inst = self._makeOne()
+        self.assertEqual(inst.tokens, {
+            self._spec('app.js'): self._token(b'alert(2);')})
+
+    def test_index_removed_file(self):
+        import json
+        self._makeOne(index_path=self.index_path)
+        os.remove(os.path.join(self.root, 'app.js'))
+        self._makeOne(index_path=self.index_path)
+        with open(self.index_path) as f:
+            data = json.load(f)
+        self.assertEqual(list(data['files']), ['css/main.css'])
+
+    def test_index_with_other_hashalg_ignored(self):
+        self._makeOne(index_path=self.index_path)
+        inst = self._makeOne(index_path=self.index_path, hashalg='md5')
+        self.assertEqual(inst.tokens[self._spec('app.js')],
+                         self._token(b'alert(1)', 'md5'))
+
+    def test_invalid_index_ignored(self):
+        for content in ('not json', '[]', '{"hashalg": "sha256", '
+                        '"token_length": 16, "files": []}'):
+            with open(self.index_path, 'w') as f:
+                f.write(content)
+            inst = self._makeOne(index_path=self.index_path)
+            self.assertEqual(inst.tokens[self._spec('app.js')],
+                             self._token(b'alert(1)'))
+
+    def test_unwritable_index_ignored(self):
+        index_path = os.path.join(self.tmpdir, 'missing', 'index.json')
+        inst = self._makeOne(index_path=index_path)
+        self.assertEqual(len(inst.tokens), 2)
+        self.assertFalse(os.path.exists(index_path))
+
 class DummyContext:
     pass
 
@@ -80,9 +80,225 @@ class Test_excview_tween_factory(unittest.TestCase):
         self.assertIsNone(request.exception)
         self.assertIsNone(request.exc_info)
 
+class Test_compression_tween_factory(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _makeOne(self, response, **settings):
+        from pyramid.tweens import compression_tween_factory
+        self.config.registry.settings.update(settings)
+        def handler(request):
+            return response
+        return compression_tween_factory(handler, self.config.registry)
+
+    def _makeRequest(self, accept_encoding='gzip', method='GET'):
+        from pyramid.request import Request
+        headers = {}
+        if accept_encoding is not None:
+            headers['Accept-Encoding'] = accept_encoding
+        return Request.blank('/', method=method, headers=headers)
+
+    def _makeResponse(self, body=b'a' * 2000, **kw):
+        from pyramid.response import Response
+        kw.setdefault('content_type', 'text/plain')
+        if 'app_iter' in kw:
+            return Response(**kw)
+        return Response(body, **kw)
+
+    def _gunzip(self, data):
+        import zlib
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+    def test_gzip(self):
+        response = self._makeResponse()
+        response.etag = 'abc'
+        response.accept_ranges = 'bytes'
+        tween = self._makeOne(response)
+        result = tween(self._makeRequest())
+        self.assertTrue(result is response)
+        self.assertEqual(result.content_encoding, 'gzip')
+        self.assertEqual(result.content_length, None)
+        self.assertEqual(result.vary, ('Accept-Encoding',))
+        self.assertEqual(result.headers['ETag'], 'W/"abc"')
+        self.assertEqual(result.accept_ranges, None)
+        body = b''.join(result.app_iter)
+        self.assertTrue(len(body) < 100)
+        self.assertEqual(self._gunzip(body), b'a' * 2000)
+
+    def test_weak_etag_kept(self):
+        response = self._makeResponse()
+        response.headers['ETag'] = 'W/"abc"'
+        result = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(result.headers['ETag'], 'W/"abc"')
+
+    def test_streams_app_iter(self):
+        chunks = []
+        class AppIter(object):
+            closed = False
+            def __iter__(self):
+                for i in range(3):
+                    chunks.append(i)
+                    yield b'line %d\n' % i
+            def close(self):
+                self.closed = True
+        app_iter = AppIter()
+        response = self._makeResponse(app_iter=app_iter)
+        result = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(chunks, [])
+        self.assertEqual(result.content_encoding, 'gzip')
+        body = b''.join(result.app_iter)
+        self.assertEqual(chunks, [0, 1, 2])
+        self.assertEqual(self._gunzip(body), b'line 0\nline 1\nline 2\n')
+        result.app_iter.close()
+        self.assertTrue(app_iter.closed)
+
+    def test_close_without_iterating(self):
+        response = self._makeResponse(app_iter=iter([b'a']))
+        result = self._makeOne(response)(self._makeRequest())
+        result.app_iter.close()
+        self.assertEqual(self._gunzip(b''.join(result.app_iter)), b'a')
+
+    def test_empty_streamed_body(self):
+        response = self._makeResponse(app_iter=iter([]))
+        result = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(self._gunzip(b''.join(result.app_iter)), b'')
+
+    def test_level(self):
+        import binascii
+        import os
+        data = binascii.hexlify(os.urandom(1000)) * 2
+        sizes = []
+        for level in ('1', '9'):
+            response = self._makeResponse(data)
+            result = self._makeOne(response, compression_level=level)(
+                self._makeRequest())
+            body = b''.join(result.app_iter)
+            self.assertEqual(self._gunzip(body), data)
+            sizes.append(len(body))
+        self.assertTrue(sizes[0] >= sizes[1])
+
+    def test_small_response(self):
+        response = self._makeResponse(b'a' * 100)
+        result = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(result.content_encoding, None)
+        self.assertEqual(result.body, b'a' * 100)
+        self.assertEqual(result.vary, None)
+
+    def test_min_size_setting(self):
+        response = self._makeResponse(b'a' * 100)
+        result = self._makeOne(response, compression_min_size='10')(
+            self._makeRequest())
+        self.assertEqual(result.content_encoding, 'gzip')
+
+    def test_empty_body_not_compressed(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        response = HTTPNotFound()
+        result = self._makeOne(response, compression_min_size='0')(
+            self._makeRequest())
+        self.assertEqual(result.content_encoding, None)
+
+    def test_skipped_responses(self):
+        responses = [
+            self._makeResponse(content_type='image/png'),
+            self._makeResponse(content_encoding='br'),
+            self._makeResponse(status=304),
+            self._makeResponse(status=204),
+            self._makeResponse(status=101),
+            ]
+        response = self._makeResponse()
+        response.compress = False
+        responses.append(response)
+        response = self._makeResponse()
+        del response.headers['Content-Type']
+        responses.append(response)
+        for response in responses:
+            encoding = response.content_encoding
+            result = self._makeOne(response)(self._makeRequest())
+            self.assertEqual(result.content_encoding, encoding)
+            self.assertEqual(result.vary, None)
+
+    def test_compressible_types(self):
+        from pyramid.tweens import _is_compressible
+        for content_type in ('text/html', 'application/json',
+                             'application/javascript', 'image/svg+xml',
+                             'application/hal+json'):
+            self.assertTrue(_is_compressible(content_type))
+        for content_type in ('image/png', 'application/octet-stream'):
+            self.assertFalse(_is_compressible(content_type))
+
+    def test_not_accepted(self):
+        for accept_encoding in (None, 'identity', 'gzip;q=0', 'deflate',
+                                'gzip;q=0.5, identity'):
+            response = self._makeResponse()
+            result = self._makeOne(response)(
+                self._makeRequest(accept_encoding))
+            self.assertEqual(result.content_encoding, None)
+            self.assertEqual(result.vary, ('Accept-Encoding',))
+            self.assertEqual(result.body, b'a' * 2000)
+
+    def test_vary_kept(self):
+        response = self._makeResponse()
+        response.vary = ('Cookie',)
+        result = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(result.vary, ('Cookie', 'Accept-Encoding'))
+
+    def test_head(self):
+        response = self._makeResponse()
+        result = self._makeOne(response)(self._makeRequest(method='HEAD'))
+        self.assertEqual(result.content_encoding, 'gzip')
+
+    def test_brotli_and_zstd_preferred(self):
+        from pyramid import tweens
+        original = tweens.brotli, tweens.zstandard
+        tweens.brotli = DummyBrotli
+        tweens.zstandard = DummyZstandard
+        try:
+            for accept_encoding, expected in (
+                ('gzip, zstd, br', 'br'),
+                ('gzip, zstd', 'zstd'),
+                ('gzip, zstd;q=0.5', 'gzip'),
+            ):
+                response = self._makeResponse(b'abc', content_type='text/css')
+                result = self._makeOne(response, compression_min_size=0)(
+                    self._makeRequest(accept_encoding))
+                self.assertEqual(result.content_encoding, expected)
+                body = b''.join(result.app_iter)
+                if expected != 'gzip':
+                    self.assertEqual(
+                        body, (expected + ':6:abc:end').encode('ascii'))
+        finally:
+            tweens.brotli, tweens.zstandard = original
+
 class DummyRequest:
     exception = None
     exc_info = None
 
 class DummyResponse:
     pass
+
+class DummyBrotli(object):
+    class Compressor(object):
+        def __init__(self, quality):
+            self.quality = quality
+        def process(self, data):
+            return ('br:%d:' % self.quality).encode('ascii') + data
+        def finish(self):
+            return b':end'
+
+class DummyZstandard(object):
+    class ZstdCompressor(object):
+        def __init__(self, level):
+            self.level = level
+        def compressobj(self):
+            return DummyZstandardCompressObj(self.level)
+
+class DummyZstandardCompressObj(object):
+    def __init__(self, level):
+        self.level = level
+    def compress(self, data):
+        return ('zstd:%d:' % self.level).encode('ascii') + data
+    def flush(self):
+        return b':end'
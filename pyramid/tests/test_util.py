@@ -372,6 +372,98 @@ class Test_WeakOrderedSet(unittest.TestCase):
         self.assertEqual(list(wos), [])
         self.assertEqual(wos.last, None)
 
+class Test_LRUCache(unittest.TestCase):
+    def _makeOne(self, maxsize=3, timeout=None, now=1000.0):
+        from pyramid.util import LRUCache
+        cache = LRUCache(maxsize, timeout)
+        self.now = now
+        cache.clock = lambda: self.now
+        return cache
+
+    def test_ctor_bad_maxsize(self):
+        from pyramid.util import LRUCache
+        self.assertRaises(ValueError, LRUCache, 0)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        self.assertEqual(cache.misses, 2)
+
+    def test_put_and_get(self):
+        cache = self._makeOne()
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_put_replaces(self):
+        cache = self._makeOne()
+        cache.put('a', 1)
+        cache.put('a', 2)
+        self.assertEqual(cache.get('a'), 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = self._makeOne()
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('c', 3)
+        cache.get('a')
+        cache.put('d', 4)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.get('d'), 4)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_default_timeout(self):
+        cache = self._makeOne(timeout=10)
+        cache.put('a', 1)
+        self.now += 9
+        self.assertEqual(cache.get('a'), 1)
+        self.now += 1
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(len(cache), 0)
+
+    def test_put_timeout_overrides_default(self):
+        cache = self._makeOne(timeout=10)
+        cache.put('a', 1, timeout=100)
+        cache.put('b', 2, timeout=None)
+        self.now += 50
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), 2)
+
+    def test_invalidate(self):
+        cache = self._makeOne()
+        cache.put('a', 1)
+        cache.invalidate('a')
+        cache.invalidate('b')
+        self.assertEqual(cache.get('a'), None)
+
+    def test_clear(self):
+        cache = self._makeOne()
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        cache = self._makeOne(maxsize=1)
+        self.assertEqual(cache.stats()['hit_ratio'], 0.0)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.put('b', 2)
+        self.assertEqual(cache.stats(), {
+            'size': 1,
+            'maxsize': 1,
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'hit_ratio': 0.5,
+            })
+
 class Test_strings_differ(unittest.TestCase):
     def _callFUT(self, *args, **kw):
         from pyramid.util import strings_differ
@@ -777,6 +869,60 @@ class TestActionInfo(unittest.TestCase):
         self.assertEqual(str(inst),
                          "Line 0 of file filename:\n       linerepr  ")
 
+    def test_src_read_lazily(self):
+        import inspect
+        line = inspect.currentframe().f_lineno
+        inst = self._getTargetClass()(__file__, line, 'test_src_read_lazily')
+        self.assertFalse('src' in inst.__dict__)
+        self.assertEqual(inst.src, 'line = inspect.currentframe().f_lineno')
+        self.assertTrue(str(inst).endswith(
+            '\n    line = inspect.currentframe().f_lineno'))
+
+    def test_src_without_file(self):
+        inst = self._getTargetClass()(None, 0, '')
+        self.assertEqual(inst.src, '')
+
+class Test_action_method(unittest.TestCase):
+    def _makeConfig(self):
+        from pyramid.util import action_method
+        infos = []
+        def outer_decorator(wrapped):
+            def wrapper(self):
+                return wrapped(self, _backframes=1)
+            return wrapper
+        class Config(object):
+            _ainfo = None
+            @action_method
+            def directive(self):
+                infos.append(self._ainfo[-1])
+            outer = outer_decorator(directive)
+        return Config(), infos
+
+    def test_caller_info(self):
+        import inspect
+        config, infos = self._makeConfig()
+        line = inspect.currentframe().f_lineno + 1
+        config.directive()
+        info, = infos
+        self.assertEqual(info.file, __file__)
+        self.assertEqual(info.line, line)
+        self.assertEqual(info.function, 'test_caller_info')
+        self.assertEqual(info.src, 'config.directive()')
+        self.assertEqual(config._ainfo, [])
+
+    def test_backframes(self):
+        config, infos = self._makeConfig()
+        config.outer()
+        self.assertEqual(infos[0].function, 'test_backframes')
+        self.assertEqual(infos[0].src, 'config.outer()')
+
+    def test_info_tuple(self):
+        config, infos = self._makeConfig()
+        config.directive(_info=('file', 1, 'function', 'src'))
+        info, = infos
+        self.assertEqual((info.file, info.line, info.function, info.src),
+                         ('file', 1, 'function', 'src'))
+
 
 class TestCallableName(unittest.TestCase):
     def test_valid_ascii(self):
@@ -889,3 +1035,68 @@ class Test_is_same_domain(unittest.TestCase):
         self.assertTrue(self._callFUT("example.com:8080", "example.com:8080"))
         self.assertFalse(self._callFUT("example.com:8080", "example.com"))
         self.assertFalse(self._callFUT("example.com", "example.com:8080"))
+
+
+class Test_add_vary(unittest.TestCase):
+    def _callFUT(self, response, option):
+        from pyramid.util import add_vary
+        return add_vary(response, option)
+
+    def test_appends(self):
+        from pyramid.response import Response
+        response = Response(vary=['Cookie'])
+        self._callFUT(response, 'Accept-Encoding')
+        self.assertEqual(response.vary, ('Cookie', 'Accept-Encoding'))
+
+    def test_already_present(self):
+        from pyramid.response import Response
+        response = Response(vary=['accept-encoding'])
+        self._callFUT(response, 'Accept-Encoding')
+        self.assertEqual(response.vary, ('accept-encoding',))
+
+
+class Test_atomic_write(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _callFUT(self, path, data):
+        from pyramid.util import atomic_write
+        return atomic_write(path, data)
+
+    def _read(self, path):
+        with open(path, 'r') as f:
+            return f.read()
+
+    def test_new_file(self):
+        import os
+        path = os.path.join(self.tmpdir, 'data.json')
+        self._callFUT(path, '{}')
+        self.assertEqual(self._read(path), '{}')
+        self.assertEqual(os.listdir(self.tmpdir), ['data.json'])
+
+    def test_replaces_file(self):
+        import os
+        path = os.path.join(self.tmpdir, 'data.json')
+        with open(path, 'w') as f:
+            f.write('old')
+        self._callFUT(path, 'new')
+        self.assertEqual(self._read(path), 'new')
+        self.assertEqual(os.listdir(self.tmpdir), ['data.json'])
+
+    def test_missing_directory(self):
+        import os
+        path = os.path.join(self.tmpdir, 'missing', 'data.json')
+        self.assertRaises((IOError, OSError), self._callFUT, path, '{}')
+
+    def test_failure_removes_temporary_file(self):
+        import os
+        path = os.path.join(self.tmpdir, 'data.json')
+        os.mkdir(path)
+        self.assertRaises((IOError, OSError), self._callFUT, path, '{}')
+        self.assertEqual(os.listdir(self.tmpdir), ['data.json'])
+        self.assertTrue(os.path.isdir(path))
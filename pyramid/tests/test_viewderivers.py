@@ -1170,6 +1170,429 @@ class TestDeriveView(unittest.TestCase):
         self.assertRaises(ConfigurationError, self.config._derive_view, 
             view, http_cache=(None,))
 
+    def _makeConditionalRequest(self, method='GET', **headers):
+        from pyramid.request import Request
+        request = Request.blank('/', method=method, headers=headers)
+        request.registry = self.config.registry
+        return request
+
+    def test_etag_view_None(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        for etag in (None, False):
+            view = self.config._derive_view(inner_view, etag=etag)
+            request = self._makeConditionalRequest(**{'If-None-Match': '*'})
+            response = view(None, request)
+            self.assertEqual(response.status_int, 200)
+            self.assertEqual(response.etag, None)
+
+    def test_etag_view_bad_value(self):
+        def view(request): pass
+        self.assertRaises(ConfigurationError, self.config._derive_view,
+            view, etag='abc')
+
+    def test_etag_view_hashed(self):
+        import hashlib
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc', content_type='text/plain')
+        view = self.config._derive_view(inner_view, etag=True)
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.body, b'abc')
+        etag = hashlib.sha1(b'abc').hexdigest()
+        self.assertEqual(response.etag, etag)
+        self.assertEqual(response.headers['ETag'], '"%s"' % etag)
+
+    def test_etag_view_hashed_not_modified(self):
+        import hashlib
+        from pyramid.response import Response
+        def inner_view(context, request):
+            response = Response(b'abc', content_type='text/plain')
+            response.cache_control.max_age = 60
+            return response
+        view = self.config._derive_view(inner_view, etag=True)
+        etag = '"%s"' % hashlib.sha1(b'abc').hexdigest()
+        for method in ('GET', 'HEAD'):
+            request = self._makeConditionalRequest(
+                method, **{'If-None-Match': etag})
+            response = view(None, request)
+            self.assertEqual(response.status_int, 304)
+            self.assertEqual(response.body, b'')
+            self.assertEqual(response.headers['ETag'], etag)
+            self.assertEqual(response.headers['Cache-Control'], 'max-age=60')
+            self.assertFalse('Content-Type' in response.headers)
+            self.assertFalse('Content-Length' in response.headers)
+
+    def test_etag_view_hashed_modified(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view = self.config._derive_view(inner_view, etag=True)
+        request = self._makeConditionalRequest(**{'If-None-Match': '"x"'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.body, b'abc')
+
+    def test_etag_view_hashed_keeps_view_etag(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            response = Response(b'abc')
+            response.etag = 'mine'
+            return response
+        view = self.config._derive_view(inner_view, etag=True)
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.etag, 'mine')
+        request = self._makeConditionalRequest(**{'If-None-Match': '"mine"'})
+        self.assertEqual(view(None, request).status_int, 304)
+
+    def test_etag_view_hashed_skips_unsafe_and_errors(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc', status=request.params.get('status', 200))
+        view = self.config._derive_view(inner_view, etag=True)
+        response = view(None, self._makeConditionalRequest('POST'))
+        self.assertEqual(response.etag, None)
+        request = self._makeConditionalRequest()
+        request.GET['status'] = '404'
+        response = view(None, request)
+        self.assertEqual(response.status_int, 404)
+        self.assertEqual(response.etag, None)
+
+    def test_etag_view_hashed_skips_streamed_body(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(app_iter=iter([b'a', b'b']))
+        view = self.config._derive_view(inner_view, etag=True)
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.etag, None)
+        self.assertEqual(response.body, b'ab')
+
+    def test_etag_view_hashed_with_renderer(self):
+        import hashlib
+        def inner_view(request):
+            return {'a': 1}
+        view = self.config._derive_view(
+            inner_view, etag=True, renderer='json')
+        etag = hashlib.sha1(b'{"a": 1}').hexdigest()
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.etag, etag)
+        request = self._makeConditionalRequest(
+            **{'If-None-Match': 'W/"%s"' % etag})
+        self.assertEqual(view(None, request).status_int, 304)
+
+    def test_etag_view_validator_not_modified(self):
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+        def validator(context, request):
+            self.assertEqual(context, 'context')
+            return 'v1'
+        view = self.config._derive_view(
+            inner_view, etag=validator, http_cache=(3600, {'public': True}))
+        for header in ('"v1"', '"v0", "v1"', '*'):
+            request = self._makeConditionalRequest(
+                **{'If-None-Match': header})
+            response = view('context', request)
+            self.assertEqual(response.status_int, 304)
+            self.assertEqual(response.headers['ETag'], '"v1"')
+            self.assertEqual(response.headers['Cache-Control'],
+                             'max-age=3600, public')
+            self.assertTrue('Expires' in response.headers)
+        self.assertEqual(calls, [])
+
+    def test_etag_view_validator_not_modified_prevent_http_cache(self):
+        self.config.registry.settings['prevent_http_cache'] = True
+        def inner_view(context, request): pass
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: 'v1', http_cache=3600)
+        request = self._makeConditionalRequest(**{'If-None-Match': '"v1"'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 304)
+        self.assertFalse('Cache-Control' in response.headers)
+
+    def test_etag_view_validator_modified(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: 'v2')
+        for headers in ({'If-None-Match': '"v1"'}, {}):
+            request = self._makeConditionalRequest(**headers)
+            response = view(None, request)
+            self.assertEqual(response.status_int, 200)
+            self.assertEqual(response.body, b'abc')
+            self.assertEqual(response.etag, 'v2')
+
+    def test_etag_view_validator_keeps_view_etag(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            response = Response(b'abc')
+            response.etag = 'mine'
+            return response
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: 'v2')
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.etag, 'mine')
+
+    def test_etag_view_validator_last_modified(self):
+        import datetime
+        from webob.datetime_utils import UTC
+        from pyramid.response import Response
+        modified = datetime.datetime(2017, 6, 1, 12, 0, 0, tzinfo=UTC)
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            return Response(b'abc')
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: modified)
+        request = self._makeConditionalRequest(
+            **{'If-Modified-Since': 'Thu, 01 Jun 2017 12:00:00 GMT'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 304)
+        self.assertEqual(response.last_modified, modified)
+        request = self._makeConditionalRequest(
+            **{'If-Modified-Since': 'Thu, 01 Jun 2017 11:59:59 GMT'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.last_modified, modified)
+        response = view(None, self._makeConditionalRequest())
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(calls), 2)
+
+    def test_etag_view_validator_if_none_match_precedence(self):
+        import datetime
+        from webob.datetime_utils import UTC
+        from pyramid.response import Response
+        modified = datetime.datetime(2017, 6, 1, 12, 0, 0, tzinfo=UTC)
+        def inner_view(context, request):
+            response = Response(b'abc')
+            response.etag = 'v2'
+            return response
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: modified)
+        request = self._makeConditionalRequest(**{
+            'If-Modified-Since': 'Thu, 01 Jun 2017 12:00:00 GMT',
+            'If-None-Match': '"v1"'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.etag, 'v2')
+        self.assertEqual(response.last_modified, modified)
+
+    def test_etag_view_validator_None(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view = self.config._derive_view(
+            inner_view, etag=lambda context, request: None)
+        request = self._makeConditionalRequest(**{'If-None-Match': '*'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.etag, None)
+
+    def test_etag_view_validator_unsafe_method(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        def validator(context, request): # pragma: no cover
+            raise AssertionError
+        view = self.config._derive_view(inner_view, etag=validator)
+        request = self._makeConditionalRequest(
+            'POST', **{'If-None-Match': '*'})
+        response = view(None, request)
+        self.assertEqual(response.status_int, 200)
+
+    def _deriveCoalesced(self, view, **kw):
+        from pyramid.interfaces import IRequestCoalescer
+        derived = self.config._derive_view(view, **kw)
+        return derived, self.config.registry.queryUtility(IRequestCoalescer)
+
+    def _callInThreads(self, view, requests):
+        import threading
+        results = [None] * len(requests)
+        def call(i):
+            results[i] = view(None, requests[i])
+        threads = [threading.Thread(target=call, args=(i,))
+                   for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def _makeBlockingView(self, body=b'abc', set_cookie=False):
+        import threading
+        from pyramid.response import Response
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            started.set()
+            release.wait(5)
+            response = Response(body)
+            if set_cookie:
+                response.set_cookie('a', 'b')
+            return response
+        return inner_view, started, release, calls
+
+    def _waitForWaiters(self, coalescer, count):
+        import time
+        for i in range(5000):
+            waiters = sum(call.waiters for call in coalescer._calls.values())
+            if waiters == count:
+                break
+            time.sleep(0.001) # pragma: no cover
+
+    def test_coalesced_view_None(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=None)
+        self.assertEqual(view(None, self._makeConditionalRequest()).body,
+                         b'abc')
+        self.assertEqual(coalescer.stats()['calls'], 0)
+
+    def test_coalesced_view_default_coalescer(self):
+        from pyramid.viewderivers import RequestCoalescer
+        from pyramid.interfaces import IRequestCoalescer
+        def inner_view(context, request): pass
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        self.assertTrue(isinstance(coalescer, RequestCoalescer))
+        self.assertEqual(coalescer.timeout, 30)
+        other = RequestCoalescer(timeout=5)
+        self.config.set_request_coalescer(other)
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        self.assertTrue(coalescer is other)
+
+    def test_coalesced_view_without_coalescer(self):
+        from pyramid.interfaces import IRequestCoalescer
+        from pyramid.response import Response
+        self.config.registry.unregisterUtility(provided=IRequestCoalescer)
+        def inner_view(context, request):
+            return Response(b'abc')
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        self.assertEqual(coalescer, None)
+        self.assertEqual(view(None, self._makeConditionalRequest()).body,
+                         b'abc')
+
+    def test_coalesced_view_shares_response(self):
+        inner_view, started, release, calls = self._makeBlockingView()
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        requests = [self._makeConditionalRequest() for i in range(3)]
+        threads, results = self._callInThreads(view, requests[:1])
+        started.wait(5)
+        more, more_results = self._callInThreads(view, requests[1:])
+        self._waitForWaiters(coalescer, 2)
+        release.set()
+        for thread in threads + more:
+            thread.join()
+        results.extend(more_results)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.body for r in results], [b'abc'] * 3)
+        self.assertEqual(len(set(id(r) for r in results)), 3)
+        self.assertEqual(coalescer.stats(), {
+            'calls': 1, 'coalesced': 2, 'timeouts': 0, 'failures': 0})
+        self.assertEqual(coalescer._calls, {})
+
+    def test_coalesced_view_distinct_keys(self):
+        inner_view, started, release, calls = self._makeBlockingView()
+        view, coalescer = self._deriveCoalesced(
+            inner_view, coalesce='Accept-Language')
+        release.set()
+        requests = [
+            self._makeConditionalRequest(),
+            self._makeConditionalRequest(**{'Accept-Language': 'fr'}),
+            self._makeConditionalRequest('HEAD'),
+            ]
+        request = self._makeConditionalRequest()
+        request.environ['QUERY_STRING'] = 'a=1'
+        requests.append(request)
+        for request in requests:
+            view(None, request)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(coalescer.stats()['calls'], 4)
+
+    def test_coalesced_view_key_uses_route(self):
+        from pyramid.response import Response
+        keys = []
+        class Coalescer(object):
+            def coalesce(self, key, func):
+                keys.append(key)
+                return func()
+        from pyramid.interfaces import IRequestCoalescer
+        self.config.registry.registerUtility(Coalescer(), IRequestCoalescer)
+        def inner_view(context, request):
+            return Response(b'abc')
+        view, coalescer = self._deriveCoalesced(
+            inner_view, coalesce=('Accept-Language', 'Cookie'))
+        request = self._makeConditionalRequest(**{'Accept-Language': 'fr'})
+        view(None, request)
+        request.matched_route = DummyRoute('page')
+        request.matchdict = {'b': '2', 'a': '1'}
+        view(None, request)
+        self.assertEqual(keys[0][1:], ('GET', '/', '', ('fr', None)))
+        self.assertEqual(keys[1][1:], (
+            'GET', ('page', (('a', '1'), ('b', '2'))), '', ('fr', None)))
+
+    def test_coalesced_view_unsafe_method(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        view(None, self._makeConditionalRequest('POST'))
+        self.assertEqual(coalescer.stats()['calls'], 0)
+
+    def test_coalesced_view_unshareable_response(self):
+        inner_view, started, release, calls = self._makeBlockingView(
+            set_cookie=True)
+        view, coalescer = self._deriveCoalesced(inner_view, coalesce=True)
+        requests = [self._makeConditionalRequest() for i in range(2)]
+        threads, results = self._callInThreads(view, requests[:1])
+        started.wait(5)
+        more, more_results = self._callInThreads(view, requests[1:])
+        self._waitForWaiters(coalescer, 1)
+        release.set()
+        for thread in threads + more:
+            thread.join()
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(calls[1] is requests[1])
+        self.assertTrue(
+            'Set-Cookie' in more_results[0].headers)
+
+    def test_coalesced_view_private_requests_not_shared(self):
+        from pyramid.response import Response
+        def use_session(request):
+            request.session = {}
+        def add_callback(request):
+            request.add_response_callback(lambda request, response: None)
+        for make_private in (use_session, add_callback):
+            calls = []
+            def inner_view(context, request):
+                calls.append(request)
+                make_private(request)
+                return Response(b'abc')
+            coalesced = []
+            class Coalescer(object):
+                def coalesce(self, key, func):
+                    coalesced.append(func())
+                    return coalesced[-1]
+            from pyramid.interfaces import IRequestCoalescer
+            self.config.registry.registerUtility(
+                Coalescer(), IRequestCoalescer)
+            view, coalescer = self._deriveCoalesced(
+                inner_view, coalesce=True)
+            view(None, self._makeConditionalRequest())
+            self.assertEqual(coalesced, [None])
+
+    def test_coalesced_view_exception_only(self):
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response(b'abc')
+        view, coalescer = self._deriveCoalesced(
+            inner_view, coalesce=True, exception_only=True)
+        view(None, self._makeConditionalRequest())
+        self.assertEqual(coalescer.stats()['calls'], 0)
+
     def test_csrf_view_ignores_GET(self):
         response = DummyResponse()
         def inner_view(request):
@@ -1435,6 +1858,135 @@ class TestDeriveView(unittest.TestCase):
         self.assertTrue(b'hello' in response.body)
 
 
+class TestRequestCoalescer(unittest.TestCase):
+    def _makeOne(self, timeout=30):
+        from pyramid.viewderivers import RequestCoalescer
+        return RequestCoalescer(timeout=timeout)
+
+    def _startLeader(self, coalescer, func, results):
+        import threading
+        started = threading.Event()
+        def leader():
+            started.set()
+            try:
+                results.append(coalescer.coalesce('key', func))
+            except ValueError as e:
+                results.append(e)
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait(5)
+        return thread
+
+    def _startFollowers(self, coalescer, func, results, count):
+        import threading
+        def follower():
+            results.append(coalescer.coalesce('key', func))
+        threads = [threading.Thread(target=follower) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _waitForWaiters(self, coalescer, count):
+        import time
+        for i in range(5000):
+            if coalescer._calls['key'].waiters == count:
+                break
+            time.sleep(0.001) # pragma: no cover
+
+    def _waitForCall(self, coalescer):
+        import time
+        for i in range(500):
+            if coalescer._calls:
+                break
+            time.sleep(0.001) # pragma: no cover
+
+    def test_provides_interface(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IRequestCoalescer
+        verifyObject(IRequestCoalescer, self._makeOne())
+
+    def test_sequential_calls_not_coalesced(self):
+        coalescer = self._makeOne()
+        self.assertEqual(coalescer.coalesce('key', lambda: 1), 1)
+        self.assertEqual(coalescer.coalesce('key', lambda: 2), 2)
+        self.assertEqual(coalescer.stats(), {
+            'calls': 2, 'coalesced': 0, 'timeouts': 0, 'failures': 0})
+
+    def test_waiter_joins_before_leader_starts(self):
+        import threading
+        coalescer = self._makeOne(timeout=1)
+        lock = coalescer._lock
+        followers = []
+        results = []
+        test = self
+        class JoiningLock(object):
+            joined = False
+            def __enter__(self):
+                lock.acquire()
+            def __exit__(self, *exc_info):
+                lock.release()
+                if not self.joined and 'key' in coalescer._calls:
+                    # another request joins the call between the release
+                    # of the lock by its leader and the leader's call
+                    self.joined = True
+                    followers.extend(test._startFollowers(
+                        coalescer, lambda: 'follower', results, 1))
+                    test._waitForWaiters(coalescer, 1)
+        coalescer._lock = JoiningLock()
+        self.assertEqual(coalescer.coalesce('key', lambda: 'leader'), 'leader')
+        followers[0].join()
+        self.assertEqual(results, ['leader'])
+        self.assertEqual(coalescer._calls, {})
+        self.assertEqual(coalescer.stats(), {
+            'calls': 1, 'coalesced': 1, 'timeouts': 0, 'failures': 0})
+
+    def test_timeout(self):
+        import threading
+        coalescer = self._makeOne(timeout=0.05)
+        release = threading.Event()
+        def slow():
+            release.wait(5)
+            return 'slow'
+        results = []
+        leader = self._startLeader(coalescer, slow, results)
+        self._waitForCall(coalescer)
+        self.assertEqual(coalescer.coalesce('key', lambda: 'own'), 'own')
+        release.set()
+        leader.join()
+        self.assertEqual(results, ['slow'])
+        self.assertEqual(coalescer.stats()['timeouts'], 1)
+
+    def test_failure_is_not_shared(self):
+        import threading
+        coalescer = self._makeOne()
+        release = threading.Event()
+        def failing():
+            release.wait(5)
+            raise ValueError
+        leader_results = []
+        leader = self._startLeader(coalescer, failing, leader_results)
+        self._waitForCall(coalescer)
+        lock = threading.Lock()
+        calls = []
+        all_called = threading.Event()
+        def retry():
+            with lock:
+                calls.append(1)
+                if len(calls) == 3:
+                    all_called.set()
+            return all_called.wait(5)
+        results = []
+        followers = self._startFollowers(coalescer, retry, results, 3)
+        self._waitForWaiters(coalescer, 3)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+        self.assertTrue(isinstance(leader_results[0], ValueError))
+        # the waiting calls were made at the same time
+        self.assertEqual(results, [True] * 3)
+        self.assertEqual(coalescer.stats(), {
+            'calls': 1, 'coalesced': 0, 'timeouts': 0, 'failures': 3})
+
 class TestDerivationOrder(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -1456,6 +2008,8 @@ class TestDerivationOrder(unittest.TestCase):
         self.assertEqual([
             'secured_view',
             'csrf_view',
+            'etag_view',
+            'coalesced_view',
             'owrapped_view',
             'http_cached_view',
             'decorated_view',
@@ -1479,6 +2033,8 @@ class TestDerivationOrder(unittest.TestCase):
         self.assertEqual([
             'secured_view',
             'csrf_view',
+            'etag_view',
+            'coalesced_view',
             'owrapped_view',
             'http_cached_view',
             'decorated_view',
@@ -1500,6 +2056,8 @@ class TestDerivationOrder(unittest.TestCase):
         self.assertEqual([
             'secured_view',
             'csrf_view',
+            'etag_view',
+            'coalesced_view',
             'owrapped_view',
             'http_cached_view',
             'decorated_view',
@@ -1522,6 +2080,8 @@ class TestDerivationOrder(unittest.TestCase):
         self.assertEqual([
             'secured_view',
             'csrf_view',
+            'etag_view',
+            'coalesced_view',
             'owrapped_view',
             'http_cached_view',
             'decorated_view',
@@ -1738,6 +2298,10 @@ class TestDeriverIntegration(unittest.TestCase):
             ConfigurationError,
             lambda: self.config.add_view(lambda r: {}, deriv1='test1'))
 
+class DummyRoute(object):
+    def __init__(self, name):
+        self.name = name
+
 @implementer(IResponse)
 class DummyResponse(object):
     content_type = None
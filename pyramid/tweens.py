@@ -1,7 +1,19 @@
 import sys
+import zlib
+
+try:
+    import brotli
+except ImportError: # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError: # pragma: no cover
+    zstandard = None
 
 from pyramid.compat import reraise
 from pyramid.httpexceptions import HTTPNotFound
+from pyramid.util import add_vary
 
 def _error_handler(request, exc):
     # NOTE: we do not need to delete exc_info because this function
@@ -43,6 +55,177 @@ def excview_tween_factory(handler, registry):
 
     return excview_tween
 
+class _GzipCompressor(object):
+    def __init__(self, level):
+        # a window size of 16 + MAX_WBITS produces the gzip format
+        self._compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliCompressor(object):
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+        # the brotli and brotlipy packages name this method differently
+        self.compress = getattr(self._compressor, 'process', None)
+        if self.compress is None: # pragma: no cover
+            self.compress = self._compressor.compress
+
+    def finish(self):
+        return self._compressor.finish()
+
+class _ZstdCompressor(object):
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+def _available_compressors():
+    # in order of preference
+    compressors = []
+    if brotli is not None:
+        compressors.append(('br', _BrotliCompressor))
+    if zstandard is not None:
+        compressors.append(('zstd', _ZstdCompressor))
+    compressors.append(('gzip', _GzipCompressor))
+    return compressors
+
+_compressible_types = frozenset([
+    'application/javascript',
+    'application/json',
+    'application/x-javascript',
+    'application/xml',
+    ])
+
+def _is_compressible(content_type):
+    if not content_type:
+        return False
+    return (
+        content_type.startswith('text/') or
+        content_type in _compressible_types or
+        content_type.endswith(('+json', '+xml'))
+        )
+
+class _CompressingIter(object):
+    """ Compress the chunks of ``app_iter`` as they are iterated. """
+    def __init__(self, app_iter, compressor):
+        self.app_iter = app_iter
+        self.compressor = compressor
+        self._chunks = None
+
+    def __iter__(self):
+        return self
+
+    def _generate(self):
+        compress = self.compressor.compress
+        for chunk in self.app_iter:
+            data = compress(chunk)
+            if data:
+                yield data
+        data = self.compressor.finish()
+        if data:
+            yield data
+
+    def next(self):
+        if self._chunks is None:
+            self._chunks = self._generate()
+        return next(self._chunks)
+
+    __next__ = next # py3
+
+    def close(self):
+        close = getattr(self.app_iter, 'close', None)
+        if close is not None:
+            close()
+
+def compression_tween_factory(handler, registry):
+    """ A :term:`tween` factory which produces a tween compressing the body
+    of responses for clients which accept a compressed encoding in their
+    ``Accept-Encoding`` header.  Bodies are compressed with ``gzip``, or
+    with ``br`` or ``zstd`` when the :mod:`brotli` or :mod:`zstandard`
+    packages are installed and the client prefers them, while the response
+    is being sent, so they are never held in memory as a whole.
+
+    Only responses with a textual content type (``text/*``, JSON,
+    JavaScript and XML) and at least ``pyramid.compression_min_size`` bytes
+    long are compressed, unless their length is unknown.  Responses which
+    already have a ``Content-Encoding`` are left alone, as are responses
+    whose ``compress`` attribute is false; a view may set
+    ``request.response.compress = False`` to opt out.  The compression
+    level is the ``pyramid.compression_level`` setting.
+
+    The responses which may be compressed get ``Accept-Encoding`` added to
+    their ``Vary`` header.  A strong ``ETag`` of a compressed response is
+    made weak and it no longer answers range requests.
+
+    The tween is not used unless it is added explicitly, for instance with
+    ``config.add_tween('pyramid.tweens.compression_tween_factory')``.
+
+    .. versionadded:: 1.10
+    """
+    settings = registry.settings or {}
+    level = int(settings.get('compression_level', 6))
+    min_size = int(settings.get('compression_min_size', 1024))
+    available = _available_compressors()
+    compressors = dict(available)
+    offers = [name for name, factory in available] + ['identity']
+
+    def select_encoding(request):
+        accept_encoding = request.accept_encoding
+        if hasattr(accept_encoding, 'acceptable_offers'):
+            acceptable = [
+                offer for offer, q in accept_encoding.acceptable_offers(offers)
+                ]
+        else: # pragma: no cover (WebOb < 1.8)
+            acceptable = [
+                offer for offer in offers if offer in accept_encoding
+                ]
+        if acceptable and acceptable[0] != 'identity':
+            return acceptable[0]
+
+    def compression_tween(request):
+        response = handler(request)
+        if (
+            not getattr(response, 'compress', True) or
+            response.content_encoding is not None or
+            response.status_int < 200 or
+            response.status_int in (204, 304) or
+            not _is_compressible(response.content_type)
+        ):
+            return response
+        content_length = response.content_length
+        if content_length is not None and (
+            # the body of HTTP exceptions is only generated when they are
+            # called as WSGI applications
+            content_length == 0 or content_length < min_size
+        ):
+            return response
+        add_vary(response, 'Accept-Encoding')
+        if 'Accept-Encoding' not in request.headers:
+            return response
+        encoding = select_encoding(request)
+        if encoding is None:
+            return response
+        response.app_iter = _CompressingIter(
+            response.app_iter, compressors[encoding](level))
+        response.content_length = None
+        response.content_encoding = encoding
+        response.accept_ranges = None
+        etag = response.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    return compression_tween
+
 MAIN = 'MAIN'
 INGRESS = 'INGRESS'
 EXCVIEW = 'pyramid.tweens.excview_tween_factory'
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 import contextlib
 import functools
 try:
@@ -6,7 +7,12 @@ try:
 except ImportError:  # pragma: no cover
     compare_digest = None
 import inspect
-import traceback
+import linecache
+import os
+import sys
+import tempfile
+import threading
+import time
 import weakref
 
 from zope.interface import implementer
@@ -22,9 +28,11 @@ from pyramid.compat import (
     string_types,
     text_,
     PY2,
+    WIN,
     native_
     )
 
+from pyramid.decorator import reify
 from pyramid.interfaces import IActionInfo
 from pyramid.path import DottedNameResolver as _DottedNameResolver
 
@@ -269,6 +277,153 @@ class WeakOrderedSet(object):
             oid = self._order[-1]
             return self._items[oid]()
 
+class LRUCache(object):
+    """ A thread-safe mapping holding at most ``maxsize`` entries.
+
+    When the cache is full, the least recently used entry is discarded to
+    make room for a new one.  If ``timeout`` is not ``None``, entries expire
+    ``timeout`` seconds after they were stored; a different lifetime may be
+    passed to :meth:`.put` for individual entries.
+
+    The number of cache ``hits``, ``misses`` and ``evictions`` are kept as
+    attributes and returned by :meth:`.stats`.
+    """
+    clock = staticmethod(time.time) # for tests
+
+    def __init__(self, maxsize=1000, timeout=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer')
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """ Return the value stored for ``key`` or ``default`` if it is
+        missing or has expired."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self.clock():
+                    self._data[key] = entry
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value, timeout=_marker):
+        """ Store ``value`` for ``key``.  ``timeout`` overrides the
+        lifetime in seconds given to the constructor."""
+        if timeout is _marker:
+            timeout = self.timeout
+        expires = None if timeout is None else self.clock() + timeout
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """ Discard the entry for ``key`` if there is one."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """ Discard every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """ Return a dictionary describing the cache effectiveness."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': float(self.hits) / lookups if lookups else 0.0,
+                }
+
+    def __len__(self):
+        return len(self._data)
+
+class _MemoryStore(object):
+    """ A store of bytes keyed by strings which keeps at most ``max_size``
+    entries in an :class:`.LRUCache`.  The base of the in-memory stores of
+    sessions and cached responses."""
+    def __init__(self, max_size):
+        self._cache = LRUCache(max_size)
+
+    def load(self, key):
+        return self._cache.get(key)
+
+    def save(self, key, data, timeout):
+        self._cache.put(key, data, timeout=timeout)
+
+    def delete(self, key):
+        self._cache.invalidate(key)
+
+
+class _SQLiteStore(object):
+    """ A store of bytes keyed by strings which keeps its entries in
+    ``table`` in the SQLite database file at ``path``.  The base of the
+    SQLite stores of sessions and cached responses."""
+    clock = staticmethod(time.time) # for tests
+
+    def __init__(self, path, table):
+        import sqlite3 # not available on every Python build
+        self._sqlite3 = sqlite3
+        self.path = path
+        self.table = table
+        with self._transaction() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS %s '
+                '(id TEXT PRIMARY KEY, expires REAL, data BLOB)' % table)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with contextlib.closing(self._sqlite3.connect(self.path)) as conn:
+            with conn:
+                yield conn
+
+    def load(self, key):
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT data, expires FROM %s WHERE id = ?' % self.table,
+                (key,)).fetchone()
+        if row is not None:
+            data, expires = row
+            if expires is None or expires > self.clock():
+                return bytes(data)
+
+    def save(self, key, data, timeout):
+        expires = None if timeout is None else self.clock() + timeout
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO %s (id, expires, data) '
+                'VALUES (?, ?, ?)' % self.table,
+                (key, expires, self._sqlite3.Binary(data)))
+
+    def delete(self, key):
+        with self._transaction() as conn:
+            conn.execute(
+                'DELETE FROM %s WHERE id = ?' % self.table, (key,))
+
+    def purge(self):
+        """ Remove all expired entries from the database."""
+        with self._transaction() as conn:
+            conn.execute(
+                'DELETE FROM %s WHERE expires <= ?' % self.table,
+                (self.clock(),))
+
+
 def strings_differ(string1, string2, compare_digest=compare_digest):
     """Check whether two strings differ while avoiding timing attacks.
 
@@ -549,11 +704,20 @@ def viewdefaults(wrapped):
 
 @implementer(IActionInfo)
 class ActionInfo(object):
-    def __init__(self, file, line, function, src):
+    def __init__(self, file, line, function, src=None):
         self.file = file
         self.line = line
         self.function = function
-        self.src = src
+        if src is not None:
+            self.src = src
+
+    @reify
+    def src(self):
+        # the source line is only read when it is needed, for instance to
+        # report a conflict
+        if not self.file:
+            return ''
+        return linecache.getline(self.file, self.line).strip()
 
     def __str__(self):
         srclines = self.src.split('\n')
@@ -575,15 +739,10 @@ def action_method(wrapped):
             info = ActionInfo(*info)
         if info is None:
             try:
-                f = traceback.extract_stack(limit=4)
-
-                # Work around a Python 3.5 issue whereby it would insert an
-                # extra stack frame. This should no longer be necessary in
-                # Python 3.5.1
-                last_frame = ActionInfo(*f[-1])
-                if last_frame.function == 'extract_stack': # pragma: no cover
-                    f.pop()
-                info = ActionInfo(*f[-backframes])
+                # frame 0 is this wrapper, frame 1 is its caller
+                f = sys._getframe(backframes - 1)
+                info = ActionInfo(
+                    f.f_code.co_filename, f.f_lineno, f.f_code.co_name)
             except Exception: # pragma: no cover
                 info = ActionInfo(None, 0, '', '')
         self._ainfo.append(info)
@@ -648,3 +807,40 @@ def is_same_domain(host, pattern):
     return (pattern[0] == "." and
             (host.endswith(pattern) or host == pattern[1:]) or
             pattern == host)
+
+
+def add_vary(response, option):
+    """ Add the header named ``option`` to the ``Vary`` header of
+    ``response`` unless it is already listed."""
+    vary = list(response.vary or ())
+    if option.lower() not in [x.lower() for x in vary]:
+        vary.append(option)
+        response.vary = vary
+
+
+def atomic_write(path, data):
+    """ Write the text ``data`` to the file at ``path``.
+
+    The text is written to a uniquely named temporary file in the same
+    directory which then replaces ``path``, so that processes reading or
+    writing the file concurrently never see a partial file.  An
+    :exc:`IOError` or :exc:`OSError` is raised if the file cannot be
+    written, in which case ``path`` is left untouched.
+    """
+    dirname, basename = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=basename + '.', suffix='.tmp', dir=dirname)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        # mkstemp creates a file only its owner may read
+        os.chmod(tmp_path, 0o644)
+        if WIN and os.path.exists(path): # pragma: no cover
+            os.remove(path)
+        os.rename(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -1,4 +1,6 @@
+import hashlib
 import inspect
+import threading
 
 from zope.interface import (
     implementer,
@@ -18,6 +20,7 @@ from pyramid.interfaces import (
     IDefaultCSRFOptions,
     IDefaultPermission,
     IDebugLogger,
+    IRequestCoalescer,
     IResponse,
     IViewMapper,
     IViewMapperFactory,
@@ -26,6 +29,7 @@ from pyramid.interfaces import (
 from pyramid.compat import (
     is_bound_method,
     is_unbound_method,
+    string_types,
     )
 
 from pyramid.config.util import (
@@ -38,7 +42,10 @@ from pyramid.exceptions import (
     ConfigurationError,
     PredicateMismatch,
     )
-from pyramid.httpexceptions import HTTPForbidden
+from pyramid.httpexceptions import (
+    HTTPForbidden,
+    HTTPNotModified,
+    )
 from pyramid.util import object_description
 from pyramid.view import render_view_to_response
 from pyramid import renderers
@@ -234,14 +241,16 @@ def owrapped_view(view, info):
 
 owrapped_view.options = ('name', 'wrapper')
 
-def http_cached_view(view, info):
+def _http_cache_options(info):
+    # return the (seconds, options) requested by the ``http_cache`` view
+    # option or ``None`` if the view does not set caching headers
     if info.settings.get('prevent_http_cache', False):
-        return view
+        return None
 
     seconds = info.options.get('http_cache')
 
     if seconds is None:
-        return view
+        return None
 
     options = {}
 
@@ -253,6 +262,16 @@ def http_cached_view(view, info):
                 'If http_cache parameter is a tuple or list, it must be '
                 'in the form (seconds, options); not %s' % (seconds,))
 
+    return seconds, options
+
+def http_cached_view(view, info):
+    http_cache = _http_cache_options(info)
+
+    if http_cache is None:
+        return view
+
+    seconds, options = http_cache
+
     def wrapper(context, request):
         response = view(context, request)
         prevent_caching = getattr(response.cache_control, 'prevent_auto',
@@ -265,6 +284,232 @@ def http_cached_view(view, info):
 
 http_cached_view.options = ('http_cache',)
 
+def _not_modified(request, response):
+    # return true if the validators of ``response`` show that the copy the
+    # client holds of the representation is current (RFC 7232)
+    if request.headers.get('If-None-Match') is not None:
+        etag = response.etag
+        return etag is not None and etag in request.if_none_match
+    if_modified_since = request.if_modified_since
+    last_modified = response.last_modified
+    return (
+        if_modified_since is not None and
+        last_modified is not None and
+        last_modified <= if_modified_since
+        )
+
+def _not_modified_response(headerlist=()):
+    response = HTTPNotModified()
+    response.headerlist.extend(
+        (name, value) for (name, value) in headerlist
+        if name.lower() not in ('content-length', 'content-type')
+        )
+    return response
+
+def etag_view(view, info):
+    etag = info.options.get('etag')
+
+    if etag is None or etag is False:
+        return view
+
+    if etag is True:
+        def hashed_view(context, request):
+            response = view(context, request)
+            if (
+                request.method not in ('GET', 'HEAD') or
+                response.status_int != 200
+            ):
+                return response
+            if response.etag is None:
+                if not isinstance(response.app_iter, (list, tuple)):
+                    # do not buffer a streamed body to hash it
+                    return response
+                response.etag = hashlib.sha1(response.body).hexdigest()
+            if _not_modified(request, response):
+                return _not_modified_response(response.headerlist)
+            return response
+        return hashed_view
+
+    if not callable(etag):
+        raise ConfigurationError(
+            'The etag view option must be True or a callable returning the '
+            'validator of the resource; not %r' % (etag,))
+
+    http_cache = _http_cache_options(info)
+
+    def _set_validator(response, validator):
+        if isinstance(validator, string_types):
+            if response.etag is None:
+                response.etag = validator
+        elif response.last_modified is None:
+            response.last_modified = validator
+
+    def validated_view(context, request):
+        if request.method not in ('GET', 'HEAD'):
+            return view(context, request)
+        validator = etag(context, request)
+        if validator is None:
+            return view(context, request)
+        response = _not_modified_response()
+        _set_validator(response, validator)
+        if _not_modified(request, response):
+            if http_cache is not None:
+                seconds, options = http_cache
+                response.cache_expires(seconds, **options)
+            return response
+        response = view(context, request)
+        _set_validator(response, validator)
+        return response
+
+    return validated_view
+
+etag_view.options = ('etag',)
+
+class _InFlightCall(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.succeeded = False
+        self.result = None
+        self.waiters = 0
+
+@implementer(IRequestCoalescer)
+class RequestCoalescer(object):
+    """ The :class:`pyramid.interfaces.IRequestCoalescer` used by views
+    configured with the ``coalesce`` option unless another one is set with
+    :meth:`pyramid.config.Configurator.set_request_coalescer`.
+
+    A call which has waited ``timeout`` seconds for the call in progress
+    computes its own result.  When the call in progress raises an
+    exception, the exception is not shared: all of the waiting calls are
+    made at once instead.
+
+    The ``stats`` method reports how many calls were made (``calls``), how
+    many returned the result of another one (``coalesced``) and how many
+    waiting calls gave up after ``timeout`` seconds (``timeouts``) or
+    because the call they were waiting for failed (``failures``).
+
+    .. versionadded:: 1.10
+    """
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def coalesce(self, key, func):
+        leader = False
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _InFlightCall()
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+        if not leader:
+            call.done.wait(self.timeout)
+            if not call.done.is_set():
+                self._count('timeouts')
+                return func()
+            if call.succeeded:
+                self._count('coalesced')
+                return call.result
+            # do not make the waiting calls one after the other, a view
+            # raising an exception is likely to raise it again
+            self._count('failures')
+            return func()
+        try:
+            call.result = func()
+            call.succeeded = True
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'timeouts': self.timeouts,
+                'failures': self.failures,
+                }
+
+def _request_is_private(request):
+    # the response to a request which used its session, or whose response
+    # callbacks (such as the one setting the session cookie) are still to
+    # be called, may depend on the client
+    attrs = getattr(request, '__dict__', {})
+    return 'session' in attrs or bool(attrs.get('response_callbacks'))
+
+def coalesced_view(view, info):
+    headers = info.options.get('coalesce')
+
+    if not headers or info.exception_only:
+        return view
+
+    if headers is True:
+        headers = ()
+    elif isinstance(headers, string_types):
+        headers = (headers,)
+
+    coalescer = info.registry.queryUtility(IRequestCoalescer)
+    if coalescer is None:
+        # the registry was not set up by a configurator
+        coalescer = RequestCoalescer()
+
+    # distinguishes the views registered for the same route
+    token = object()
+
+    def coalesced_view(context, request):
+        if request.method not in ('GET', 'HEAD'):
+            return view(context, request)
+        route = getattr(request, 'matched_route', None)
+        if route is not None:
+            location = (
+                route.name, tuple(sorted(request.matchdict.items())))
+        else:
+            location = request.path_info
+        key = (
+            token,
+            request.method,
+            location,
+            request.query_string,
+            tuple(request.headers.get(name) for name in headers),
+            )
+        own = []
+        def compute():
+            response = view(context, request)
+            own.append(response)
+            if (
+                isinstance(getattr(response, 'app_iter', None), (list, tuple))
+                and 'Set-Cookie' not in response.headers
+                and not _request_is_private(request)
+            ):
+                return (
+                    response.status, list(response.headerlist), response.body)
+        shared = coalescer.coalesce(key, compute)
+        if own:
+            return own[0]
+        if shared is None:
+            # the response could not be shared
+            return view(context, request)
+        status, headerlist, body = shared
+        return Response(
+            status=status, headerlist=list(headerlist), app_iter=[body])
+
+    return coalesced_view
+
+coalesced_view.options = ('coalesce',)
+
 def secured_view(view, info):
     for wrapper in (_secured_view, _authdebug_view):
         view = wraps_view(wrapper)(view, info)